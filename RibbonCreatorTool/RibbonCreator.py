@@ -1,25 +1,88 @@
 import os
-from typing import List
+import time
+from typing import List, Optional
 
 try:
     from PySide2 import QtCore, QtWidgets, QtGui
-    from PySide2.QtUiTools import QUiLoader
-    from shiboken2 import wrapInstance
+    from shiboken2 import isValid, wrapInstance
 except ModuleNotFoundError:
     from PySide6 import QtCore, QtWidgets, QtGui
-    from PySide6.QtUiTools import QUiLoader
-    from shiboken6 import wrapInstance
+    from shiboken6 import isValid, wrapInstance
 from maya import OpenMayaUI, cmds
 
-import RibbonCreatorTool.RibbonCreatorOperations as RibbonGenOp
+import RibbonCreatorTool.RibbonCreatorForm as RibbonForm
+from RibbonCreatorTool.RibbonCreatorLazy import LazyModule, is_imported
+from RibbonCreatorTool.RibbonCreatorSpec import RibbonSpec, DEFORMERS, SCALE_MODES
+from RibbonCreatorTool.RibbonCreatorTracker import SceneTracker
+from RibbonCreatorTool.RibbonCreatorTransaction import Transaction
 
-def maya_main_window() -> QtWidgets.QWidget:
+# imported once the window is shown, or when the action needing them is first used
+RibbonGenOp = LazyModule("RibbonCreatorTool.RibbonCreatorOperations")
+RibbonChains = LazyModule("RibbonCreatorTool.RibbonCreatorChains")
+RibbonChunked = LazyModule("RibbonCreatorTool.RibbonCreatorChunked")
+RibbonIndex = LazyModule("RibbonCreatorTool.RibbonCreatorIndex")
+RibbonProfiler = LazyModule("RibbonCreatorTool.RibbonCreatorProfiler")
+
+def maya_main_window() -> Optional[QtWidgets.QWidget]:
     main_window = OpenMayaUI.MQtUtil.mainWindow()
-    return wrapInstance(int(main_window), QtWidgets.QWidget)
+    return wrapInstance(int(main_window), QtWidgets.QWidget) if main_window else None
 
 filePath = __file__
 uiPath = os.path.join(os.path.dirname(filePath), "RibbonCreator.ui")
 ToolName = "Ribbon Creator Tool"
+# seconds spent by the last show_ui in each stage, and whether it reused the window, see format_startup
+startupTimes: dict = {}
+
+
+class PreviewScheduler:
+    """
+    Coalesces the preview updates requested while dragging sliders.
+    Requests are applied once when Maya is idle, reading the latest values of the interface,
+    so intermediate states are dropped instead of being built one after the other.
+    """
+    supersedes = {"main": {"roll"}}  # updating main isoparms also updates roll isoparms
+
+    def __init__(self, pUpdates: dict, pOnFlushed=None):
+        """
+        :param pUpdates: functions by name of update, like {"length": func}. They are applied in this order.
+        :param pOnFlushed: function called after pending updates are applied.
+        """
+        self.updates = pUpdates
+        self.onFlushed = pOnFlushed
+        self.pending = set()
+        self.scheduled = False
+        self.requested = 0
+        self.applied = 0
+
+    @property
+    def skipped(self) -> int:
+        return self.requested - self.applied
+
+    def request(self, pUpdate: str) -> None:
+        self.requested += 1
+        self.pending.add(pUpdate)
+        if not self.scheduled:
+            self.scheduled = True
+            cmds.evalDeferred(self.flush, lowestPriority=True)
+
+    def cancel(self) -> None:
+        self.pending.clear()
+
+    def flush(self) -> None:
+        self.scheduled = False
+        pending, self.pending = self.pending, set()
+        if not pending:
+            return
+        for update, superseded in self.supersedes.items():
+            if update in pending:
+                pending -= superseded
+        for update, function in self.updates.items():
+            if update in pending:
+                self.applied += 1
+                function()
+        if self.onFlushed:
+            self.onFlushed()
+
 
 class RibbonInterface(QtWidgets.QMainWindow):
     _instance = None
@@ -30,8 +93,8 @@ class RibbonInterface(QtWidgets.QMainWindow):
         return cls._instance
 
     def __init__(self, parent=None):
+        start = time.perf_counter()
         super().__init__(parent)
-        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
         self.setWindowFlags(QtCore.Qt.Window)
         self.setWindowTitle(ToolName)
         self.setObjectName(ToolName)
@@ -39,6 +102,24 @@ class RibbonInterface(QtWidgets.QMainWindow):
 
         # setup menu
         menubar = self.menuBar()
+        editMenu = QtWidgets.QMenu('&Edit', self)
+        qa_edit = QtWidgets.QAction("Edit selected ribbon", self)
+        qa_edit.setStatusTip("Reopens the selected ribbon (or one of its nodes) to change its parameters.")
+        qa_edit.triggered.connect(self.edit_selected_ribbon)
+        editMenu.addAction(qa_edit)
+        qa_chains = QtWidgets.QAction("Build on selected chains", self)
+        qa_chains.setStatusTip("Builds a ribbon along each selected joint chain, with the parameters of the interface.")
+        qa_chains.triggered.connect(self.build_selected_chains)
+        editMenu.addAction(qa_chains)
+        editMenu.addSeparator()
+        qa_proxy = QtWidgets.QAction("Proxy preview", self)
+        qa_proxy.setCheckable(True)
+        qa_proxy.setStatusTip("Previews new ribbons with points on their follicles, the rig is built on Build only.")
+        qa_proxy.toggled.connect(self.set_proxy_preview)
+        editMenu.addAction(qa_proxy)
+        # read when the menu opens, so building the window doesn't import the operations
+        editMenu.aboutToShow.connect(lambda: qa_proxy.setChecked(RibbonGenOp.RibbonOperations.proxyPreview))
+        menubar.addMenu(editMenu)
         menu = QtWidgets.QMenu('&Help', self)  # title and parent
         qa_about = QtWidgets.QAction("About", self)  # title and parent
         qa_about.triggered.connect(self.help)
@@ -47,20 +128,36 @@ class RibbonInterface(QtWidgets.QMainWindow):
 
         # setup status bar
         self.info = self.statusBar()
+        self.qpb_build = QtWidgets.QProgressBar()
+        self.qpb_build.setMaximumWidth(150)
+        self.qpb_cancel_build = QtWidgets.QPushButton("Cancel")
+        self.qpb_cancel_build.clicked.connect(self.cancel_build)
+        for widget in (self.qpb_build, self.qpb_cancel_build):
+            self.info.addPermanentWidget(widget)
+            widget.hide()
+        self.chunkedBuild = None
         self.send_message("Ready")
 
         # setup UI
-        ui_file = QtCore.QFile(uiPath)
-        ui_file.open(QtCore.QFile.ReadOnly)
-        loader = QUiLoader()
-        self.ui = loader.load(ui_file, parentWidget=self.centralWidget())
-        ui_file.close()
+        self.ui = RibbonForm.load_ui(uiPath, self.centralWidget())
         self.setCentralWidget(self.ui)
+        startupTimes.update(form=RibbonForm.lastLoad["time"], formSource=RibbonForm.lastLoad["source"])
+
+        self._rop = None  # see rop
+        self.namePending = True  # the name of the .ui is replaced by an unused one once the window is shown
 
-        self.rop = RibbonGenOp.RibbonOperations
-        self.rop.init_params()
+        if getattr(self, "tracker", None):  # the window is a singleton, __init__ may run again
+            self.tracker.stop()
+        self.tracker = SceneTracker()
+        self.tracker.start()
+
+        self.previewScheduler = PreviewScheduler({"length": self.update_length,
+                                                  "main": self.update_main_iso,
+                                                  "roll": self.update_roll_iso}, self.on_preview_flushed)
 
         self.init_interface()
+        self.init_ribbons_tab()
+        self.init_profiling_tab()
 
         # Install the event filter to detect mouse enter events
         self.installEventFilter(self)
@@ -68,6 +165,16 @@ class RibbonInterface(QtWidgets.QMainWindow):
         # self.update_layout()
         self.connect_buttons()
         self.connect_tooltips()
+        startupTimes["window"] = time.perf_counter() - start
+
+    @property
+    def rop(self) -> "RibbonGenOp.RibbonOperations":
+        """
+        The operations of the window, created on first use: after the window is shown, see catch_up_scene.
+        """
+        if self._rop is None:
+            self._rop = RibbonGenOp.RibbonOperations()
+        return self._rop
 
     @classmethod
     def instance(cls) -> _instance:
@@ -81,19 +188,32 @@ class RibbonInterface(QtWidgets.QMainWindow):
 
     def eventFilter(self, source, event) -> object:
         if event.type() == QtCore.QEvent.Enter:
-            self.rop.selection = self.rop.get_selection("joint", True)
-            if self.rop.check_ribbon(pCheckAll=True):
-                if self.rop.previs_step and self.align:
-                    self.update_layout_align()
-            else:
-                if self.rop.previs_step:
-                    self.switch_previs(False, False)
-                    self.rop.init_params()
-                self.check_ribbon_name()
+            self.update_from_scene()
         return super().eventFilter(source, event)
 
+    def update_from_scene(self) -> None:
+        """
+        Updates the interface with the selected joints and the ribbon in the scene, only if the tracker reports that
+        the selection, the selected joints or the scene changed since the last update.
+        """
+        selectionChanged = False
+        if self.tracker.poll_selection():
+            self.rop.selection = self.rop.get_selection("joint", True)
+            selectionChanged = self.tracker.update_selection(self.rop.selection)
+        jointsMoved = self.tracker.poll_watched()
+        sceneChanged = self.tracker.poll_scene()
+        if not (selectionChanged or jointsMoved or sceneChanged):
+            return
+        if self.rop.check_ribbon(pCheckAll=True):
+            if self.rop.previs_step and self.align and (selectionChanged or jointsMoved):
+                self.update_layout_align()
+        else:
+            if self.rop.previs_step:
+                self.switch_previs(False, False)
+                self.rop.init_params()
+            self.check_ribbon_name()
+
     def init_interface(self):
-        self.ui.qle_name.setText(self.rop.generate_new_name(self.ribbon_name))
         self.ui.qrb_forward_x.setChecked(True)
         self.ui.qrb_up_y.setChecked(True)
         # self.ui.qgb_name.setStyle(QtWidgets.QStyleFactory.create("plastique"))
@@ -137,6 +257,192 @@ class RibbonInterface(QtWidgets.QMainWindow):
                            }
                            """)
 
+    def init_ribbons_tab(self) -> None:
+        """
+        Adds a tab listing the ribbons of the scene, to change the parameters of several of them at once.
+        """
+        tab = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(tab)
+        self.qtw_ribbons = QtWidgets.QTableWidget(0, 6)
+        self.qtw_ribbons.setHorizontalHeaderLabels(["Ribbon", "Main", "Roll", "Length", "Scale", "Deformers"])
+        self.qtw_ribbons.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.qtw_ribbons.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.qtw_ribbons.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.qtw_ribbons.horizontalHeader().setStretchLastSection(True)
+        self.qtw_ribbons.verticalHeader().setVisible(False)
+
+        # each change is applied only if its checkbox is checked
+        qgb_changes = QtWidgets.QGroupBox("Change selected ribbons")
+        form = QtWidgets.QFormLayout(qgb_changes)
+        self.qdsb_bulk_length = QtWidgets.QDoubleSpinBox()
+        self.qdsb_bulk_length.setRange(0.1, 1000)
+        self.qdsb_bulk_length.setValue(10)
+        self.qsb_bulk_main = QtWidgets.QSpinBox()
+        self.qsb_bulk_main.setRange(1, 100)
+        self.qsb_bulk_main.setValue(3)
+        self.qsb_bulk_roll = QtWidgets.QSpinBox()
+        self.qsb_bulk_roll.setRange(0, 50)
+        self.qsb_bulk_roll.setValue(2)
+        self.qcmb_bulk_scale = QtWidgets.QComboBox()
+        self.qcmb_bulk_scale.addItems([self.ui.qcmb_scale.itemText(i) for i in range(self.ui.qcmb_scale.count())])
+        self.bulkFields = {}
+        for field, label, widget in (("length", "Length", self.qdsb_bulk_length),
+                                     ("mainJointCount", "Main joints", self.qsb_bulk_main),
+                                     ("rollJointCount", "Roll joints", self.qsb_bulk_roll),
+                                     ("scaleMode", "Scale", self.qcmb_bulk_scale)):
+            checkBox = QtWidgets.QCheckBox(label)
+            widget.setEnabled(False)
+            checkBox.toggled.connect(widget.setEnabled)
+            form.addRow(checkBox, widget)
+            self.bulkFields[field] = checkBox
+        deformers = QtWidgets.QHBoxLayout()
+        self.bulkDeformers = {}
+        for deformer in DEFORMERS:
+            checkBox = QtWidgets.QCheckBox(deformer.capitalize())
+            checkBox.setTristate(True)
+            checkBox.setCheckState(QtCore.Qt.PartiallyChecked)
+            checkBox.setStatusTip("Checked adds the deformer, unchecked removes it, partially checked keeps it as is.")
+            deformers.addWidget(checkBox)
+            self.bulkDeformers[deformer] = checkBox
+        form.addRow("Deformers", deformers)
+        self.qcb_bulk_shared_deformers = QtWidgets.QCheckBox("Share one surface")
+        self.qcb_bulk_shared_deformers.setTristate(True)
+        self.qcb_bulk_shared_deformers.setCheckState(QtCore.Qt.PartiallyChecked)
+        self.qcb_bulk_shared_deformers.setStatusTip("Checked stacks the deformers on one surface, unchecked gives each "
+                                                    "deformer its surface, partially checked keeps it as is.")
+        form.addRow("", self.qcb_bulk_shared_deformers)
+
+        buttons = QtWidgets.QHBoxLayout()
+        qpb_refresh = QtWidgets.QPushButton("Refresh")
+        qpb_apply = QtWidgets.QPushButton("Apply to selected")
+        qpb_apply.setStatusTip("Edits each selected ribbon in its own undo entry.")
+        for button in (qpb_refresh, qpb_apply):
+            buttons.addWidget(button)
+        layout.addWidget(self.qtw_ribbons)
+        layout.addWidget(qgb_changes)
+        layout.addLayout(buttons)
+        self.ui.qtw_tabs.addTab(tab, "Ribbons")
+
+        qpb_refresh.clicked.connect(self.refresh_ribbons)
+        qpb_apply.clicked.connect(self.apply_bulk_changes)
+        self.ui.qtw_tabs.currentChanged.connect(
+            lambda index: self.refresh_ribbons() if self.ui.qtw_tabs.widget(index) is tab else None)
+
+    def refresh_ribbons(self) -> None:
+        ribbons = RibbonIndex.scan_ribbons()
+        self.qtw_ribbons.setRowCount(len(ribbons))
+        for row, metadata in enumerate(ribbons):
+            spec = metadata.spec
+            scale = self.ui.qcmb_scale.itemText(SCALE_MODES.index(spec.scaleMode))
+            values = (metadata.ribbon, spec.mainJointCount, spec.rollJointCount, f"{spec.length:g}", scale,
+                      ", ".join(spec.deformers))
+            for column, value in enumerate(values):
+                self.qtw_ribbons.setItem(row, column, QtWidgets.QTableWidgetItem(str(value)))
+        self.qtw_ribbons.resizeColumnsToContents()
+
+    @property
+    def bulk_changes(self) -> dict:
+        """
+        :return: the changes checked in the Ribbons tab, like {"rollJointCount": 3, "sine": True}
+        """
+        values = {"length": self.qdsb_bulk_length.value(), "mainJointCount": self.qsb_bulk_main.value(),
+                  "rollJointCount": self.qsb_bulk_roll.value(),
+                  "scaleMode": SCALE_MODES[self.qcmb_bulk_scale.currentIndex()]}
+        changes = {field: values[field] for field, checkBox in self.bulkFields.items() if checkBox.isChecked()}
+        for deformer, checkBox in self.bulkDeformers.items():
+            if checkBox.checkState() != QtCore.Qt.PartiallyChecked:
+                changes[deformer] = checkBox.checkState() == QtCore.Qt.Checked
+        if self.qcb_bulk_shared_deformers.checkState() != QtCore.Qt.PartiallyChecked:
+            changes["sharedDeformers"] = self.qcb_bulk_shared_deformers.checkState() == QtCore.Qt.Checked
+        return changes
+
+    def apply_bulk_changes(self) -> None:
+        rows = sorted({index.row() for index in self.qtw_ribbons.selectionModel().selectedRows()})
+        ribbons = [self.qtw_ribbons.item(row, 0).text() for row in rows]
+        changes = self.bulk_changes
+        if not ribbons or not changes:
+            self.show_popup("Select ribbons in the list and check the changes to apply.")
+            return
+
+        def on_progress(pIndex: int, pCount: int, pRibbon: str) -> bool:
+            self.send_message(f"Editing {pRibbon} ({pIndex + 1}/{pCount})...")
+            return True
+
+        results = RibbonIndex.edit_ribbons(ribbons, changes, on_progress)
+        errors = [f"{r['ribbon']}: {r['error']}" for r in results if r["error"]]
+        self.refresh_ribbons()
+        self.send_message(f"{len(results) - len(errors)} ribbon(s) edited.")
+        if errors:
+            self.show_popup("Some ribbons could not be edited:\n" + "\n".join(errors))
+
+    def init_profiling_tab(self) -> None:
+        """
+        Adds a tab to enable profiling and read the timing report.
+        """
+        tab = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(tab)
+        self.qcb_profiling = QtWidgets.QCheckBox("Enable profiling")
+        self.qcb_profiling.setChecked(is_imported(RibbonProfiler) and RibbonProfiler.profiler.enabled)
+        self.qcb_profiling.setStatusTip("Records time, maya.cmds calls, estimated undo entries and nodes created by "
+                                        "each step of the tool.")
+        self.qcb_transaction = QtWidgets.QCheckBox("Group undo and suspend refresh")
+        self.qcb_transaction.setChecked(Transaction.enabled)
+        self.qcb_transaction.setStatusTip("Records each action as a single undo entry, and refreshes the viewport "
+                                          "once it is done. Uncheck to compare in the report.")
+        self.qpte_profiling = QtWidgets.QPlainTextEdit()
+        self.qpte_profiling.setReadOnly(True)
+        self.qpte_profiling.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        buttons = QtWidgets.QHBoxLayout()
+        qpb_refresh = QtWidgets.QPushButton("Refresh")
+        qpb_reset = QtWidgets.QPushButton("Reset")
+        qpb_save = QtWidgets.QPushButton("Save JSON...")
+        for button in (qpb_refresh, qpb_reset, qpb_save):
+            buttons.addWidget(button)
+        layout.addWidget(self.qcb_profiling)
+        layout.addWidget(self.qcb_transaction)
+        layout.addWidget(self.qpte_profiling)
+        layout.addLayout(buttons)
+        self.ui.qtw_tabs.addTab(tab, "Profiling")
+
+        self.qcb_profiling.toggled.connect(self.on_toggled_profiling)
+        self.qcb_transaction.toggled.connect(self.on_toggled_transaction)
+        qpb_refresh.clicked.connect(self.refresh_profiling)
+        qpb_reset.clicked.connect(self.reset_profiling)
+        qpb_save.clicked.connect(self.save_profiling)
+        self.ui.qtw_tabs.currentChanged.connect(self.refresh_profiling)
+
+    def on_toggled_profiling(self, pEnabled: bool) -> None:
+        if pEnabled:
+            RibbonProfiler.profiler.enable()
+        elif is_imported(RibbonProfiler):
+            RibbonProfiler.profiler.disable()
+        self.refresh_profiling()
+
+    @staticmethod
+    def on_toggled_transaction(pEnabled: bool) -> None:
+        Transaction.enabled = pEnabled
+
+    def refresh_profiling(self) -> None:
+        if is_imported(RibbonProfiler):  # it is imported when profiling is enabled for the first time
+            report = RibbonProfiler.profiler.format_report()
+            enabled = RibbonProfiler.profiler.enabled
+        else:
+            report, enabled = "", False
+        if not report:
+            report = "Nothing recorded yet." if enabled else "Profiling is disabled."
+        self.qpte_profiling.setPlainText(f"{format_startup()}\n\n{report}")
+
+    def reset_profiling(self) -> None:
+        if is_imported(RibbonProfiler):
+            RibbonProfiler.profiler.reset()
+        self.refresh_profiling()
+
+    def save_profiling(self) -> None:
+        path = QtWidgets.QFileDialog.getSaveFileName(self, "Save profiling report", "", "JSON (*.json)")[0]
+        if path:
+            RibbonProfiler.profiler.dump(path)
+            self.send_message(f"Profiling report saved to {path}")
+
     def help(self) -> None:
         message = "This tool is provided for free, and helps to build limbs, tentacles, tails...\n" \
                   "Hover checkbox of the interface to get more info about available features.\n\n" \
@@ -215,6 +521,10 @@ class RibbonInterface(QtWidgets.QMainWindow):
     def create_bend(self) -> bool:
         return self.ui.qcb_bend.isChecked()
 
+    @property
+    def shared_deformers(self) -> bool:
+        return self.ui.qcb_shared_deformers.isChecked()
+
     @property
     def create_stretch(self) -> bool:
         return self.ui.qcb_stretch.isChecked()
@@ -235,10 +545,24 @@ class RibbonInterface(QtWidgets.QMainWindow):
     def pinch(self) -> bool:
         return self.ui.qcb_pinch.isChecked()
 
+    @property
+    def scale_mode(self) -> str:
+        return SCALE_MODES[self.ui.qcmb_scale.currentIndex()]
+
     @property
     def history(self) -> bool:
         return self.ui.qcb_clean_history.isChecked()
 
+    @property
+    def ribbon_spec(self) -> RibbonSpec:
+        """
+        :return: the ribbon described by the interface.
+        """
+        deformers = [d for d in DEFORMERS if getattr(self, f"create_{d}")]
+        return RibbonSpec(self.ribbon_name, self.forward_vector, self.up_vector, self.length, self.main_joint_count,
+                          self.roll_joint_count, self.control_joints, self.create_chain, self.skin, self.pinch,
+                          deformers, self.history, scaleMode=self.scale_mode, sharedDeformers=self.shared_deformers)
+
     def check_ribbon_name(self) -> None:
         if self.rop.check_ribbon(self.ribbon_name) and not self.rop.previs_step:
             self.ui.ql_name.setText("\N{Warning Sign} Name")
@@ -292,6 +616,9 @@ class RibbonInterface(QtWidgets.QMainWindow):
         self.ui.qcb_switch.setEnabled(self.create_chain and not self.align)
         self.ui.qcb_stretch.setEnabled(self.create_chain and not self.align)
         if self.rop.previs_step and self.rop.check_ribbon():
+            if self.rop.proxy:
+                self.update_main_iso()  # the proxy only records the options
+                return
             self.rop.update_control_joint(self.control_joints, self.create_chain, self.skin)
             self.rop.end_step(False, True)
 
@@ -303,6 +630,9 @@ class RibbonInterface(QtWidgets.QMainWindow):
         self.ui.qcb_chain.setEnabled(self.control_joints and self.control_joints and not self.align)
         self.ui.qcb_skin.setEnabled(self.control_joints and not self.align)
         if self.rop.previs_step and self.rop.check_ribbon():
+            if self.rop.proxy:
+                self.update_main_iso()  # the proxy only records the options
+                return
             self.rop.update_control_joint(self.control_joints, self.create_chain, self.skin)
             self.rop.end_step(False, True)
 
@@ -327,29 +657,33 @@ class RibbonInterface(QtWidgets.QMainWindow):
 
     def on_slider_moved_main_joints(self) -> None:
         self.ui.qsb_main_joints.setValue(self.ui.qs_main_joints.sliderPosition())
-        self.update_main_iso()
+        self.previewScheduler.request("main")
 
     def on_value_changed_main_joints(self, pValue) -> None:
         if pValue:
             self.ui.qs_main_joints.setValue(pValue)
-            self.update_main_iso()
+            self.previewScheduler.request("main")
 
     def on_slider_moved_roll_joints(self) -> None:
         self.ui.qsb_roll_joints.setValue(self.ui.qs_roll_joints.sliderPosition())
-        self.update_roll_iso()
+        self.previewScheduler.request("roll")
 
     def on_value_changed_roll_joints(self, pValue) -> None:
         self.ui.qs_roll_joints.setValue(pValue)
-        self.update_roll_iso()
+        self.previewScheduler.request("roll")
 
     def on_slider_moved_length(self) -> None:
         self.ui.qsb_length.setValue(self.ui.qs_length.sliderPosition() / 10)
-        self.update_length()
+        self.previewScheduler.request("length")
 
     def on_value_changed_length(self, pValue) -> None:
         if pValue:
             self.ui.qs_length.setValue(int(pValue) * 10)
-            self.update_length()
+            self.previewScheduler.request("length")
+
+    def on_preview_flushed(self) -> None:
+        scheduler = self.previewScheduler
+        self.send_message(f"Preview updated ({scheduler.applied} applied, {scheduler.skipped} skipped).")
 
     def connect_buttons(self) -> None:
         self.ui.qle_name.textChanged.connect(self.check_ribbon_name)
@@ -388,21 +722,55 @@ class RibbonInterface(QtWidgets.QMainWindow):
         self.ui.qcb_align.setStatusTip("Select the chain from first joint to last joint, then check this button.")
         self.ui.qcb_pinch.setStatusTip("This will snap isoparms of the ribbon to main joints.")
         self.ui.qcb_skin.setStatusTip("This will skin control joints to the ribbon")
+        self.ui.qcmb_scale.setStatusTip("How follicles follow the width of the ribbon: measured at each isoparm, "
+                                        "once for the whole ribbon (faster), or not at all (fastest).")
         self.ui.qcb_chain.setStatusTip("This will make a leaf setup, so roll joints will be parented to main joints")
         self.ui.qcb_control_joints.setStatusTip("This will create control joints.")
         self.ui.qcb_flare.setStatusTip("This will create a flare deformer.")
         self.ui.qcb_sine.setStatusTip("This will create a sine deformer.")
         self.ui.qcb_twist.setStatusTip("This will create a twist deformer.")
+        self.ui.qcb_shared_deformers.setStatusTip("This will stack the deformers on one surface instead of one "
+                                                  "surface per deformer, lighter to evaluate.")
+
+    def showEvent(self, event) -> None:
+        """
+        on show, the window may be reused after being closed: listens to the scene again and catches up with it.
+        """
+        super().showEvent(event)
+        if event.spontaneous():  # restored from minimized
+            return
+        self.tracker.start()
+        cmds.evalDeferred(self.catch_up_scene, lowestPriority=True)
+
+    def catch_up_scene(self) -> None:
+        """
+        Updates the window with the scene once it is painted. The first time, this imports the operations and
+        replaces the name of the .ui by an unused one.
+        """
+        if not isValid(self) or not self.isVisible():
+            return
+        if self.namePending:
+            self.namePending = False
+            self.ui.qle_name.setText(self.rop.generate_new_name(self.ribbon_name))
+        self.switch_previs(self.rop.previs_step)
+        self.update_from_scene()
 
     def closeEvent(self, event) -> None:
         """
-        on close, this closes the ui
+        on close, this hides the ui, show_ui shows it again
         """
-        self.rop.init_params()
-        self.close()
+        self.previewScheduler.cancel()
+        if self.chunkedBuild:
+            self.chunkedBuild.cancel(pNow=True)
+            self.chunkedBuild = None
+        self.tracker.stop()
+        if self._rop is not None:
+            self._rop.init_params()
+        event.accept()  # without WA_DeleteOnClose, the window is only hidden
 
     def switch_previs(self, pPrevisOn: bool, pSendMessage: bool = True) -> None:
         self.ui.qgb_name.setEnabled(not pPrevisOn)
+        self.ui.qgb_scale.setEnabled(not pPrevisOn)
         message = "Preview active. You can now customize parameters." if pPrevisOn else "Ready"
         qpb_stylesSheet = "background-color: seagreen" if pPrevisOn else ""
         qgb_styleSheet = "#qgb_dynamic { border: 1px solid seagreen;padding: 14 1 px}" if pPrevisOn else ""
@@ -411,27 +779,159 @@ class RibbonInterface(QtWidgets.QMainWindow):
         if pSendMessage:
             self.send_message(message)
 
+    @staticmethod
+    def set_proxy_preview(pProxyPreview: bool) -> None:
+        """
+        Chooses how the next ribbons are previewed, the ribbon being previewed keeps its mode.
+        """
+        RibbonGenOp.RibbonOperations.proxyPreview = pProxyPreview
+
     def previs_ribbon(self) -> None:
         if not self.rop.previs_step:
-            message = self.rop.previs_ribbon(self.ribbon_name, self.forward_vector, self.up_vector, self.length,
-                                             self.main_joint_count, self.roll_joint_count, self.control_joints,
-                                             self.create_chain, self.skin, self.pinch)
+            spec = self.ribbon_spec
+            self.rop.scaleMode = RibbonGenOp.ScaleMode(spec.scaleMode)
+            message = self.rop.previs_ribbon(*spec.previs_args(), spec.pinch)
             self.show_popup(message)
         else:
             self.rop.delete_ribbon(self.ribbon_name)
         self.switch_previs(self.rop.previs_step)
 
+    def edit_selected_ribbon(self) -> None:
+        """
+        Reopens the selected ribbon from its metadata node, and shows its parameters in the interface.
+        """
+        if self.rop.previs_step:
+            self.show_popup("Build or delete the ribbon being previewed before editing another one.")
+            return
+        selection = cmds.ls(selection=True)
+        if not selection:
+            self.show_popup("Select a ribbon, or one of its nodes, to edit it.")
+            return
+        try:
+            with Transaction("Ribbon Creator: edit_selected_ribbon"):
+                spec = self.rop.open_ribbon(selection[0])
+        except ValueError as e:
+            self.rop.init_params()
+            self.show_popup(str(e))
+            return
+        self.set_from_spec(spec)
+        self.switch_previs(True, False)
+        self.check_ribbon_name()
+        self.send_message(f"Editing {self.rop.ribbon}. Click 'Build' to apply the changes.")
+
+    def build_selected_chains(self) -> None:
+        """
+        Builds a ribbon along each selected joint chain in one undo entry, with a progress window to cancel.
+        """
+        if self.rop.previs_step:
+            self.show_popup("Build or delete the ribbon being previewed before building chains.")
+            return
+        chains = RibbonChains.find_chains(cmds.ls(selection=True, type="joint"))
+        if not chains:
+            self.show_popup("Select the root joint of each chain.")
+            return
+
+        def on_progress(pIndex: int, pCount: int, pRibbon: str) -> bool:
+            if cmds.progressWindow(query=True, isCancelled=True):
+                return False
+            cmds.progressWindow(edit=True, progress=pIndex, status=f"Building {pRibbon} ({pIndex + 1}/{pCount})...")
+            return True
+
+        cmds.progressWindow(title=ToolName, progress=0, maxValue=len(chains), status="Building ribbons...",
+                            isInterruptable=True)
+        try:
+            results = RibbonChains.build_chains(chains, self.ribbon_spec, on_progress)
+        except ValueError as e:
+            self.show_popup(str(e))
+            return
+        finally:
+            cmds.progressWindow(endProgress=True)
+        built = [r for r in results if r["ribbon"]]
+        errors = [f"{r['name']}: {r['error']}" for r in results if r["error"] and r["error"] != "Cancelled"]
+        self.ui.qle_name.setText(self.rop.generate_new_name(self.ribbon_name))
+        self.send_message(f"{len(built)} ribbon(s) built on {len(chains)} chain(s).")
+        if errors:
+            self.show_popup("Some ribbons could not be built:\n" + "\n".join(errors))
+
+    def set_from_spec(self, pSpec: RibbonSpec) -> None:
+        """
+        Shows pSpec in the interface, with the signals of the widgets blocked so the ribbon is not updated.
+        """
+        widgets = [w for w in self.ui.findChildren(QtWidgets.QWidget) if not w.signalsBlocked()]
+        for widget in widgets:
+            widget.blockSignals(True)
+        try:
+            self.ui.qle_name.setText(pSpec.name)
+            for direction, vector in (("forward", pSpec.forwardVector), ("up", pSpec.upVector)):
+                getattr(self.ui, f"qrb_{direction}_{'xyz'[vector.index(1)]}").setChecked(True)
+            self.ui.qsb_length.setValue(pSpec.length)
+            self.ui.qs_length.setValue(int(pSpec.length * 10))
+            self.ui.qsb_main_joints.setValue(pSpec.mainJointCount)
+            self.ui.qs_main_joints.setValue(pSpec.mainJointCount)
+            self.ui.qsb_roll_joints.setValue(pSpec.rollJointCount)
+            self.ui.qs_roll_joints.setValue(pSpec.rollJointCount)
+            self.ui.qcb_control_joints.setChecked(pSpec.controlJoints)
+            self.ui.qcb_chain.setChecked(pSpec.chain)
+            self.ui.qcb_skin.setChecked(pSpec.skin)
+            self.ui.qcb_pinch.setChecked(pSpec.pinch)
+            self.ui.qcb_align.setChecked(bool(pSpec.joints))
+            self.ui.qcb_clean_history.setChecked(pSpec.deleteHistory)
+            for deformer in DEFORMERS:
+                getattr(self.ui, f"qcb_{deformer}").setChecked(deformer in pSpec.deformers)
+            self.ui.qcb_shared_deformers.setChecked(pSpec.sharedDeformers)
+            self.ui.qcmb_scale.setCurrentIndex(SCALE_MODES.index(pSpec.scaleMode))
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
+
     def build_ribbon(self) -> None:
-        ribbonName = self.ribbon_name
-        message = self.rop.build_ribbon(ribbonName, self.forward_vector, self.up_vector, self.length,
-                                        self.main_joint_count, self.roll_joint_count, self.control_joints,
-                                        self.create_chain, self.skin, pPinch=self.pinch, bend=self.create_bend,
-                                        sine=self.create_sine, twist=self.create_twist, flare=self.create_flare)
+        """
+        Builds the ribbon step by step when Maya is idle, see ChunkedBuild, with its progress in the status bar.
+        """
+        if self.chunkedBuild:
+            return
+        spec = self.ribbon_spec
+        if not self.rop.previs_step:
+            self.rop.scaleMode = RibbonGenOp.ScaleMode(spec.scaleMode)
+        self.chunkedBuild = RibbonChunked.ChunkedBuild(self.rop, *spec.previs_args(),
+                                                       pOnProgress=self.on_build_progress,
+                                                       pOnFinished=self.on_build_finished, **spec.build_kwargs())
+        self.ui.setEnabled(False)
+        self.qpb_build.setRange(0, self.chunkedBuild.count)
+        self.qpb_build.setValue(0)
+        self.qpb_build.show()
+        self.qpb_cancel_build.show()
+        self.send_message(f"Building {spec.name}...")
+        self.chunkedBuild.start()
+
+    def on_build_progress(self, pDone: int, pCount: int, pNextStep: str) -> None:
+        self.qpb_build.setValue(pDone)
+        self.send_message(f"Building {self.ribbon_name}: {pNextStep} ({pDone + 1}/{pCount})...")
+
+    def cancel_build(self) -> None:
+        if self.chunkedBuild:
+            self.qpb_cancel_build.setEnabled(False)
+            self.chunkedBuild.cancel()
+
+    def on_build_finished(self, pBuild: "RibbonChunked.ChunkedBuild") -> None:
+        self.chunkedBuild = None
+        self.qpb_build.hide()
+        self.qpb_cancel_build.hide()
+        self.qpb_cancel_build.setEnabled(True)
+        self.ui.setEnabled(True)
+        if not pBuild.succeeded:
+            self.switch_previs(self.rop.previs_step, False)
+            if pBuild.error:
+                self.send_message("Build failed.")
+                self.show_popup(f"The build of {pBuild.name} failed, it has been rolled back:\n{pBuild.error}")
+            else:
+                self.send_message("Build cancelled.")
+            return
         if self.history:
             self.rop.delete_history()
         self.send_message("Done !")
-        self.ui.qle_name.setText(self.rop.generate_new_name(ribbonName))
-        self.show_popup(message)
+        self.ui.qle_name.setText(self.rop.generate_new_name(pBuild.name))
+        self.show_popup(pBuild.message)
         self.switch_previs(self.rop.previs_step)
         self.rop.init_params()  # that will help to create a new ribbon right after building one.
 
@@ -451,7 +951,7 @@ class RibbonInterface(QtWidgets.QMainWindow):
 
     def update_skin(self) -> None:
         self.ui.qcb_pinch.setEnabled(self.skin and self.create_chain)
-        if self.rop.previs_step and self.rop.check_ribbon():
+        if self.rop.previs_step and self.rop.check_ribbon() and not self.rop.proxy:
             if self.skin:
                 self.rop.update_skin()
             else:
@@ -459,11 +959,38 @@ class RibbonInterface(QtWidgets.QMainWindow):
             self.rop.end_step(False, True)
 
 
-def show_ui():
-    if cmds.window(ToolName, exists=True):
-        cmds.deleteUI(ToolName, window=True)
-    ui = RibbonInterface(maya_main_window())
+def show_ui() -> RibbonInterface:
+    """
+    Shows the window, reusing the one hidden by its last close if any, so it is only built once per session.
+    The time it takes is stored in startupTimes.
+    """
+    start = time.perf_counter()
+    ui = RibbonInterface.instance()
+    reused = ui is not None and isValid(ui)
+    startupTimes.clear()
+    if not reused:
+        if not cmds.about(batch=True) and cmds.window(ToolName, exists=True):
+            cmds.deleteUI(ToolName, window=True)
+        RibbonInterface.delete_instance()
+        ui = RibbonInterface(maya_main_window())
     ui.show()
+    ui.raise_()
+    ui.activateWindow()
+    startupTimes.update(total=time.perf_counter() - start, reused=reused)
+    return ui
+
+
+def format_startup() -> str:
+    """
+    :return: the times of startupTimes, like "Opened in 85.2 ms (form 21.4 ms from the precompiled form, ...)"
+    """
+    if "total" not in startupTimes:
+        return ""
+    if startupTimes["reused"]:
+        return f"Opened in {startupTimes['total'] * 1000:.1f} ms (window reused)"
+    source = "precompiled form" if startupTimes.get("formSource") == "form" else "QUiLoader"
+    return (f"Opened in {startupTimes['total'] * 1000:.1f} ms (form {startupTimes['form'] * 1000:.1f} ms from the "
+            f"{source}, window {startupTimes['window'] * 1000:.1f} ms)")
 
 
 if __name__ == '__main__':
@@ -502,7 +1029,3 @@ if __name__ == '__main__':
 #  But it should check if the selected control joints can be moved to center of world for skinning step, and moved back
 # TODO: add a tab where I would be able to manage things like connect deformers to a network node,
 #  match ribbon to selected, rename ribbon etc.
-
-# TODO: add a feature to use an existing ribbon. It will reactivate the switch instead of rebuild all the ribbon
-#  It will also update length, main joints and roll joints interface from the selected ribbon.
-#  It could be dependant of a checkbox or from two QLineEdit where I store the selected ribbon and the selected setup
@@ -0,0 +1,166 @@
+"""
+Builds ribbons without the interface, from a JSON spec (see RibbonCreatorSpec). Run it with mayapy:
+
+    mayapy -m RibbonCreatorTool.RibbonCreatorBatch arms.json
+    mayapy -m RibbonCreatorTool.RibbonCreatorBatch arms.json --scenes a.ma b.ma --workers 4 --output-dir rebuilt
+
+Without scenes, the ribbons are built in a new scene. With scenes, the ribbons are built in each scene, which is
+saved in place or in --output-dir. When there are several scenes and workers, each scene is built by its own mayapy
+process, up to --workers at once.
+This module never imports Qt, so it runs on machines without a display.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from RibbonCreatorTool.RibbonCreatorSpec import RibbonSpec, load_specs
+
+RESULT_PREFIX = "RibbonCreatorBatch:"  # lines of a worker output containing the result of a scene
+
+
+def initialize_standalone() -> None:
+    try:
+        import maya.standalone
+    except ImportError:
+        raise RuntimeError("RibbonCreatorBatch must be run with mayapy.")
+    maya.standalone.initialize(name="python")
+
+
+# --------------------------------------------------------
+# ---------------------- BUILD ---------------------------
+# --------------------------------------------------------
+def build_specs(pSpecs: List[RibbonSpec], pReplace: bool = False) -> List[dict]:
+    """
+    Builds every ribbon of pSpecs in the opened scene. A ribbon that fails is deleted, so the saved scene has no
+    partial rig, and doesn't stop the others. With pReplace, a ribbon of the same name is deleted before its spec is
+    built, so it is not restored if the build fails.
+    :return: one result per spec, like {"name": "arm_L", "ribbon": "arm_L", "error": None}
+    """
+    import RibbonCreatorTool.RibbonCreatorOperations as RibbonGenOp
+    results = []
+    for spec in pSpecs:
+        rop = RibbonGenOp.RibbonOperations()
+        try:
+            ribbon = rop.build_from_spec(spec, pReplace)
+            results.append({"name": spec.name, "ribbon": ribbon, "error": None})
+        except Exception as e:
+            rop.delete_build()
+            results.append({"name": spec.name, "ribbon": None, "error": f"{type(e).__name__}: {e}"})
+    return results
+
+
+def output_path(pScene: Optional[str], pOutputDir: Optional[str]) -> Optional[str]:
+    """
+    :return: where to save pScene, None to save it in place. A new scene is saved as ribbons.ma.
+    """
+    if not pOutputDir:
+        return None if pScene else os.path.abspath("ribbons.ma")
+    return os.path.join(pOutputDir, os.path.basename(pScene) if pScene else "ribbons.ma")
+
+
+def build_scene(pScene: Optional[str], pSpecs: List[RibbonSpec], pOutput: Optional[str] = None,
+                pReplace: bool = False) -> dict:
+    """
+    Opens pScene (or a new scene), builds pSpecs and saves the scene to pOutput, or in place.
+    """
+    import maya.cmds as cmds
+    if pScene:
+        cmds.file(pScene, open=True, force=True)
+    else:
+        cmds.file(new=True, force=True)
+    results = build_specs(pSpecs, pReplace)
+    saved = pOutput or pScene
+    if pOutput:
+        cmds.file(rename=pOutput)
+    if saved:
+        sceneType = "mayaBinary" if saved.lower().endswith(".mb") else "mayaAscii"
+        cmds.file(save=True, force=True, type=sceneType)
+    return {"scene": pScene, "saved": saved, "ribbons": results}
+
+
+# --------------------------------------------------------
+# ---------------------- WORKERS -------------------------
+# --------------------------------------------------------
+def run_worker(pMayapy: str, pSpecPath: str, pScene: str, pOutputDir: Optional[str], pReplace: bool) -> dict:
+    """
+    Builds pScene in a new mayapy process.
+    :return: the result of the scene, or an error if the process failed.
+    """
+    command = [pMayapy, "-m", "RibbonCreatorTool.RibbonCreatorBatch", pSpecPath, "--scenes", pScene,
+               "--workers", "1"]
+    if pOutputDir:
+        command += ["--output-dir", pOutputDir]
+    if pReplace:
+        command.append("--replace")
+    env = dict(os.environ)
+    packageRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [packageRoot, env.get("PYTHONPATH")]))
+    process = subprocess.run(command, capture_output=True, text=True, env=env)
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    error = process.stderr.strip().splitlines()[-1:] or [f"mayapy exited with code {process.returncode}"]
+    return {"scene": pScene, "saved": None, "ribbons": [], "error": error[0]}
+
+
+def run_workers(pMayapy: str, pSpecPath: str, pScenes: List[str], pWorkers: int, pOutputDir: Optional[str],
+                pReplace: bool) -> List[dict]:
+    # threads only wait for the mayapy processes, which do the work
+    with ThreadPoolExecutor(max_workers=pWorkers) as executor:
+        futures = [executor.submit(run_worker, pMayapy, pSpecPath, scene, pOutputDir, pReplace) for scene in pScenes]
+        return [f.result() for f in futures]
+
+
+def has_errors(pResults: List[dict]) -> bool:
+    return any(r.get("error") or any(ribbon["error"] for ribbon in r["ribbons"]) for r in pResults)
+
+
+# --------------------------------------------------------
+# ---------------------- COMMAND LINE --------------------
+# --------------------------------------------------------
+def parse_args(pArgs: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="RibbonCreatorBatch", description="Builds ribbons from a JSON spec.")
+    parser.add_argument("spec", help="JSON file containing one ribbon spec or a list of specs.")
+    parser.add_argument("--scenes", nargs="*", default=[], help="Scenes to build the ribbons in.")
+    parser.add_argument("--output-dir", help="Saves the scenes in this folder instead of overwriting them.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of mayapy processes building scenes at once.")
+    parser.add_argument("--mayapy", default=sys.executable, help="mayapy executable used by the workers.")
+    parser.add_argument("--replace", action="store_true",
+                        help="Replaces ribbons that already exist, even if their new build fails.")
+    parser.add_argument("--report", help="Writes the results to this JSON file.")
+    return parser.parse_args(pArgs)
+
+
+def main(pArgs: Optional[List[str]] = None) -> int:
+    args = parse_args(pArgs)
+    specs = load_specs(args.spec)  # fails early on an invalid spec, before starting Maya
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    if args.workers > 1 and len(args.scenes) > 1:
+        results = run_workers(args.mayapy, os.path.abspath(args.spec), args.scenes, args.workers, args.output_dir,
+                              args.replace)
+    else:
+        initialize_standalone()
+        results = []
+        for scene in args.scenes or [None]:
+            result = build_scene(scene, specs, output_path(scene, args.output_dir), args.replace)
+            print(RESULT_PREFIX + json.dumps(result), flush=True)
+            results.append(result)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    for result in results:
+        for ribbon in result["ribbons"]:
+            status = ribbon["error"] or "ok"
+            print(f"{result['scene'] or 'new scene'}: {ribbon['name']} -> {status}")
+        if result.get("error"):
+            print(f"{result['scene']}: {result['error']}")
+    return 1 if has_errors(results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Builds one ribbon along each of many joint chains, like tentacles, hair strands or feathers, in a single pass:
+
+    chains = find_chains(cmds.ls(selection=True, type="joint"))
+    build_chains(chains, RibbonSpec(name="tentacle1", rollJointCount=2))
+
+The layout of every chain is computed up front, from a single query of the positions of all their joints, so an
+invalid chain is reported before anything is built, and the positions are given to each build instead of being queried
+again. The ribbons are then built one after the other in one transaction: one undo entry and one viewport refresh for
+all of them. A ribbon that fails is deleted, the others are kept.
+"""
+import dataclasses
+import math
+from typing import Callable, List, Optional, Tuple
+
+import maya.cmds as cmds
+
+import RibbonCreatorTool.RibbonCreatorOperations as RibbonGenOp
+from RibbonCreatorTool.RibbonCreatorSpec import RibbonSpec
+from RibbonCreatorTool.RibbonCreatorTransaction import Transaction
+
+
+def find_chains(pJoints: List[str]) -> List[List[str]]:
+    """
+    :param pJoints: the root joint of each chain, like a selection. A joint that is part of the chain of another one
+    is skipped, so whole hierarchies can be selected.
+    :return: each root followed by its first child joint, recursively, like [["tentacle_01", "tentacle_02", ...]]
+    """
+    chains = []
+    for root in dict.fromkeys(pJoints):
+        chain = [root]
+        children = cmds.listRelatives(root, children=True, type="joint")
+        while children:
+            chain.append(children[0])
+            children = cmds.listRelatives(children[0], children=True, type="joint")
+        chains.append(chain)
+    inner = {joint for chain in chains for joint in chain[1:]}
+    return [chain for chain in chains if chain[0] not in inner]
+
+
+def chain_specs(pChains: List[List[str]], pTemplate: RibbonSpec) -> List[RibbonSpec]:
+    """
+    Computes the spec of the ribbon of each chain: the parameters of pTemplate, aligned to the chain, with one main
+    joint per joint of the chain. Ribbons are named after pTemplate.name, from its first unused number.
+    :raise ValueError: if a chain has less than two joints, or two joints at the same position.
+    """
+    return [spec for spec, positions in chain_layouts(pChains, pTemplate)]
+
+
+def chain_layouts(pChains: List[List[str]], pTemplate: RibbonSpec) -> List[Tuple[RibbonSpec, List[List[float]]]]:
+    """
+    Same as chain_specs.
+    :return: the spec of the ribbon of each chain, with the world positions of the joints of the chain.
+    """
+    joints = [joint for chain in pChains for joint in chain]
+    positions = iter(RibbonGenOp.RibbonOperations.get_world_positions(joints) if joints else [])
+    names = RibbonGenOp.RibbonOperations.nameAllocator.next_names(pTemplate.name, len(pChains))
+    layouts = []
+    invalid = []
+    for chain, name in zip(pChains, names):
+        chainPositions = [next(positions) for _ in chain]
+        distances = [math.dist(start, end) for start, end in zip(chainPositions, chainPositions[1:])]
+        if not distances or not all(distances):
+            invalid.append(chain[0])
+            continue
+        layouts.append((dataclasses.replace(pTemplate, name=name, joints=list(chain), mainJointCount=len(chain) - 1,
+                                          length=sum(distances)), chainPositions))
+    if invalid:
+        raise ValueError(f"The chains of {invalid} need at least two joints at different positions.")
+    return layouts
+
+
+def build_chains(pChains: List[List[str]], pTemplate: RibbonSpec,
+                 pOnProgress: Optional[Callable[[int, int, str], bool]] = None) -> List[dict]:
+    """
+    Builds a ribbon along each chain of pChains, see chain_specs, in a single transaction.
+    A ribbon that fails is deleted with a warning, and doesn't stop the others.
+    :param pOnProgress: called before each ribbon with (index, count, ribbon), returns False to cancel.
+    The ribbons already built are kept, the others are reported as cancelled.
+    :return: one result per chain, like {"name": "tentacle3", "ribbon": "tentacle3", "error": None}
+    """
+    layouts = chain_layouts(pChains, pTemplate)
+    selection = cmds.ls(selection=True)
+    results = []
+    rop = RibbonGenOp.RibbonOperations()
+    with Transaction("Ribbon Creator: build_chains"):
+        for i, (spec, positions) in enumerate(layouts):
+            if pOnProgress and pOnProgress(i, len(layouts), spec.name) is False:
+                results += [{"name": s.name, "ribbon": None, "error": "Cancelled"} for s, _ in layouts[i:]]
+                break
+            try:
+                results.append({"name": spec.name, "ribbon": rop.build_from_spec(spec, pPositions=positions),
+                                "error": None})
+            except Exception as e:
+                rop.delete_build()
+                error = f"{type(e).__name__}: {e}"
+                cmds.warning(f"Ribbon '{spec.name}' could not be built on '{spec.joints[0]}': {error}")
+                results.append({"name": spec.name, "ribbon": None, "error": error})
+        if selection:
+            cmds.select(selection, replace=True)
+        else:
+            cmds.select(clear=True)
+    return results
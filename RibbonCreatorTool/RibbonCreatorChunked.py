@@ -0,0 +1,123 @@
+"""
+Builds a ribbon step by step when Maya is idle, so its interface stays responsive and can show the progress:
+
+    build = ChunkedBuild(rop, *spec.previs_args(), pOnProgress=on_progress, pOnFinished=on_finished,
+                         **spec.build_kwargs())
+    build.start()
+    ...
+    build.cancel()  # the steps already run are rolled back
+
+The steps are the ones of RibbonOperations.build_steps: surface, knots, follicles, joints, skin, each deformer and
+the metadata. Each step is run in its own transaction, then the next one is deferred to the next idle event.
+The undo chunk is opened by start and closed once the build is done, cancelled or failed, so a whole build, or a
+cancelled one with its rollback, is a single undo entry.
+"""
+from typing import Callable, Optional
+
+import maya.cmds as cmds
+
+from RibbonCreatorTool.RibbonCreatorTransaction import Transaction
+
+
+class ChunkedBuild:
+    def __init__(self, pRop, *args, pOnProgress: Optional[Callable[[int, int, str], None]] = None,
+                 pOnFinished: Optional[Callable[["ChunkedBuild"], None]] = None, **kwargs):
+        """
+        :param pRop: the RibbonOperations of the ribbon, previewed or not.
+        :param args: the arguments of RibbonOperations.build_ribbon.
+        :param pOnProgress: called after each step with (steps done, step count, name of the next step).
+        :param pOnFinished: called once the build is done, cancelled or failed.
+        """
+        self.rop = pRop
+        self.name = args[0]
+        self.steps, self.rollback = pRop.build_steps(*args, **kwargs)
+        self.onProgress = pOnProgress
+        self.onFinished = pOnFinished
+        self.done = 0
+        self.running = False
+        self.deferred = False  # each step waits for the next idle event
+        self.cancelled = False
+        self.error: Optional[str] = None
+        self.message: Optional[str] = None  # the message of end_step, once the build succeeded
+        self.undoChunk = False
+
+    @property
+    def count(self) -> int:
+        return len(self.steps)
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.running and self.done == self.count
+
+    def start(self) -> None:
+        self.running = self.deferred = True
+        self._open_chunk()
+        self._schedule()
+
+    def run(self) -> None:
+        """
+        Runs every step now, like build_ribbon.
+        """
+        self.running = True
+        self._open_chunk()
+        while self.running:
+            self._run_next()
+
+    def cancel(self, pNow: bool = False) -> None:
+        """
+        Stops the build before its next step, and rolls back the steps already run.
+        :param pNow: rolls back now instead of at the next idle event, without calling pOnFinished.
+        """
+        self.cancelled = True
+        if pNow and self.running:
+            self.onFinished = None
+            self._finish()
+
+    def _open_chunk(self) -> None:
+        if Transaction.enabled and cmds.undoInfo(query=True, state=True):
+            cmds.undoInfo(openChunk=True, chunkName=f"Ribbon Creator: build {self.name}")
+            self.undoChunk = True
+
+    def _close_chunk(self) -> None:
+        if self.undoChunk:
+            self.undoChunk = False
+            cmds.undoInfo(closeChunk=True)
+
+    def _schedule(self) -> None:
+        cmds.evalDeferred(self._run_next, lowestPriority=True)
+
+    def _run_next(self) -> None:
+        if not self.running:
+            return
+        if self.cancelled:
+            self._finish()
+            return
+        name, step = self.steps[self.done]
+        try:
+            with Transaction(f"Ribbon Creator: build {self.name} ({name})"):
+                step()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self._finish()
+            return
+        self.done += 1
+        if self.done == self.count:
+            self._finish()
+            return
+        if self.onProgress:
+            self.onProgress(self.done, self.count, self.steps[self.done][0])
+        if self.running and self.deferred:
+            self._schedule()
+
+    def _finish(self) -> None:
+        self.running = False
+        try:
+            if self.done == self.count:
+                self.message = self.rop.end_step(True, False)
+            else:  # the failed step may have stopped half way too
+                with Transaction(f"Ribbon Creator: cancel build {self.name}"):
+                    self.rollback()
+        finally:
+            self._close_chunk()
+        if self.onFinished:
+            self.onFinished(self)
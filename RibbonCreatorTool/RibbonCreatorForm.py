@@ -0,0 +1,170 @@
+"""
+Loads the interface of the tool from RibbonCreator.ui, from a precompiled Python form when there is one.
+
+Parsing the XML with QUiLoader is the slowest part of opening the window. So the first time a .ui is loaded, it is
+compiled in the background with the uic of the Qt binding, and the form is cached next to the .ui (or in the temp
+folder). The next times, the form is imported, from its bytecode, and builds the widgets directly. The name of the form
+holds a hash of the .ui, so a changed .ui is compiled again, and QUiLoader is used whenever uic can't be found.
+
+    widget = load_ui(uiPath)
+    widget.qle_name.setText("arm")
+"""
+import contextlib
+import glob
+import hashlib
+import importlib.util
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+try:
+    import PySide2 as PySide
+    from PySide2 import QtCore, QtWidgets
+    from PySide2.QtUiTools import QUiLoader
+except ModuleNotFoundError:
+    import PySide6 as PySide
+    from PySide6 import QtCore, QtWidgets
+    from PySide6.QtUiTools import QUiLoader
+
+CACHE_FOLDER = "__uicache__"
+UIC_TIMEOUT = 30  # seconds
+
+# how the last load_ui built its widget: {"source": "form" or "uiLoader", "time": seconds}
+lastLoad: dict = {}
+_formClasses: dict = {}  # form class by path of form, imported once per session
+
+
+# --------------------------------------------------------
+# ---------------------- CACHE ---------------------------
+# --------------------------------------------------------
+def form_name(pUiPath: str) -> str:
+    """
+    :return: the module name of the form of pUiPath, like "RibbonCreator_PySide2_3f2a9c01b7d4"
+    """
+    with open(pUiPath, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:12]
+    return f"{os.path.splitext(os.path.basename(pUiPath))[0]}_{PySide.__name__}_{digest}"
+
+
+def cache_folders(pUiPath: str) -> List[str]:
+    """
+    :return: the folders the form of pUiPath may be cached in, the first one being the preferred one.
+    """
+    return [os.path.join(os.path.dirname(os.path.abspath(pUiPath)), CACHE_FOLDER),
+            os.path.join(tempfile.gettempdir(), "RibbonCreatorTool", CACHE_FOLDER)]
+
+
+def find_form(pUiPath: str) -> Optional[str]:
+    """
+    :return: the path of the compiled form of pUiPath as it is now, or None.
+    """
+    name = form_name(pUiPath)
+    for folder in cache_folders(pUiPath):
+        path = os.path.join(folder, f"{name}.py")
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def find_uic() -> Optional[List[str]]:
+    """
+    :return: the command compiling a .ui to a Python form with the Qt binding in use, or None.
+    """
+    exe = ".exe" if sys.platform == "win32" else ""
+    packageFolder = os.path.dirname(PySide.__file__)
+    for path in (os.path.join(packageFolder, f"uic{exe}"),
+                 os.path.join(packageFolder, "Qt", "libexec", f"uic{exe}"),
+                 os.path.join(os.path.dirname(sys.executable), f"uic{exe}")):  # the bin folder of Maya
+        if os.path.isfile(path):
+            return [path, "-g", "python"]
+    script = shutil.which(f"{PySide.__name__.lower()}-uic")
+    return [script] if script else None
+
+
+def compile_ui(pUiPath: str) -> Optional[str]:
+    """
+    Compiles pUiPath to the first cache folder that can be written, and removes the forms of its previous versions.
+    :return: the path of the form, or None if it couldn't be compiled.
+    """
+    command = find_uic()
+    if not command:
+        return None
+    name = form_name(pUiPath)
+    for folder in cache_folders(pUiPath):
+        path = os.path.join(folder, f"{name}.py")
+        # the form appears at once, even if two sessions or threads compile it
+        temporaryPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(folder, exist_ok=True)
+            subprocess.run(command + [pUiPath, "-o", temporaryPath], check=True, capture_output=True,
+                           timeout=UIC_TIMEOUT)
+            os.replace(temporaryPath, path)
+        except (OSError, subprocess.SubprocessError):
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+            continue
+        prefix = name.rsplit("_", 1)[0]
+        for oldPath in glob.glob(os.path.join(folder, f"{prefix}_*.py")):
+            if oldPath != path:
+                with contextlib.suppress(OSError):  # imported by another session on Windows
+                    os.remove(oldPath)
+        return path
+    return None
+
+
+# --------------------------------------------------------
+# ---------------------- LOAD ----------------------------
+# --------------------------------------------------------
+def root_class(pUiPath: str) -> str:
+    """
+    :return: the class of the top level widget of pUiPath, like "QMainWindow"
+    """
+    with open(pUiPath, "r", encoding="utf-8") as f:
+        match = re.search(r'<widget class="(\w+)"', f.read())
+    return match.group(1) if match else "QWidget"
+
+
+def import_form(pFormPath: str) -> type:
+    """
+    :return: the Ui_ class generated by uic in pFormPath.
+    """
+    if pFormPath not in _formClasses:
+        name = os.path.splitext(os.path.basename(pFormPath))[0]
+        spec = importlib.util.spec_from_file_location(name, pFormPath)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _formClasses[pFormPath] = next(getattr(module, attr) for attr in dir(module) if attr.startswith("Ui_"))
+    return _formClasses[pFormPath]
+
+
+def load_ui(pUiPath: str, pParent: Optional[QtWidgets.QWidget] = None) -> QtWidgets.QWidget:
+    """
+    :return: the top level widget of pUiPath, with its children as attributes, like QUiLoader.load does.
+    """
+    start = time.perf_counter()
+    formPath = find_form(pUiPath)
+    if formPath:
+        try:
+            form = import_form(formPath)()
+            widget = getattr(QtWidgets, root_class(pUiPath))(pParent)
+            form.setupUi(widget)
+            for name, child in vars(form).items():
+                setattr(widget, name, child)
+            lastLoad.update(source="form", time=time.perf_counter() - start)
+            return widget
+        except Exception:  # a form compiled by another version of the binding, it is compiled again below
+            _formClasses.pop(formPath, None)
+    uiFile = QtCore.QFile(pUiPath)
+    uiFile.open(QtCore.QFile.ReadOnly)
+    widget = QUiLoader().load(uiFile, parentWidget=pParent)
+    uiFile.close()
+    lastLoad.update(source="uiLoader", time=time.perf_counter() - start)
+    # compiles the form for the next sessions without delaying this one
+    threading.Thread(target=compile_ui, args=(pUiPath,), daemon=True).start()
+    return widget
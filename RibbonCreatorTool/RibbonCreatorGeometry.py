@@ -0,0 +1,259 @@
+"""
+Vectorized geometry of the ribbon, without Maya: isoparm positions, joint distances, NURBS plane evaluation, frames
+and skin weights.
+
+Every function takes and returns NumPy arrays. Functions working on isoparms accept layouts stacked on the first axis,
+so thousands of layouts can be computed in one call, like iso_pos_main(np.array([[4, 3], [2, 2]])).
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+
+# orientation of the joints (in degrees) for each (forward vector, up vector)
+ORIENTATIONS = {
+    ((1, 0, 0), (0, 1, 0)): (0, 0, 0),
+    ((1, 0, 0), (0, 0, 1)): (-90, 0, 0),
+    ((0, 1, 0), (1, 0, 0)): (0, 180, -90),
+    ((0, 1, 0), (0, 0, 1)): (0, -90, -90),
+    ((0, 0, 1), (1, 0, 0)): (90, 0, 90),
+    ((0, 0, 1), (0, 1, 0)): (90, 90, 90),
+}
+
+
+# --------------------------------------------------------
+# ---------------------- ISOPARMS ------------------------
+# --------------------------------------------------------
+def iso_pos_main(pDistances) -> np.ndarray:
+    """
+    :param pDistances: distances between main joints, like [4, 3] or [[4, 3], [2, 2]] for two layouts.
+    :return: the isoparm values between 0 and 1 (excluded). For pDistances = [4, 4], returns [0.5]
+    """
+    distances = np.asarray(pDistances, dtype=float)
+    return (np.cumsum(distances, axis=-1) / distances.sum(axis=-1, keepdims=True))[..., :-1]
+
+
+def iso_pos_full(pIsoPos) -> np.ndarray:
+    """
+    :return: pIsoPos with the bounds 0 and 1 added.
+    """
+    isoPos = np.asarray(pIsoPos, dtype=float)
+    shape = isoPos.shape[:-1] + (1,)
+    return np.concatenate([np.zeros(shape), isoPos, np.ones(shape)], axis=-1)
+
+
+def iso_pos_roll(pRollCount: int, pIsoPosMain) -> np.ndarray:
+    """
+    :param pRollCount: the number of roll joints between two main joints.
+    :param pIsoPosMain: main isoparms, like [0.25, 0.75]
+    :return: the roll isoparms, evenly spaced between main isoparms and bounds.
+    """
+    full = iso_pos_full(pIsoPosMain)
+    steps = np.arange(1, pRollCount + 1) / (pRollCount + 1)
+    starts = full[..., :-1, np.newaxis]
+    spans = np.diff(full, axis=-1)[..., np.newaxis]
+    return (starts + spans * steps).reshape(full.shape[:-1] + (-1,))
+
+
+def iso_pos_all(pDistances, pRollCount: int) -> Dict[str, np.ndarray]:
+    """
+    :return: {"main": main isoparms with bounds, "roll": roll isoparms, "all": both sorted}, for the layout(s)
+    """
+    main = iso_pos_main(pDistances)
+    roll = iso_pos_roll(pRollCount, main)
+    full = iso_pos_full(main)
+    return {"main": full, "roll": roll, "all": np.sort(np.concatenate([full, roll], axis=-1), axis=-1)}
+
+
+def segment_lengths(pPositions) -> np.ndarray:
+    """
+    :param pPositions: positions of a chain of joints, like [[0, 0, 0], [4, 0, 0], [4, 3, 0]]
+    :return: the distance between each pair of consecutive positions, like [4, 3]
+    """
+    positions = np.asarray(pPositions, dtype=float)
+    return np.linalg.norm(np.diff(positions, axis=-2), axis=-1)
+
+
+def polyline_points(pPositions, pIsoPos) -> np.ndarray:
+    """
+    :param pPositions: points of a polyline, like the positions of a chain of joints.
+    :param pIsoPos: isoparms between 0 and 1, proportional to the length along the polyline.
+    :return: the position at each isoparm, of shape (len(pIsoPos), 3). The main isoparms of a chain, computed from
+    its segment_lengths, land on its joints.
+    """
+    positions = np.asarray(pPositions, dtype=float)
+    lengths = np.concatenate([[0], np.cumsum(segment_lengths(positions))])
+    params = np.asarray(pIsoPos, dtype=float) * lengths[-1]
+    return np.stack([np.interp(params, lengths, positions[:, axis]) for axis in range(positions.shape[-1])], axis=-1)
+
+
+# --------------------------------------------------------
+# ---------------------- ORIENTATION ---------------------
+# --------------------------------------------------------
+def orientation_from_vectors(pForwardVector, pUpVector) -> np.ndarray:
+    """
+    :return: the rotation in degrees of the joints, for normalized axis vectors like [1, 0, 0] and [0, 1, 0].
+    """
+    key = (tuple(int(c) for c in pForwardVector), tuple(int(c) for c in pUpVector))
+    return np.array(ORIENTATIONS.get(key, (0, 0, 0)), dtype=float)
+
+
+def frames(pPositions: np.ndarray, pTangents: np.ndarray, pNormals: np.ndarray) -> np.ndarray:
+    """
+    Builds matrices like uvPin does with normalAxis Z and tangentAxis X.
+    :return: an array of shape (n, 4, 4) of row-major matrices, X along the tangent and Z along the normal.
+    """
+    xAxis = _normalize(pTangents)
+    zAxis = _normalize(pNormals)
+    yAxis = _normalize(np.cross(zAxis, xAxis))
+    xAxis = np.cross(yAxis, zAxis)  # orthogonalize the tangent, in case the surface is sheared
+    matrices = np.zeros(pPositions.shape[:-1] + (4, 4))
+    matrices[..., 0, :3] = xAxis
+    matrices[..., 1, :3] = yAxis
+    matrices[..., 2, :3] = zAxis
+    matrices[..., 3, :3] = pPositions
+    matrices[..., 3, 3] = 1
+    return matrices
+
+
+def _normalize(pVectors: np.ndarray) -> np.ndarray:
+    lengths = np.linalg.norm(pVectors, axis=-1, keepdims=True)
+    return pVectors / np.where(lengths == 0, 1, lengths)
+
+
+# -----------------------------------------------------------
+# ---------------------- NURBS SURFACE ----------------------
+# -----------------------------------------------------------
+def full_knots(pMayaKnots, pDegree: int) -> np.ndarray:
+    """
+    Maya stores cvs + degree - 1 knots, without the first and last ones of the usual definition.
+    :return: the knot vector with cvs + degree + 1 knots.
+    """
+    knots = np.asarray(pMayaKnots, dtype=float)
+    return np.concatenate([[knots[0]], knots, [knots[-1]]]) if pDegree > 0 else knots
+
+
+def basis_functions(pKnots, pDegree: int, pParams) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluates every B-spline basis function and its derivative at every parameter (Cox-de Boor recursion).
+    :param pKnots: the full knot vector.
+    :return: two arrays of shape (len(pParams), cvCount): the values and the first derivatives.
+    """
+    knots = np.asarray(pKnots, dtype=float)
+    params = np.clip(np.asarray(pParams, dtype=float), knots[pDegree], knots[-pDegree - 1])
+    cvCount = len(knots) - pDegree - 1
+    # degree 0: 1 in the span containing the parameter. The last parameter belongs to the last non-empty span.
+    left, right = knots[:-1], knots[1:]
+    basis = ((params[:, np.newaxis] >= left) & (params[:, np.newaxis] < right)).astype(float)
+    lastSpan = np.nonzero(right > left)[0][-1]
+    basis[params >= knots[-pDegree - 1], :] = 0
+    basis[params >= knots[-pDegree - 1], lastSpan] = 1
+    derivative = np.zeros_like(basis)
+    for degree in range(1, pDegree + 1):
+        count = len(knots) - degree - 1
+        denomLeft = knots[degree:degree + count] - knots[:count]
+        denomRight = knots[degree + 1:degree + 1 + count] - knots[1:1 + count]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            a = np.where(denomLeft > 0, (params[:, np.newaxis] - knots[:count]) / denomLeft, 0)
+            b = np.where(denomRight > 0, (knots[degree + 1:degree + 1 + count] - params[:, np.newaxis]) / denomRight,
+                         0)
+            da = np.where(denomLeft > 0, degree / denomLeft, 0)
+            db = np.where(denomRight > 0, degree / denomRight, 0)
+        if degree == pDegree:
+            derivative = da * basis[:, :count] - db * basis[:, 1:count + 1]
+        basis = a * basis[:, :count] + b * basis[:, 1:count + 1]
+    return basis[:, :cvCount], derivative[:, :cvCount]
+
+
+def evaluate_surface(pCVs, pKnotsU, pKnotsV, pDegreeU: int, pDegreeV: int, pU, pV) -> Dict[str, np.ndarray]:
+    """
+    Evaluates a NURBS surface (non rational) at the parameters (pU[i], pV[i]).
+    :param pCVs: array of shape (cvCountU, cvCountV, 3)
+    :param pKnotsU: full knot vector in U, see full_knots
+    :return: {"position", "tangentU", "tangentV", "normal"}, arrays of shape (len(pU), 3). Tangents are not normalized.
+    """
+    cvs = np.asarray(pCVs, dtype=float)
+    u, v = np.broadcast_arrays(np.asarray(pU, dtype=float), np.asarray(pV, dtype=float))
+    basisU, derivU = basis_functions(pKnotsU, pDegreeU, u.ravel())
+    basisV, derivV = basis_functions(pKnotsV, pDegreeV, v.ravel())
+    position = np.einsum("pi,pj,ijk->pk", basisU, basisV, cvs)
+    tangentU = np.einsum("pi,pj,ijk->pk", derivU, basisV, cvs)
+    tangentV = np.einsum("pi,pj,ijk->pk", basisU, derivV, cvs)
+    normal = _normalize(np.cross(tangentU, tangentV))
+    return {"position": position, "tangentU": tangentU, "tangentV": tangentV, "normal": normal}
+
+
+def plane_surface(pLength: float, pDegree: int = 3, pLengthRatio: float = 0.1) -> Tuple[np.ndarray, ...]:
+    """
+    :return: (cvs, knotsU, knotsV) of the plane built by RibbonOperations.create_nurb: one span in each direction,
+    U along X from 0 to pLength, V along Y, facing Z.
+    """
+    count = pDegree + 1
+    x = np.linspace(0, pLength, count)
+    y = np.linspace(-pLength * pLengthRatio / 2, pLength * pLengthRatio / 2, count)
+    cvs = np.zeros((count, count, 3))
+    cvs[..., 0] = x[:, np.newaxis]
+    cvs[..., 1] = y[np.newaxis, :]
+    knots = np.concatenate([np.zeros(count), np.ones(count)])
+    return cvs, knots, knots.copy()
+
+
+def sample_surface(pCVs, pKnotsU, pKnotsV, pDegreeU: int, pDegreeV: int, pU, pV: float = 0.5,
+                   pLength: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Samples a surface like the ribbonSampler node of RibbonCreatorPlugin does.
+    :return: evaluate_surface results, plus "matrix" (see frames) and "length" (see iso_length) at each pU.
+    """
+    result = evaluate_surface(pCVs, pKnotsU, pKnotsV, pDegreeU, pDegreeV, pU, pV)
+    result["matrix"] = frames(result["position"], result["tangentU"], result["normal"])
+    if pLength:
+        result["length"] = iso_length(pCVs, pKnotsU, pKnotsV, pDegreeU, pDegreeV, pU)
+    return result
+
+
+def sample_plane(pLength: float, pIsoPos, pDegree: int = 3, pV: float = 0.5) -> Dict[str, np.ndarray]:
+    """
+    :return: the positions, tangents, normals, matrices and isoparm lengths of the ribbon plane at pIsoPos.
+    """
+    cvs, knotsU, knotsV = plane_surface(pLength, pDegree)
+    return sample_surface(cvs, knotsU, knotsV, pDegree, pDegree, pIsoPos, pV)
+
+
+def iso_length(pCVs, pKnotsU, pKnotsV, pDegreeU: int, pDegreeV: int, pU, pSamples: int = 16) -> np.ndarray:
+    """
+    :return: the approximate arc length of the isoparms in V at each parameter pU, like curveInfo.arcLength of a
+    curveFromSurfaceIso.
+    """
+    u = np.asarray(pU, dtype=float)
+    v = np.linspace(np.asarray(pKnotsV)[pDegreeV], np.asarray(pKnotsV)[-pDegreeV - 1], pSamples)
+    uGrid = np.repeat(u, pSamples)
+    vGrid = np.tile(v, len(u))
+    points = evaluate_surface(pCVs, pKnotsU, pKnotsV, pDegreeU, pDegreeV, uGrid, vGrid)["position"]
+    points = points.reshape(len(u), pSamples, 3)
+    return np.linalg.norm(np.diff(points, axis=1), axis=-1).sum(axis=1)
+
+
+# ---------------------------------------------------------
+# ---------------------- SKIN WEIGHTS ---------------------
+# ---------------------------------------------------------
+def assign_cvs_to_joints(pCVsX, pJointsX, pTolerance: float = 0.001) -> np.ndarray:
+    """
+    Assigns each CV to the last joint placed before it along X, like RibbonOperations.update_skin.
+    The loop of update_skin moves at most one joint forward per CV, this doesn't, so they differ only when a joint
+    has no CV between it and the next one.
+    :param pCVsX: X position of each CV.
+    :param pJointsX: X position of each joint, sorted.
+    :return: the index of the joint of each CV.
+    """
+    jointsX = np.asarray(pJointsX, dtype=float)
+    indices = np.searchsorted(jointsX[1:], np.asarray(pCVsX, dtype=float) + pTolerance, side="right")
+    return np.clip(indices, 0, len(jointsX) - 1)
+
+
+def skin_weights(pCVsX, pJointsX, pTolerance: float = 0.001) -> np.ndarray:
+    """
+    :return: the weight matrix of shape (cvCount, jointCount), each CV fully weighted to one joint.
+    """
+    indices = assign_cvs_to_joints(pCVsX, pJointsX, pTolerance)
+    weights = np.zeros((len(indices), len(pJointsX)))
+    weights[np.arange(len(indices)), indices] = 1
+    return weights
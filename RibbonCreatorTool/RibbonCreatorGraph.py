@@ -0,0 +1,428 @@
+"""
+Description of node networks as data, and builders that create them in the scene.
+
+A NodeGraph lists the nodes to create, the attributes to set and the connections to make. The nodes it creates are
+referenced by keys like "#0" until the graph is committed, any other name refers to a node that already exists.
+This module does not need Maya to be imported, so graphs can be described and inspected outside of it.
+"""
+import itertools
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+PLUGIN_PATH = os.path.join(os.path.dirname(__file__), "RibbonCreatorPlugin.py")
+COMMIT_COMMAND = "ribbonCreatorCommit"
+SAMPLER_TYPE = "ribbonSampler"  # node of the plugin computing the matrices and scales of every follicle of a group
+CIRCLE = "circle"  # pseudo node type: a transform with a nurbs circle shape, like cmds.circle(constructionHistory=False)
+
+# transactions waiting to be executed by the command of the plugin, which puts them in the undo queue, by the key
+# given to the command.
+pendingTransactions: dict = {}
+_transactionKeys = itertools.count()
+
+
+class Matrix(tuple):
+    """
+    16 values of a matrix attribute, row by row.
+    """
+
+
+class CurveData(tuple):
+    """
+    (cvs, knots) of a periodic cubic curve, to set on the "cached" attribute of a nurbsCurve shape, which holds the
+    geometry of curves without construction history and is saved with the scene, unlike the "create" input.
+    """
+
+
+class GraphNode:
+    __slots__ = ("key", "type", "name", "parent", "data")
+
+    def __init__(self, pKey: str, pType: str, pName: Optional[str], pParent: Optional[str], pData=None):
+        self.key = pKey
+        self.type = pType
+        self.name = pName
+        self.parent = pParent
+        self.data = pData
+
+
+class NodeGraph:
+    def __init__(self):
+        self.nodes: List[GraphNode] = []
+        self.values: List[Tuple[str, str, object]] = []  # node, attribute, value
+        self.connections: List[Tuple[str, str]] = []  # source plug, destination plug
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @staticmethod
+    def is_key(pNode: str) -> bool:
+        """
+        :return: True if pNode is created by a graph, False if it is the name of an existing node.
+        """
+        return pNode.startswith("#")
+
+    def add_node(self, pType: str, pName: Optional[str] = None, pParent: Optional[str] = None) -> str:
+        """
+        :param pParent: a key of this graph or the name of an existing node. DAG nodes only.
+        :return: the key of the node, to use in set_attr and connect.
+        """
+        key = f"#{len(self.nodes)}"
+        self.nodes.append(GraphNode(key, pType, pName, pParent))
+        return key
+
+    def find_node(self, pName: str) -> Optional[str]:
+        """
+        :return: the key of the node the graph creates with the name pName, or None.
+        """
+        for node in self.nodes:
+            if node.name == pName:
+                return node.key
+        return None
+
+    def add_locator(self, pName: str, pParent: Optional[str] = None) -> Tuple[str, str]:
+        """
+        :return: the keys of the transform and of the locator shape, like cmds.spaceLocator does.
+        """
+        transform = self.add_node("transform", pName, pParent)
+        shape = self.add_node("locator", f"{pName}Shape", transform)
+        return transform, shape
+
+    def add_circle(self, pName: str, pNormal: List[float], pParent: Optional[str] = None) -> str:
+        """
+        :return: the key of the transform of a circle of radius 1, without construction history.
+        """
+        key = self.add_node(CIRCLE, pName, pParent)
+        self.nodes[-1].data = list(pNormal)
+        return key
+
+    def set_attr(self, pNode: str, pAttr: str, pValue) -> None:
+        self.values.append((pNode, pAttr, pValue))
+
+    def connect(self, pSource: str, pDestination: str) -> None:
+        """
+        :param pSource: a plug like "#3.outputMatrix[0]" or "nurbsPlane1.worldSpace[0]"
+        """
+        self.connections.append((pSource, pDestination))
+
+    def node_types(self) -> Dict[str, int]:
+        """
+        :return: how many nodes of each type the graph creates, like {"uvPin": 4, "decomposeMatrix": 4}
+        """
+        count = {}
+        for node in self.nodes:
+            count[node.type] = count.get(node.type, 0) + 1
+        return count
+
+
+# ------------------------------------------------------------
+# ---------------------- MATH HELPERS ------------------------
+# ------------------------------------------------------------
+def euler_to_matrix(pRotation: List[float]) -> Matrix:
+    """
+    :param pRotation: rotation in degrees, with rotate order XYZ.
+    :return: the rotation matrix, like the one of a transform rotated by pRotation.
+    """
+    x, y, z = (math.radians(a) for a in pRotation)
+    cx, sx, cy, sy, cz, sz = math.cos(x), math.sin(x), math.cos(y), math.sin(y), math.cos(z), math.sin(z)
+    return Matrix((cy * cz, cy * sz, -sy, 0,
+                   sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy, 0,
+                   cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy, 0,
+                   0, 0, 0, 1))
+
+
+def circle_data(pNormal: List[float]) -> CurveData:
+    """
+    :return: the CVs and knots of a periodic cubic circle of radius 1 facing pNormal, like cmds.circle.
+    """
+    length = math.sqrt(sum(c * c for c in pNormal)) or 1
+    normal = [c / length for c in pNormal]
+    helper = [0, 0, 1] if abs(normal[2]) < 0.9 else [1, 0, 0]
+    # u, v are orthonormal vectors of the plane of the circle
+    u = [normal[1] * helper[2] - normal[2] * helper[1],
+         normal[2] * helper[0] - normal[0] * helper[2],
+         normal[0] * helper[1] - normal[1] * helper[0]]
+    uLength = math.sqrt(sum(c * c for c in u))
+    u = [c / uLength for c in u]
+    v = [normal[1] * u[2] - normal[2] * u[1],
+         normal[2] * u[0] - normal[0] * u[2],
+         normal[0] * u[1] - normal[1] * u[0]]
+    radius = 1.1081941875543879  # distance of the CVs to the center for a cubic circle of radius 1 with 8 spans
+    cvs = []
+    for i in range(8):
+        angle = -math.pi / 4 + i * math.pi / 4
+        a, b = math.cos(angle) * radius, math.sin(angle) * radius
+        cvs.append(tuple(a * u[j] + b * v[j] for j in range(3)))
+    cvs += cvs[:3]  # periodic curves repeat their first "degree" CVs
+    knots = [float(k) for k in range(-2, 11)]
+    return CurveData((cvs, knots))
+
+
+# -------------------------------------------------------
+# ---------------------- BUILDERS -----------------------
+# -------------------------------------------------------
+class CmdsBuilder:
+    """
+    Creates a graph with one maya.cmds call per operation.
+    """
+
+    def commit(self, pGraph: NodeGraph) -> Dict[str, str]:
+        """
+        :return: the names of the created nodes by key.
+        """
+        import maya.cmds as cmds
+
+        names = {}
+        for node in pGraph.nodes:
+            parent = names.get(node.parent, node.parent)
+            if node.type == CIRCLE:
+                name = cmds.circle(name=node.name, center=[0, 0, 0], normal=node.data, constructionHistory=False)[0]
+                if parent:
+                    name = cmds.parent(name, parent)[0]
+            else:
+                kwargs = {"name": node.name} if node.name else {}
+                if parent:
+                    kwargs["parent"] = parent
+                name = cmds.createNode(node.type, skipSelect=True, **kwargs)
+            names[node.key] = name
+
+        def plug(pPlug: str) -> str:
+            node, attr = pPlug.split(".", 1)
+            return f"{names.get(node, node)}.{attr}"
+
+        for node, attr, value in pGraph.values:
+            if isinstance(value, Matrix):
+                cmds.setAttr(plug(f"{node}.{attr}"), list(value), type="matrix")
+            elif isinstance(value, (list, tuple)):
+                cmds.setAttr(plug(f"{node}.{attr}"), *value)
+            else:
+                cmds.setAttr(plug(f"{node}.{attr}"), value)
+        for source, destination in pGraph.connections:
+            cmds.connectAttr(plug(source), plug(destination))
+        return names
+
+
+class ModifierBuilder:
+    """
+    Creates a graph by queuing every operation on a modifier, then executing it at once.
+    """
+
+    def __init__(self, pModifier=None):
+        self.modifier = pModifier if pModifier is not None else MayaModifier()
+
+    def commit(self, pGraph: NodeGraph, pUndoable: bool = True) -> Dict[str, str]:
+        """
+        :param pUndoable: execute the modifier through the command of the plugin, so it is one entry in the undo queue.
+        :return: the names of the created nodes by key.
+        """
+        modifier = self.modifier
+        handles = {}
+
+        def node(pNode: str):
+            return handles[pNode] if NodeGraph.is_key(pNode) else modifier.get_node(pNode)
+
+        for graphNode in pGraph.nodes:
+            parent = node(graphNode.parent) if graphNode.parent else None
+            if graphNode.type == CIRCLE:
+                handle = modifier.create_node("transform", parent)
+                shape = modifier.create_node("nurbsCurve", handle)
+                modifier.set_plug(modifier.find_plug(shape, "cached"), circle_data(graphNode.data))
+                modifier.rename_node(shape, f"{graphNode.name}Shape")
+            else:
+                handle = modifier.create_node(graphNode.type, parent)
+            if graphNode.name:
+                modifier.rename_node(handle, graphNode.name)
+            handles[graphNode.key] = handle
+
+        def plug(pPlug: str):
+            nodeName, attr = pPlug.split(".", 1)
+            return modifier.find_plug(node(nodeName), attr)
+
+        for nodeName, attr, value in pGraph.values:
+            modifier.set_plug(plug(f"{nodeName}.{attr}"), value)
+        for source, destination in pGraph.connections:
+            modifier.connect(plug(source), plug(destination))
+
+        if pUndoable and modifier.undoable:
+            key = str(next(_transactionKeys))
+            pendingTransactions[key] = modifier
+            try:
+                modifier.execute_command(key)
+            finally:
+                pendingTransactions.pop(key, None)  # still there if the command failed before taking it
+        else:
+            modifier.do_it()
+        return {key: modifier.node_name(handle) for key, handle in handles.items()}
+
+
+class MayaModifier:
+    """
+    Wraps an OpenMaya MDagModifier (for DAG nodes) and MDGModifier (for everything else) as one transaction.
+    """
+    undoable = True
+
+    def __init__(self):
+        import maya.api.OpenMaya as om
+        import maya.cmds as cmds
+
+        self.om = om
+        self.cmds = cmds
+        self.dagModifier = om.MDagModifier()
+        self.dgModifier = om.MDGModifier()
+        self._dagTypes: Dict[str, bool] = {}
+
+    def is_dag_type(self, pType: str) -> bool:
+        if pType not in self._dagTypes:
+            inherited = self.cmds.nodeType(pType, isTypeName=True, inherited=True) or []
+            self._dagTypes[pType] = "dagNode" in inherited
+        return self._dagTypes[pType]
+
+    def get_node(self, pName: str):
+        selection = self.om.MSelectionList()
+        selection.add(pName)
+        return selection.getDependNode(0)
+
+    def create_node(self, pType: str, pParent=None):
+        if self.is_dag_type(pType):
+            return self.dagModifier.createNode(pType, pParent if pParent is not None else self.om.MObject.kNullObj)
+        return self.dgModifier.createNode(pType)
+
+    def rename_node(self, pNode, pName: str) -> None:
+        modifier = self.dagModifier if pNode.hasFn(self.om.MFn.kDagNode) else self.dgModifier
+        modifier.renameNode(pNode, pName)
+
+    def find_plug(self, pNode, pAttr: str):
+        """
+        :param pAttr: a path like "coordinate[0].coordinateU"
+        """
+        fnNode = self.om.MFnDependencyNode(pNode)
+        plug = None
+        for token in pAttr.split("."):
+            name, _, index = token.partition("[")
+            plug = fnNode.findPlug(name, False) if plug is None else plug.child(fnNode.attribute(name))
+            if index:
+                plug = plug.elementByLogicalIndex(int(index.rstrip("]")))
+        return plug
+
+    def set_plug(self, pPlug, pValue) -> None:
+        om = self.om
+        modifier = self.dgModifier
+        if isinstance(pValue, Matrix):
+            modifier.newPlugValue(pPlug, om.MFnMatrixData().create(om.MMatrix(list(pValue))))
+        elif isinstance(pValue, CurveData):
+            cvs, knots = pValue
+            data = om.MFnNurbsCurveData().create()
+            om.MFnNurbsCurve().create([om.MPoint(cv) for cv in cvs], knots, 3, om.MFnNurbsCurve.kPeriodic, False,
+                                      True, data)
+            modifier.newPlugValue(pPlug, data)
+        elif isinstance(pValue, (list, tuple)):
+            for i, value in enumerate(pValue):
+                self.set_plug(pPlug.child(i), value)
+        elif isinstance(pValue, bool):
+            modifier.newPlugValueBool(pPlug, pValue)
+        elif isinstance(pValue, int):
+            modifier.newPlugValueInt(pPlug, pValue)
+        elif isinstance(pValue, str):
+            modifier.newPlugValueString(pPlug, pValue)
+        elif pPlug.attribute().hasFn(om.MFn.kUnitAttribute) and \
+                om.MFnUnitAttribute(pPlug.attribute()).unitType() == om.MFnUnitAttribute.kAngle:
+            modifier.newPlugValueMAngle(pPlug, om.MAngle(pValue, om.MAngle.kDegrees))
+        else:
+            modifier.newPlugValueDouble(pPlug, pValue)
+
+    def connect(self, pSource, pDestination) -> None:
+        self.dgModifier.connect(pSource, pDestination)
+
+    def node_name(self, pNode) -> str:
+        if pNode.hasFn(self.om.MFn.kDagNode):
+            return self.om.MFnDagNode(pNode).partialPathName()
+        return self.om.MFnDependencyNode(pNode).name()
+
+    def execute_command(self, pKey: str) -> None:
+        """
+        :param pKey: the key of the modifier in pendingTransactions.
+        """
+        getattr(self.cmds, COMMIT_COMMAND)(pKey)
+
+    def do_it(self) -> None:
+        self.dagModifier.doIt()  # DAG nodes first, since the DG modifier connects them
+        self.dgModifier.doIt()
+
+    def undo_it(self) -> None:
+        self.dgModifier.undoIt()
+        self.dagModifier.undoIt()
+
+
+class RecordingModifier:
+    """
+    Stand-in for MayaModifier that records the operations instead of editing a scene.
+    It allows to inspect and test what a graph does without Maya.
+    """
+    undoable = False
+
+    def __init__(self):
+        self.operations: List[tuple] = []
+        self.doItCount = 0
+        self._names: Dict[str, str] = {}
+
+    def get_node(self, pName: str) -> str:
+        return pName
+
+    def create_node(self, pType: str, pParent: Optional[str] = None) -> str:
+        handle = f"{pType}@{len(self._names)}"
+        self._names[handle] = handle
+        self.operations.append(("createNode", pType, pParent))
+        return handle
+
+    def rename_node(self, pNode: str, pName: str) -> None:
+        self._names[pNode] = pName
+        self.operations.append(("renameNode", pNode, pName))
+
+    @staticmethod
+    def find_plug(pNode: str, pAttr: str) -> str:
+        return f"{pNode}.{pAttr}"
+
+    def set_plug(self, pPlug: str, pValue) -> None:
+        self.operations.append(("setPlug", pPlug, pValue))
+
+    def connect(self, pSource: str, pDestination: str) -> None:
+        self.operations.append(("connect", pSource, pDestination))
+
+    def node_name(self, pNode: str) -> str:
+        return self._names.get(pNode, pNode)
+
+    def execute_command(self, pKey: str) -> None:
+        self.do_it()
+
+    def do_it(self) -> None:
+        self.doItCount += 1
+
+    def undo_it(self) -> None:
+        self.doItCount -= 1
+
+
+def load_plugin() -> bool:
+    """
+    Loads the plugin that registers the undoable commit command and the ribbonSampler node.
+    :return: False if it can't be loaded, for example in a session without the OpenMaya API.
+    """
+    try:
+        import maya.cmds as cmds
+
+        if not cmds.pluginInfo(PLUGIN_PATH, query=True, loaded=True):
+            cmds.loadPlugin(PLUGIN_PATH, quiet=True)
+        return True
+    except (ImportError, RuntimeError):
+        return False
+
+
+def commit(pGraph: NodeGraph) -> Dict[str, str]:
+    """
+    Creates pGraph in the scene, with a single modifier when the plugin is available,
+    otherwise with one maya.cmds call per operation.
+    :return: the names of the created nodes by key.
+    """
+    if not pGraph.nodes and not pGraph.values and not pGraph.connections:
+        return {}
+    if load_plugin():
+        return ModifierBuilder().commit(pGraph)
+    return CmdsBuilder().commit(pGraph)
@@ -0,0 +1,61 @@
+"""
+Index of every ribbon of the scene built by the tool, read from their metadata nodes (see RibbonCreatorMetadata),
+and bulk edition of several ribbons at once.
+
+    ribbons = scan_ribbons()
+    edit_ribbons([r.ribbon for r in ribbons if r.spec.rollJointCount < 3], {"rollJointCount": 3, "sine": True})
+
+Each ribbon is edited in its own transaction, so it is one undo entry, and a ribbon that fails doesn't stop the others.
+"""
+from typing import Callable, Dict, List, Optional
+
+import maya.cmds as cmds
+
+import RibbonCreatorTool.RibbonCreatorMetadata as RibbonMeta
+import RibbonCreatorTool.RibbonCreatorOperations as RibbonGenOp
+
+
+def scan_ribbons() -> List[RibbonMeta.RibbonMetadata]:
+    """
+    :return: the metadata of every ribbon of the scene, sorted by name. Metadata nodes whose ribbon has been deleted
+    are skipped.
+    """
+    ribbons = []
+    for node in RibbonMeta.list_nodes():
+        try:
+            ribbons.append(RibbonMeta.read(node))
+        except ValueError:
+            continue
+    return sorted(ribbons, key=lambda metadata: metadata.ribbon)
+
+
+def ribbon_names() -> Dict[str, str]:
+    """
+    :return: the metadata node of every ribbon of the scene, by name of ribbon.
+    """
+    names = {}
+    for node in RibbonMeta.list_nodes():
+        ribbon = cmds.listConnections(f"{node}.ribbon", source=True, destination=False)
+        if ribbon:
+            names[ribbon[0]] = node
+    return names
+
+
+def edit_ribbons(pRibbons: List[str], pChanges: dict,
+                 pOnProgress: Optional[Callable[[int, int, str], bool]] = None) -> List[dict]:
+    """
+    Applies pChanges to every ribbon of pRibbons, see RibbonOperations.edit_ribbon.
+    :param pOnProgress: called before each ribbon with (index, count, ribbon), returns False to stop.
+    :return: one result per ribbon edited, like {"ribbon": "arm_L", "spec": {...}, "error": None}
+    """
+    results = []
+    for i, ribbon in enumerate(pRibbons):
+        if pOnProgress and pOnProgress(i, len(pRibbons), ribbon) is False:
+            break
+        rop = RibbonGenOp.RibbonOperations()
+        try:
+            spec = rop.edit_ribbon(ribbon, pChanges)
+            results.append({"ribbon": ribbon, "spec": spec.to_dict(), "error": None})
+        except Exception as e:
+            results.append({"ribbon": ribbon, "spec": None, "error": f"{type(e).__name__}: {e}"})
+    return results
@@ -0,0 +1,55 @@
+"""
+Modules imported on first use instead of when the tool is imported, so opening the window doesn't wait for the modules
+only some actions need, like the operations of the menus or NumPy for the geometry.
+
+    RibbonGeo = LazyModule("RibbonCreatorTool.RibbonCreatorGeometry", pOptional=True)
+    if RibbonGeo:  # imports it, False if it can't be imported
+        RibbonGeo.segment_lengths(positions)
+"""
+import importlib
+import sys
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    __slots__ = ("_name", "_optional", "_module", "_failed")
+
+    def __init__(self, pName: str, pOptional: bool = False):
+        """
+        :param pName: the full name of the module, like "RibbonCreatorTool.RibbonCreatorOperations"
+        :param pOptional: an ImportError makes the module False instead of being raised, like NumPy missing.
+        """
+        self._name = pName
+        self._optional = pOptional
+        self._module: Optional[ModuleType] = None
+        self._failed = False
+
+    def _load(self) -> Optional[ModuleType]:
+        if self._module is None and not self._failed:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError:
+                if not self._optional:
+                    raise
+                self._failed = True
+        return self._module
+
+    def __bool__(self) -> bool:
+        return self._load() is not None
+
+    def __getattr__(self, pAttr: str):
+        module = self._load()
+        if module is None:
+            raise AttributeError(f"'{self._name}' can't be imported, it has no attribute '{pAttr}'.")
+        return getattr(module, pAttr)
+
+    def __repr__(self) -> str:
+        return f"<LazyModule '{self._name}' {'imported' if self._module else 'not imported'}>"
+
+
+def is_imported(pModule: LazyModule) -> bool:
+    """
+    :return: True if pModule has been imported, here or by another module, without importing it.
+    """
+    return pModule._module is not None or pModule._name in sys.modules
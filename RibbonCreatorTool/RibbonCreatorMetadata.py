@@ -0,0 +1,152 @@
+"""
+Metadata of each ribbon, stored on a network node, so a ribbon built by the tool can be found and reopened with a few
+attribute reads instead of walking its history and sorting its connections.
+
+The network node "<ribbon>_meta" has:
+    ribbon              message from the nurb of the ribbon
+    ribbonSpec          the RibbonSpec of the ribbon, as JSON
+    mainIsoPos          isoparms of the main follicles (without the bounds 0 and 1)
+    rollIsoPos          isoparms of the roll follicles
+    nodes[]             message from each node of the ribbon, so they are still found after being renamed
+    nodeRoles           role of each element of nodes[], like "mainKnot" or "skinCluster"
+    controlJoints[]     message from each control joint, in the order of the ribbon
+    mainJointIndices    indices of the main joints in controlJoints
+Every node of nodes[] is connected to the metadata node, so the ribbon is found from any of them.
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import maya.cmds as cmds
+
+from RibbonCreatorTool.RibbonCreatorSpec import RibbonSpec
+
+VERSION = 1
+SPEC_ATTR = "ribbonSpec"  # every metadata node has it, it is used to list them
+
+
+@dataclass
+class RibbonMetadata:
+    ribbon: str
+    spec: RibbonSpec
+    mainIsoPos: tuple = tuple()
+    rollIsoPos: tuple = tuple()
+    nodes: Dict[str, str] = field(default_factory=dict)  # role -> node
+    controlJoints: List[str] = field(default_factory=list)
+    mainJointIndices: List[int] = field(default_factory=list)
+
+    @property
+    def controlJointsMain(self) -> List[str]:
+        return [self.controlJoints[i] for i in self.mainJointIndices if i < len(self.controlJoints)]
+
+
+# --------------------------------------------------------
+# ---------------------- FIND ----------------------------
+# --------------------------------------------------------
+def is_metadata(pNode: str) -> bool:
+    return bool(cmds.attributeQuery(SPEC_ATTR, node=pNode, exists=True))
+
+
+def find(pNode: str) -> Optional[str]:
+    """
+    :param pNode: the nurb of a ribbon, or one of its nodes, like its setup group.
+    :return: the metadata node of the ribbon of pNode, or None.
+    """
+    if not cmds.objExists(pNode):
+        return None
+    if cmds.objectType(pNode) == "network" and is_metadata(pNode):
+        return pNode
+    networks = cmds.listConnections(f"{pNode}.message", source=False, destination=True, type="network") or []
+    for network in dict.fromkeys(networks):
+        if is_metadata(network):
+            return network
+    return None
+
+
+def list_nodes() -> List[str]:
+    """
+    :return: the metadata node of every ribbon of the scene, found with a single query.
+    """
+    return cmds.ls(f"*.{SPEC_ATTR}", objectsOnly=True, type="network") or []
+
+
+# --------------------------------------------------------
+# ---------------------- WRITE ---------------------------
+# --------------------------------------------------------
+def create(pRibbon: str) -> str:
+    """
+    Creates the metadata node of pRibbon, with empty attributes.
+    """
+    node = cmds.createNode("network", name=f"{pRibbon}_meta", skipSelect=True)
+    cmds.addAttr(node, longName="ribbonCreatorVersion", attributeType="long", defaultValue=VERSION)
+    cmds.addAttr(node, longName="ribbon", attributeType="message")
+    cmds.addAttr(node, longName=SPEC_ATTR, dataType="string")
+    for attr in ("mainIsoPos", "rollIsoPos"):
+        cmds.addAttr(node, longName=attr, dataType="doubleArray")
+    cmds.addAttr(node, longName="nodes", attributeType="message", multi=True)
+    cmds.addAttr(node, longName="nodeRoles", dataType="stringArray")
+    cmds.addAttr(node, longName="controlJoints", attributeType="message", multi=True)
+    cmds.addAttr(node, longName="mainJointIndices", dataType="Int32Array")
+    cmds.connectAttr(f"{pRibbon}.message", f"{node}.ribbon")
+    return node
+
+
+def _connect_messages(pNode: str, pAttr: str, pSources: List[str]) -> None:
+    """
+    Connects the message of each node of pSources to pAttr[i] of pNode, only where it is not connected yet,
+    and disconnects the elements after them.
+    """
+    connections = cmds.listConnections(f"{pNode}.{pAttr}", source=True, destination=False, connections=True) or []
+    current = {connections[i]: connections[i + 1] for i in range(0, len(connections), 2)}
+    for i, source in enumerate(pSources):
+        plug = f"{pNode}.{pAttr}[{i}]"
+        if current.pop(plug, None) != source:
+            cmds.connectAttr(f"{source}.message", plug, force=True)
+    for plug, source in current.items():
+        cmds.disconnectAttr(f"{source}.message", plug)
+
+
+def write(pNode: str, pMetadata: RibbonMetadata, pJoints: bool = True) -> None:
+    """
+    Stores pMetadata on the metadata node pNode.
+    :param pJoints: also stores the control joints, which only change when they are rebuilt.
+    """
+    cmds.setAttr(f"{pNode}.{SPEC_ATTR}", json.dumps(pMetadata.spec.to_dict()), type="string")
+    cmds.setAttr(f"{pNode}.mainIsoPos", list(pMetadata.mainIsoPos), type="doubleArray")
+    cmds.setAttr(f"{pNode}.rollIsoPos", list(pMetadata.rollIsoPos), type="doubleArray")
+    roles = [role for role, node in pMetadata.nodes.items() if node]
+    cmds.setAttr(f"{pNode}.nodeRoles", len(roles), *roles, type="stringArray")
+    _connect_messages(pNode, "nodes", [pMetadata.nodes[role] for role in roles])
+    if pJoints:
+        cmds.setAttr(f"{pNode}.mainJointIndices", pMetadata.mainJointIndices, type="Int32Array")
+        _connect_messages(pNode, "controlJoints", pMetadata.controlJoints)
+
+
+# --------------------------------------------------------
+# ---------------------- READ ----------------------------
+# --------------------------------------------------------
+def _read_messages(pNode: str, pAttr: str) -> Dict[int, str]:
+    """
+    :return: the node connected to each element of pAttr, by index.
+    """
+    connections = cmds.listConnections(f"{pNode}.{pAttr}", source=True, destination=False, connections=True) or []
+    return {int(connections[i].rsplit("[", 1)[-1][:-1]): connections[i + 1] for i in range(0, len(connections), 2)}
+
+
+def read(pNode: str) -> RibbonMetadata:
+    """
+    :param pNode: a metadata node.
+    """
+    ribbon = cmds.listConnections(f"{pNode}.ribbon", source=True, destination=False)
+    if not ribbon:
+        raise ValueError(f"The ribbon of '{pNode}' has been deleted.")
+    spec = RibbonSpec.from_dict(json.loads(cmds.getAttr(f"{pNode}.{SPEC_ATTR}")))
+    roles = cmds.getAttr(f"{pNode}.nodeRoles") or []
+    nodes = _read_messages(pNode, "nodes")
+    joints = _read_messages(pNode, "controlJoints")
+    return RibbonMetadata(ribbon[0], spec,
+                          tuple(cmds.getAttr(f"{pNode}.mainIsoPos") or ()),
+                          tuple(cmds.getAttr(f"{pNode}.rollIsoPos") or ()),
+                          {role: nodes[i] for i, role in enumerate(roles) if i in nodes},
+                          [joints[i] for i in sorted(joints)],
+                          list(cmds.getAttr(f"{pNode}.mainJointIndices") or []))
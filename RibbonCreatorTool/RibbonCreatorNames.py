@@ -0,0 +1,160 @@
+"""
+Allocation of unique ribbon names, like "Ribbon3" when "Ribbon1" and "Ribbon2" are used.
+
+A name is used if a node name starts with it, followed by anything but a digit: "Ribbon1_setup" uses "Ribbon1",
+but "Ribbon12" does not. The scene is scanned once to index the numbers used after each prefix, then the index is
+kept up to date by node added, removed and renamed callbacks, so a new name is found without querying the scene.
+When the OpenMaya API is not available, no callback keeps the index up to date, so the numbers of the requested prefix
+are indexed again with a single query on that prefix for each name, the rest of the index being kept.
+"""
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import maya.cmds as cmds
+
+try:
+    import maya.api.OpenMaya as om
+except ImportError:
+    om = None
+
+_numberRe = re.compile(r"\d+")
+_trailingNumberRe = re.compile(r"^(.*?)(\d*)$")
+
+
+class NameAllocator:
+    def __init__(self):
+        self._used: Optional[Dict[str, Counter]] = None  # prefix -> number -> count of nodes, None until scanned
+        self._callbackIds = []
+
+    # --------------------------------------------------------
+    # ---------------------- INDEX ---------------------------
+    # --------------------------------------------------------
+    @staticmethod
+    def split_name(pName: str) -> Tuple[str, Optional[int]]:
+        """
+        :return: pName without its trailing number, and this number or None, like ("arm_L", 12) for "arm_L12"
+        """
+        prefix, number = _trailingNumberRe.match(pName).groups()
+        return prefix, int(number) if number else None
+
+    @staticmethod
+    def _keys(pNodeName: str):
+        """
+        :return: (prefix, number) for each number in pNodeName, like ("Ribbon", 12) and ("Ribbon12_jnt", 3)
+        for "Ribbon12_jnt3". Numbers with leading zeros are skipped, as no allocated name can match them.
+        """
+        name = pNodeName.rsplit("|", 1)[-1]
+        for match in _numberRe.finditer(name):
+            digits = match.group()
+            if digits == "0" or not digits.startswith("0"):
+                yield name[:match.start()], int(digits)
+
+    def _add(self, pNodeName: str) -> None:
+        for prefix, number in self._keys(pNodeName):
+            self._used.setdefault(prefix, Counter())[number] += 1
+
+    def _remove(self, pNodeName: str) -> None:
+        for prefix, number in self._keys(pNodeName):
+            numbers = self._used.get(prefix)
+            if numbers and numbers[number] > 0:
+                numbers[number] -= 1
+                if not numbers[number]:
+                    del numbers[number]
+
+    def scan(self) -> None:
+        """
+        Indexes the names of every node of the scene.
+        """
+        self._used = {}
+        for name in cmds.ls():
+            self._add(name)
+        self._ensure_callbacks()
+
+    def refresh(self, pPrefix: str) -> None:
+        """
+        Indexes again the names of the nodes starting with pPrefix, as the numbers used after it may have changed.
+        """
+        numbers = Counter()
+        for name in cmds.ls(f"{pPrefix}*"):
+            for prefix, number in self._keys(name):
+                if prefix == pPrefix:
+                    numbers[number] += 1
+        self._used[pPrefix] = numbers
+
+    def invalidate(self) -> None:
+        self._used = None
+
+    # --------------------------------------------------------
+    # ---------------------- CALLBACKS -----------------------
+    # --------------------------------------------------------
+    def _ensure_callbacks(self) -> None:
+        if om is None or self._callbackIds:
+            return
+        self._callbackIds = [
+            om.MDGMessage.addNodeAddedCallback(self._on_node_added, "dependNode"),
+            om.MDGMessage.addNodeRemovedCallback(self._on_node_removed, "dependNode"),
+            om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, self._on_name_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeNew, self._on_scene_cleared),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen, self._on_scene_cleared),
+        ]
+
+    def remove_callbacks(self) -> None:
+        if self._callbackIds:
+            om.MMessage.removeCallbacks(self._callbackIds)
+        self._callbackIds = []
+        self.invalidate()
+
+    def _on_node_added(self, pNode, *args) -> None:
+        if self._used is not None:
+            self._add(om.MFnDependencyNode(pNode).name())
+
+    def _on_node_removed(self, pNode, *args) -> None:
+        if self._used is not None:
+            self._remove(om.MFnDependencyNode(pNode).name())
+
+    def _on_name_changed(self, pNode, pPreviousName: str, *args) -> None:
+        if self._used is not None:
+            self._remove(pPreviousName)
+            self._add(om.MFnDependencyNode(pNode).name())
+
+    def _on_scene_cleared(self, *args) -> None:
+        self.invalidate()  # the next name scans the new scene
+
+    # --------------------------------------------------------
+    # ---------------------- ALLOCATE ------------------------
+    # --------------------------------------------------------
+    def next_name(self, pName: str) -> str:
+        """
+        :param pName: a name like "Ribbon", "Ribbon1" or "arm_L12"
+        :return: the first unused name with the prefix of pName, numbered from the number of pName or 1,
+        like "Ribbon3" when "Ribbon1" and "Ribbon2" are used.
+        """
+        prefix, number = self.split_name(pName)
+        if self._used is None:
+            self.scan()
+        elif om is None:
+            self.refresh(prefix)
+        used = self._used.get(prefix, {})
+        number = 1 if number is None else number
+        while used.get(number, 0) > 0:
+            number += 1
+        return f"{prefix}{number}"
+
+    def next_names(self, pName: str, pCount: int) -> List[str]:
+        """
+        :return: the first pCount unused names with the prefix of pName, like next_name, found with a single query.
+        """
+        prefix, number = self.split_name(pName)
+        if self._used is None:
+            self.scan()
+        elif om is None:
+            self.refresh(prefix)
+        used = self._used.get(prefix, {})
+        number = 1 if number is None else number
+        names = []
+        while len(names) < pCount:
+            if used.get(number, 0) <= 0:
+                names.append(f"{prefix}{number}")
+            number += 1
+        return names
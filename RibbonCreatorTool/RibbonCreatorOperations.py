@@ -1,9 +1,31 @@
+import bisect
+import dataclasses
+import functools
 import math
+import time
 from enum import Enum
-from typing import Union, List, Tuple, Optional
+from typing import Callable, Union, List, Tuple, Optional, Dict
 
 import maya.cmds as cmds
 
+try:
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+except ImportError:
+    om = None
+
+import RibbonCreatorTool.RibbonCreatorGraph as RibbonGraph
+import RibbonCreatorTool.RibbonCreatorMetadata as RibbonMeta
+import RibbonCreatorTool.RibbonCreatorProxy as RibbonProxy
+from RibbonCreatorTool.RibbonCreatorLazy import LazyModule
+from RibbonCreatorTool.RibbonCreatorNames import NameAllocator
+from RibbonCreatorTool.RibbonCreatorRegistry import NodeRegistry
+from RibbonCreatorTool.RibbonCreatorSpec import RibbonSpec, DEFORMERS
+from RibbonCreatorTool.RibbonCreatorTransaction import transaction
+
+# NumPy is not shipped with every Maya version, it is imported the first time joints are measured or skinned
+RibbonGeo = LazyModule("RibbonCreatorTool.RibbonCreatorGeometry", pOptional=True)
+
 
 class KnotType(Enum):
     main = "mainKnot"
@@ -16,100 +38,124 @@ class KnotType(Enum):
 class MethodName(Enum):
     posi = "pointOnSurfaceInfo"
     uvPin = "uvPin"
+    sharedUvPin = "sharedUvPin"  # one uvPin per follicle group, with one coordinate per follicle
+    sampler = "ribbonSampler"  # one ribbonSampler node of the plugin per follicle group, computing scales too
+
+    def __str__(self):
+        return str(self.value)
+
+
+SHARED_PIN_METHODS = (MethodName.sharedUvPin, MethodName.sampler)
+# roles of the nurb and of the handle of each deformer in the registry
+DEFORMER_ROLES = tuple(f"{d}{role}" for d in DEFORMERS for role in ("Surface", "Handle"))
+SHARED_DEFORMER_ROLE = "deformerSurface"  # role of the nurb every deformer is stacked on, with shared deformers
+# roles of the registry stored on the metadata node
+METADATA_ROLES = ("makeNurbPlane", str(KnotType.main), str(KnotType.roll), "skinCluster", "blendShape", "grpRibbon",
+                  "grpLoc", "grpJnt", "grpDeform", SHARED_DEFORMER_ROLE) + DEFORMER_ROLES
+# fields of RibbonSpec that can be changed on a built ribbon, deformers being toggled by name
+EDITABLE_FIELDS = ("length", "mainJointCount", "rollJointCount", "controlJoints", "chain", "skin", "pinch",
+                   "scaleMode", "sharedDeformers")
+
+
+class ScaleMode(Enum):
+    none = "none"  # follicles are not scaled
+    globalScale = "global"  # the width of the ribbon is measured once, at its middle, for every follicle
+    perIso = "perIso"  # each follicle measures the width of the ribbon at its isoparm
 
     def __str__(self):
         return str(self.value)
 
 
 class RibbonOperations:
-    selection: list = []  # selected joints
-    align: bool = False
-    ribbon: str = ""
-    ribbonList: list = []
-    length: float = 10
-    smooth: int = 3
-    distances: list = []
-    jntRadius: float = 1
-    grpRibbon: str = ""
-    grpLoc: str = ""
-    grpJnt: str = ""
-    grpDeform: str = ""
-
-    makeNurbNode: str = ""
-    mainKnotNode: str = ""
-    rollKnotNode: str = ""
-    pinchKnotNode: str = ""
-    blendShapeNode: str = ""
-    mainIsoPos: tuple = tuple()
-    rollIsoPos: tuple = tuple()
-    forwardVector: list = []
-    upVector: list = []
-    orient: list = []
-
-    # networkNode: str = ""
-    controlJointsMain: list = []
-    controlJointsAll: list = []
-
-    previs_step: bool = False
+    """
+    State and operations of one ribbon. Each instance caches the names of its nodes, its isoparms and its joints,
+    so several ribbons can be previewed and edited at the same time.
+    """
+    __slots__ = ("selection", "align", "ribbon", "ribbonList", "length", "smooth", "distances", "jntRadius",
+                 "grpRibbon", "grpLoc", "grpJnt", "grpDeform", "makeNurbNode", "mainKnotNode", "rollKnotNode",
+                 "pinchKnotNode", "blendShapeNode", "mainIsoPos", "rollIsoPos", "forwardVector", "upVector", "orient",
+                 "controlJointsMain", "controlJointsAll", "previs_step", "scaleMode", "spec", "knotLayout", "proxy",
+                 "selectionPositions")
+
+    proxyPreview: bool = True  # preview new ribbons with proxy curves, their nodes being built by build_ribbon only
+    pinMethod: MethodName = MethodName.uvPin  # how follicles are pinned to the ribbon
+    nodeRegistry: NodeRegistry = NodeRegistry()  # nodes created for each ribbon, to avoid walking their history
+    nameAllocator: NameAllocator = NameAllocator()  # numbers used after each name prefix, to name new ribbons
+    liveRibbons: Dict[str, "RibbonOperations"] = {}  # ribbons being previewed, by name
+
+    def __init__(self):
+        self.selection: list = []  # selected joints
+        self.align: bool = False
+        self.scaleMode: ScaleMode = ScaleMode.perIso
+        self.ribbon: str = ""
+        self.init_params()
 
     @classmethod
-    def init_params(cls):
-        cls.ribbon: str = ""
-        cls.ribbonList: list = []
-        cls.length: float = 10
-        cls.smooth: int = 3
-        cls.distances: list = []
-        cls.jntRadius: float = 1
-        cls.grpRibbon: str = ""
-        cls.grpLoc: str = ""
-        cls.grpJnt: str = ""
-        cls.grpDeform: str = ""
-
-        cls.makeNurbNode: str = ""
-        cls.mainKnotNode: str = ""
-        cls.rollKnotNode: str = ""
-        cls.pinchKnotNode: str = ""
-        cls.blendShapeNode: str = ""
-        cls.mainIsoPos: tuple = tuple()
-        cls.rollIsoPos: tuple = tuple()
-        cls.forwardVector: list = []
-        cls.upVector: list = []
-        cls.orient: list = []
-
-        # cls.networkNode: str = ""
-        cls.controlJointsMain: list = []
-        cls.controlJointsAll: list = []
-        cls.previs_step: bool = False
+    def get_live_ribbon(cls, pName: str) -> Optional["RibbonOperations"]:
+        """
+        :return: the instance previewing the ribbon pName, if it still exists.
+        """
+        instance = cls.liveRibbons.get(pName)
+        if instance and not instance.check_ribbon(pCheckAll=True):
+            cls.liveRibbons.pop(pName, None)
+            return None
+        return instance
+
+    def init_params(self):
+        if self.liveRibbons.get(self.ribbon) is self:
+            del self.liveRibbons[self.ribbon]
+        self.ribbon: str = ""
+        self.ribbonList: list = []
+        self.length: float = 10
+        self.smooth: int = 3
+        self.distances: list = []
+        self.jntRadius: float = 1
+        self.grpRibbon: str = ""
+        self.grpLoc: str = ""
+        self.grpJnt: str = ""
+        self.grpDeform: str = ""
+
+        self.makeNurbNode: str = ""
+        self.mainKnotNode: str = ""
+        self.rollKnotNode: str = ""
+        self.pinchKnotNode: str = ""
+        self.blendShapeNode: str = ""
+        self.mainIsoPos: tuple = tuple()
+        self.rollIsoPos: tuple = tuple()
+        self.forwardVector: list = []
+        self.upVector: list = []
+        self.orient: list = []
+
+        self.controlJointsMain: list = []
+        self.controlJointsAll: list = []
+        self.previs_step: bool = False
+        self.spec: Optional[RibbonSpec] = None  # what the ribbon is built with, stored on its metadata node
+        self.knotLayout: Optional[tuple] = None  # (mainIsoPos, rollIsoPos, pinch) the control joints are built for
+        self.proxy: Optional[RibbonProxy.ProxyCurves] = None  # the curves previewing a ribbon not built yet
+        self.selectionPositions: Optional[list] = None  # world positions of the selection given to init_spec, if any
 
     # --------------------------------------------------------
     # ---------------------- GET THINGS ----------------------
     # --------------------------------------------------------
-    @classmethod
-    def get_selection(cls, pType: Optional[str] = None, pExcludeControlJoints: bool = False) -> List[str]:
+    def get_selection(self, pType: Optional[str] = None, pExcludeControlJoints: bool = False) -> List[str]:
         """
         :return: A list containing selected objects
         """
         selection = cmds.ls(selection=True, type=pType) if pType else cmds.ls(selection=True)
         if pExcludeControlJoints:
-            if cls.controlJointsAll:
-                for jnt in cls.controlJointsAll:
+            if self.controlJointsAll:
+                for jnt in self.controlJointsAll:
                     if jnt in selection:
                         selection.remove(jnt)
         return selection
 
     @staticmethod
-    def get_distance_node(pObj1: str, pObj2: str) -> str:
+    def get_world_positions(pNodes: List[str]) -> List[List[float]]:
         """
-        :return: the name of the distance node connected between pObj1 and pObj2
+        :return: the world position of each node of pNodes, read with a single query.
         """
-        connections1 = cmds.listConnections(f"{pObj1}.worldMatrix[0]", destination=True, source=False)
-        connections2 = cmds.listConnections(f"{pObj2}.worldMatrix[0]", destination=True, source=False)
-        if connections1 and connections2:
-            commonNodes = list(set(connections1) & set(connections2))  # get items that are both in the two lists
-            for node in commonNodes:
-                if cmds.objectType(node) == "distanceBetween":
-                    return node
-        return ""
+        flatPositions = cmds.xform(pNodes, query=True, translation=True, worldSpace=True)
+        return [flatPositions[i:i + 3] for i in range(0, len(flatPositions), 3)]
 
     @staticmethod
     def get_length_from_list(pDistances: Optional[List[float]] = None) -> float:
@@ -121,27 +167,30 @@ class RibbonOperations:
             pDistances = [10]
         return sum(pDistances)
 
-    @staticmethod
-    def get_make_nurb_node(pNurbShape: str) -> Union[str, None]:
+    def get_history_node(self, pNurbShape: str, pType: str, pAllConnections: bool = False) -> Union[str, None]:
         """
-        :return: the modifier that defines parameters of the nurb plane.
+        :return: the first node of type pType in the history of pNurbShape, from the registry if pNurbShape is tracked.
         """
-        connections = cmds.listHistory(pNurbShape)
+        if self.nodeRegistry.is_tracked(pNurbShape):
+            return self.nodeRegistry.get(pNurbShape, pType)
+        connections = cmds.listHistory(pNurbShape, allConnections=pAllConnections) or []
         for c in connections:
-            if cmds.objectType(c) == "makeNurbPlane":
+            if cmds.objectType(c) == pType:
+                self.nodeRegistry.register(pNurbShape, pType, c)
                 return c
         return None
 
-    @staticmethod
-    def get_skin_node(pNurbShape: str) -> Union[str, None]:
+    def get_make_nurb_node(self, pNurbShape: str) -> Union[str, None]:
         """
         :return: the modifier that defines parameters of the nurb plane.
         """
-        connections = cmds.listHistory(pNurbShape)
-        for c in connections:
-            if cmds.objectType(c) == "skinCluster":
-                return c
-        return None
+        return self.get_history_node(pNurbShape, "makeNurbPlane")
+
+    def get_skin_node(self, pNurbShape: str) -> Union[str, None]:
+        """
+        :return: the skinCluster deforming the nurb plane.
+        """
+        return self.get_history_node(pNurbShape, "skinCluster")
 
     @staticmethod
     def get_shape(pTransform: Union[List[str], str]) -> str:
@@ -157,15 +206,17 @@ class RibbonOperations:
             return pTransform
         return ""
 
-    @staticmethod
-    def get_knot(pShape: str, pKnotName: KnotType) -> str:
+    def get_knot(self, pShape: str, pKnotName: KnotType) -> str:
         """
         :return: the modifier
         """
+        if self.nodeRegistry.is_tracked(pShape):
+            return self.nodeRegistry.get(pShape, str(pKnotName)) or ""
         history = cmds.listHistory(pShape, allConnections=True)
         for a in history:
             if cmds.objectType(a) == "insertKnotSurface":
-                if pKnotName in a:
+                if str(pKnotName) in a:
+                    self.nodeRegistry.register(pShape, str(pKnotName), a)
                     return a
         return ""
 
@@ -186,36 +237,21 @@ class RibbonOperations:
             orientVect = [90, 90, 90]
         return orientVect
 
-    @classmethod
-    def get_sorted_loc(cls) -> list:
-        myDict = {}
-        if cls.mainKnotNode:
-            outMainKnot = sorted(cmds.listConnections(f"{cls.mainKnotNode}.message", destination=True, source=False))
-            for i in range(len(cmds.getAttr(f"{cls.mainKnotNode}.parameter")[0])):
-                node = outMainKnot[i + 1]
-                param = cmds.getAttr(f"{cls.mainKnotNode}.parameter[{i}]")
-                myDict[node] = param
-        else:
-            outMainKnot = sorted(cmds.listRelatives(f"{cls.ribbon}_grp_loc_main", children=True))
-        myDict[outMainKnot[0]] = 0
-        myDict[outMainKnot[-1]] = 1
-
-        if cls.rollKnotNode:
-            outRollKnot = sorted(cmds.listConnections(f"{cls.rollKnotNode}.message", destination=True, source=False))
-            for i in range(len(cmds.getAttr(f"{cls.rollKnotNode}.parameter")[0])):
-                node = outRollKnot[i]
-                param = cmds.getAttr(f"{cls.rollKnotNode}.parameter[{i}]")
-                myDict[node] = param
-
-        return sorted(myDict, key=myDict.get)
-
-    @staticmethod
-    def get_or_create_node(pName, pType):
-        pass
-
-    @classmethod
-    def check_ribbon(cls, pName: str = None, pCheckAll: bool = False) -> bool:
-        sel = cmds.ls(pName, f"{pName}_setup") if pName else cmds.ls(cls.ribbon, f"{cls.ribbon}_setup")
+    def get_sorted_loc(self) -> list:
+        """
+        :return: the main and roll follicles sorted along the ribbon, from the isoparms cached or read from the
+        metadata node, instead of reading the parameters of the knot nodes.
+        """
+        positions = list(zip(self.generate_iso_pos_full(self.mainIsoPos),
+                             self.get_follicles(f"{self.ribbon}_grp_loc_main")))
+        if self.rollIsoPos:
+            positions += zip(self.rollIsoPos, self.get_follicles(f"{self.ribbon}_grp_loc_roll"))
+        return [loc for _, loc in sorted(positions, key=lambda position: position[0])]
+
+    def check_ribbon(self, pName: str = None, pCheckAll: bool = False) -> bool:
+        if self.proxy and not pName:
+            return RibbonProxy.exists(self.proxy)
+        sel = cmds.ls(pName, f"{pName}_setup") if pName else cmds.ls(self.ribbon, f"{self.ribbon}_setup")
         if pCheckAll:
             return True if len(sel) == 2 else False  # checks for all the setup
         else:
@@ -224,22 +260,10 @@ class RibbonOperations:
     # ------------------------------------------------------------
     # ---------------------- GENERATE DATAS ----------------------
     # ------------------------------------------------------------
-    @staticmethod
-    def generate_new_name(pName: str) -> str:
-        if pName[-1].isdigit():
-            number = int(pName[-1])
-            pName = pName[:-1]
-        else:
-            number = 1
-        name = f"{pName}{str(number)}"
-        if cmds.ls(f"{name}*"):
-            while cmds.ls(f"{name}*"):
-                number += 1
-                name = f"{pName}{str(number)}"
-        return name
+    def generate_new_name(self, pName: str) -> str:
+        return self.nameAllocator.next_name(pName)
 
-    @classmethod
-    def generate_distance_list(cls, pSelection: List[str] = None,
+    def generate_distance_list(self, pSelection: List[str] = None,
                                pLength: float = None,
                                pMainJointCount: int = None) -> List[float]:
         """
@@ -249,17 +273,13 @@ class RibbonOperations:
         :return: something like [4, 3]
         """
         if pSelection:
-            distancesList = []
-            for obj in pSelection[:-1]:
-                startObj = obj
-                endObj = pSelection[pSelection.index(obj) + 1]
-                distNode = cls.get_distance_node(startObj, endObj)
-                if not distNode:
-                    distNode = cls.create_distance_node(startObj, endObj)
-                distance = cmds.getAttr(f"{distNode}.distance")
-                distancesList.append(distance)
-            cmds.select(pSelection)
-            return distancesList
+            if pSelection == self.selection and self.selectionPositions:
+                positions = self.selectionPositions
+            else:
+                positions = self.get_world_positions(pSelection)
+            if RibbonGeo:
+                return RibbonGeo.segment_lengths(positions).tolist()
+            return [math.dist(start, end) for start, end in zip(positions, positions[1:])]
         else:
             return [pLength / pMainJointCount for _ in range(pMainJointCount)]
 
@@ -291,8 +311,7 @@ class RibbonOperations:
             fullIsoPos = (0, 1)
         return fullIsoPos
 
-    @classmethod
-    def generate_iso_pos_roll(cls, pRollCount: int, pIsoPosMain: Tuple[float]) -> Tuple[float, ...]:
+    def generate_iso_pos_roll(self, pRollCount: int, pIsoPosMain: Tuple[float]) -> Tuple[float, ...]:
         """
         :param pRollCount: the number of roll joint desired per between two main bones.
         :param pIsoPosMain: something like [0.25, 0.75] because main joint is at 0.5...
@@ -300,7 +319,7 @@ class RibbonOperations:
         """
         # result_list = [((input_list[i]+value) / (number+1)) for i, value in enumerate(input_list[1:])]
         # basic result : tuple([b / (bonesCount + 1) for b in range(1, bonesCount + 1)])
-        fullIsoPosMain = cls.generate_iso_pos_full(pIsoPosMain)
+        fullIsoPosMain = self.generate_iso_pos_full(pIsoPosMain)
         result_list = []
         for i, value in enumerate(fullIsoPosMain[1:]):
             incr = 0
@@ -310,62 +329,78 @@ class RibbonOperations:
                 result_list.append(sub)
         return tuple(result_list)
 
-    @classmethod
-    def store_vectors(cls, pForwardVector: list, pUpVector: list) -> None:
-        cls.forwardVector = pForwardVector
-        cls.upVector = pUpVector
-        cls.orient = cls.get_orientation_from_normalized_vector(pForwardVector, pUpVector)
+    def store_vectors(self, pForwardVector: list, pUpVector: list) -> None:
+        self.forwardVector = pForwardVector
+        self.upVector = pUpVector
+        self.orient = self.get_orientation_from_normalized_vector(pForwardVector, pUpVector)
 
     # -----------------------------------------------------------
     # ---------------------- CREATE THINGS ----------------------
     # -----------------------------------------------------------
-    @staticmethod
-    def create_distance_node(pObj1: str, pObj2: str) -> str:
-        """
-        :return: a distance node created between pObj1 and pObj2, which calculate the distance between those 2 objects.
-        """
-        distNode = cmds.createNode("distanceBetween")
-        cmds.connectAttr(f"{pObj1}.worldMatrix[0]", f"{distNode}.inMatrix1")
-        cmds.connectAttr(f"{pObj2}.worldMatrix[0]", f"{distNode}.inMatrix2")
-        return distNode
-
-    @staticmethod
-    def create_nurb(pName: str, pLength: float, pSmoothDeformation: int) -> Tuple[str, str]:
+    def create_nurb(self, pName: str, pLength: float, pSmoothDeformation: int) -> Tuple[str, str]:
         ribbon, makeNurbNode = cmds.nurbsPlane(name=pName, pivot=[pLength / 2, 0, 0], axis=[0, 0, 1], width=pLength,
                                                lengthRatio=0.1,
                                                degree=pSmoothDeformation, u=1, v=1, constructionHistory=True)
+        self.nodeRegistry.unregister(ribbon)
+        self.nodeRegistry.register(ribbon, "makeNurbPlane", makeNurbNode)
         return ribbon, makeNurbNode
 
-    @classmethod
-    def create_deformer(cls, pMainIsoPos, pRollIsoPos, pDeformerType: str, pPinch: bool) -> Tuple[str, str]:
-        # TODO: get knotsDeform from pNurbShape and copy them to the new deformNurb below, instead of using pIsoPos ?
-        blendShapeName = f"{cls.ribbon}_deformers"
-        cls.blendShapeNode = cmds.ls(blendShapeName, type="blendShape")
-        if not cls.blendShapeNode:
-            cls.blendShapeNode = cmds.blendShape(cls.ribbon, name=blendShapeName, frontOfChain=True)
-
-        grpName = f"{cls.ribbon}_grp_deform"
-        cls.grpDeform = cmds.ls(grpName)
-        if not cls.grpDeform:
-            cls.grpDeform = cmds.group(name=grpName, empty=True)
-            cmds.parent(cls.grpDeform, cls.grpRibbon)
-            cmds.hide(cls.grpDeform)
-
-        bsCount = cmds.blendShape(cls.blendShapeNode, query=True, weight=1)
-        targetIndex = len(bsCount) if bsCount else 0
-        deformNurb, knotDeform = cls.create_nurb(f"{cls.ribbon}_{pDeformerType.capitalize()}", cls.length, cls.smooth)
-        cls.add_knots(deformNurb, pMainIsoPos, KnotType.main, pPinch)
-        cls.add_knots(deformNurb, pRollIsoPos, KnotType.roll, pPinch)
-        deformNurbShape = cls.get_shape(deformNurb)
-        cmds.blendShape(cls.blendShapeNode, edit=True, target=(cls.ribbon, targetIndex, deformNurbShape, 1),
+    def create_deformer_surface(self, pName: str, pMainIsoPos, pRollIsoPos, pPinch: bool) -> Tuple[str, str]:
+        """
+        Creates a nurb with the knots of the ribbon, as the next target of the blendShape of the ribbon.
+        :return: the nurb and its shape
+        """
+        # after the next index in use, as removed deformers leave gaps
+        targetIndices = cmds.getAttr(f"{self.blendShapeNode}.weight", multiIndices=True) or []
+        targetIndex = max(targetIndices) + 1 if targetIndices else 0
+        deformNurb, knotDeform = self.create_nurb(pName, self.length, self.smooth)
+        self.add_knots(deformNurb, pMainIsoPos, KnotType.main, pPinch)
+        self.add_knots(deformNurb, pRollIsoPos, KnotType.roll, pPinch)
+        deformNurbShape = self.get_shape(deformNurb)
+        cmds.blendShape(self.blendShapeNode, edit=True, target=(self.ribbon, targetIndex, deformNurbShape, 1),
                         weight=(targetIndex, 1))
+        cmds.parent(deformNurb, self.grpDeform)
+        return deformNurb, deformNurbShape
+
+    def create_deformer(self, pMainIsoPos, pRollIsoPos, pDeformerType: str, pPinch: bool,
+                        pShared: bool = False) -> Tuple[str, str]:
+        """
+        :param pShared: stacks the deformer on the nurb shared by the deformers of the ribbon, instead of its own nurb,
+        so the ribbon evaluates one surface and one blendShape target whatever the number of deformers.
+        """
+        # TODO: get knotsDeform from pNurbShape and copy them to the new deformNurb below, instead of using pIsoPos ?
+        blendShapeName = f"{self.ribbon}_deformers"
+        self.blendShapeNode = self.nodeRegistry.get(self.ribbon, "blendShape") or \
+            next(iter(cmds.ls(blendShapeName, type="blendShape")), "")
+        if not self.blendShapeNode:
+            self.blendShapeNode = cmds.blendShape(self.ribbon, name=blendShapeName, frontOfChain=True)[0]
+            self.nodeRegistry.register(self.ribbon, "blendShape", self.blendShapeNode)
+
+        grpName = f"{self.ribbon}_grp_deform"
+        self.grpDeform = self.nodeRegistry.get(self.ribbon, "grpDeform") or cmds.ls(grpName)
+        if not self.grpDeform:
+            self.grpDeform = cmds.group(name=grpName, empty=True)
+            cmds.parent(self.grpDeform, self.grpRibbon)
+            cmds.hide(self.grpDeform)
+            self.nodeRegistry.register(self.ribbon, "grpDeform", self.grpDeform)
+
+        surfaceRole = SHARED_DEFORMER_ROLE if pShared else f"{pDeformerType}Surface"
+        deformNurb = self.nodeRegistry.get(self.ribbon, surfaceRole)
+        if deformNurb:
+            deformNurbShape = self.get_shape(deformNurb)
+        else:
+            surfaceName = "Deformers" if pShared else pDeformerType.capitalize()
+            deformNurb, deformNurbShape = self.create_deformer_surface(f"{self.ribbon}_{surfaceName}", pMainIsoPos,
+                                                                       pRollIsoPos, pPinch)
+            self.nodeRegistry.register(self.ribbon, surfaceRole, deformNurb)
+        # on a shared nurb, each new deformer is added after the previous ones
         deform, handle = cmds.nonLinear(deformNurbShape, type=pDeformerType)
-        newHandleName = f"{cls.ribbon}_{pDeformerType.capitalize()}_handle"
+        newHandleName = f"{self.ribbon}_{pDeformerType.capitalize()}_handle"
         cmds.rename(handle, newHandleName)
         handle = newHandleName
         cmds.rotate(0, 0, 90, handle)
-        cmds.parent(deformNurb, cls.grpDeform)
-        cmds.parent(handle, cls.grpDeform)
+        cmds.parent(handle, self.grpDeform)
+        self.nodeRegistry.register(self.ribbon, f"{pDeformerType}Handle", handle)
 
         # customize a little bit of modifiers
         node = cmds.listConnections(f"{newHandleName}.specifiedManipLocation", destination=False, source=True)[0]
@@ -375,154 +410,424 @@ class RibbonOperations:
             cmds.setAttr(f"{node}.highBound", 10)
         elif "sine" in newHandleName.lower():
             cmds.setAttr(f"{node}.dropoff", 1)
-        # TODO: create a network node that connects main parameters to the node.
         return deform, handle
 
-    @staticmethod
-    def add_knots(pShape: str, pIsoPos: tuple, pKnotName: KnotType, pPinch=False) -> Optional[str]:
+    def delete_deformer(self, pDeformerType: str) -> None:
+        """
+        Removes the deformer pDeformerType of the ribbon: its blendShape target, its nurb and its handle.
+        A shared nurb is only removed with the last deformer stacked on it.
+        """
+        surfaceRole = f"{pDeformerType}Surface"
+        if not self.nodeRegistry.get(self.ribbon, surfaceRole):
+            others = [d for d in DEFORMERS if d != pDeformerType and self.nodeRegistry.get(self.ribbon, f"{d}Handle")]
+            surfaceRole = "" if others else SHARED_DEFORMER_ROLE
+        surface = self.nodeRegistry.get(self.ribbon, surfaceRole) if surfaceRole else None
+        handle = self.nodeRegistry.get(self.ribbon, f"{pDeformerType}Handle")
+        blendShape = self.nodeRegistry.get(self.ribbon, "blendShape")
+        if surface and blendShape:
+            shape = self.get_shape(surface)
+            plugs = cmds.listConnections(f"{shape}.worldSpace", source=False, destination=True, plugs=True,
+                                         type="blendShape") or []
+            for plug in plugs:
+                index = int(plug.split("inputTargetGroup[", 1)[1].split("]", 1)[0])
+                cmds.blendShape(blendShape, edit=True, remove=True, target=(self.ribbon, index, shape, 1))
+        nodes = [node for node in (surface, handle) if node]
+        if nodes:
+            cmds.delete(nodes)
+        for role in (surfaceRole, f"{pDeformerType}Handle"):
+            if role:
+                self.nodeRegistry.unregister(self.ribbon, role)
+
+    def add_knots(self, pShape: str, pIsoPos: tuple, pKnotName: KnotType, pPinch=False) -> Optional[str]:
         """
         Creates a modifier "insertKnotSurface" on the nurb pShape, and add pIsoPos as divisions of the modifier.
-        It renames the modifier to be deleted if the function is executed more than once.
+        If the modifier already exists, its parameters are rewritten in place, so the follicles stay connected to it.
+        Without isoparms, the modifier is deleted.
         :return: the name of the modifier
         """
-        # Delete previous modifier :
-        history = cmds.listHistory(pShape, allConnections=True)
-        for a in history:
-            if cmds.objectType(a) == "insertKnotSurface":
-                if (str(KnotType.roll) in a) or (str(pKnotName) in a):
-                    cmds.delete(a)  # because there is no way to remove parameters on the know modifier.
+        nbKnots = 3 if pKnotName == KnotType.main and pPinch else 1
+        knot = self.get_knot(pShape, pKnotName)
+        if knot and len(pIsoPos) > 0:
+            self.set_knots(knot, pIsoPos, nbKnots)
+            return knot
+        if knot:
+            cmds.delete(knot)  # because there is no way to remove every parameter of the knot modifier.
+            self.nodeRegistry.unregister(pShape, str(pKnotName))
         if len(pIsoPos) > 0:
-            nbKnots = 3 if pKnotName == KnotType.main and pPinch else 1
             knotDeform = cmds.insertKnotSurface(pShape, constructionHistory=True, parameter=pIsoPos,
                                                 numberOfKnots=nbKnots, direction=1, replaceOriginal=True)[-1]
             newName = cmds.rename(knotDeform, pKnotName)
+            self.nodeRegistry.register(pShape, str(pKnotName), newName)
             return newName
         return None
 
-    @classmethod
-    def update_follicles(cls, pIsoPos: Tuple[float], pKnotNode: str, pType: KnotType,
-                         pMethod: MethodName = MethodName.uvPin) -> None:
+    @staticmethod
+    def set_knots(pKnotNode: str, pIsoPos: tuple, pNumberOfKnots: int) -> None:
+        """
+        Rewrites the parameters of the modifier pKnotNode with pIsoPos, and removes the parameters after them.
+        Nothing is written if they didn't change.
+        """
+        parameters = (cmds.getAttr(f"{pKnotNode}.parameter") or [()])[0]
+        counts = (cmds.getAttr(f"{pKnotNode}.numberOfKnots") or [()])[0]
+        if tuple(parameters) == tuple(pIsoPos) and tuple(counts) == (pNumberOfKnots,) * len(pIsoPos):
+            return
+        last = len(pIsoPos) - 1
+        cmds.setAttr(f"{pKnotNode}.parameter[0:{last}]", *pIsoPos)
+        cmds.setAttr(f"{pKnotNode}.numberOfKnots[0:{last}]", *([pNumberOfKnots] * len(pIsoPos)))
+        for attr, values in (("parameter", parameters), ("numberOfKnots", counts)):
+            for i in range(len(pIsoPos), len(values)):
+                cmds.removeMultiInstance(f"{pKnotNode}.{attr}[{i}]", b=True)
+
+    def update_follicles(self, pIsoPos: Tuple[float], pKnotNode: str, pType: KnotType,
+                         pMethod: Optional[MethodName] = None,
+                         pGraph: Optional[RibbonGraph.NodeGraph] = None) -> None:
+        """
+        Makes the follicles of pType match pIsoPos.
+        Existing follicle networks are kept and only reconnected to pKnotNode, so only the difference of count
+        between the previous and the new isoparms is created or deleted.
+        :param pMethod: how new follicles are pinned, pinMethod by default.
+        :param pGraph: if given, new follicles are described in it and the caller commits it,
+        otherwise they are committed before returning.
+        """
+        graph = pGraph if pGraph is not None else RibbonGraph.NodeGraph()
+        pMethod = pMethod or self.pinMethod
+        if pMethod == MethodName.sampler and not RibbonGraph.load_plugin():
+            pMethod = MethodName.sharedUvPin  # the plugin needs the OpenMaya API
         if pType == KnotType.main:
-            pIsoPos = cls.generate_iso_pos_full(pIsoPos)
+            pIsoPos = self.generate_iso_pos_full(pIsoPos)
         typeName = str(pType).lower().split("knot")[0]
-        grpName = f"{cls.ribbon}_grp_loc_{typeName}"
-        if cmds.ls(grpName):
-            cmds.delete(grpName)
-
-        grpLoc = cmds.group(name=grpName, empty=True)
-        cmds.parent(grpLoc, cls.grpLoc)
+        grpName = f"{self.ribbon}_grp_loc_{typeName}"
+        sharedPins = cmds.ls(*(self.get_shared_pin_name(typeName, m) for m in SHARED_PIN_METHODS))
+        if sharedPins and not len(pIsoPos):
+            cmds.delete(sharedPins)
+
+        if not cmds.ls(grpName):
+            grpLoc = cmds.group(name=grpName, empty=True)
+            cmds.parent(grpLoc, self.grpLoc)
+            follicles = []
+        else:
+            follicles = self.get_follicles(grpName)
+
+        for locTrs in follicles[len(pIsoPos):]:
+            self.delete_follicle(locTrs)
+        pin, scalePlug = None, None
+        if len(pIsoPos) > len(follicles):
+            if self.scaleMode != ScaleMode.none:
+                scalePlug = self.describe_scale(graph)
+            if pMethod in SHARED_PIN_METHODS:
+                pin = self.get_shared_pin_name(typeName, pMethod)
+                if pin not in sharedPins:
+                    pin = self.describe_shared_pin(graph, typeName, pMethod, scalePlug)
         for i, v in enumerate(pIsoPos):
-            loc = cmds.spaceLocator(name=f"loc_foll_{cls.ribbon}_{typeName}_{i:02d}", absolute=True)
-            locTrs = loc[0]
-            locShape = cmds.listRelatives(locTrs, shapes=True)[0]
-            cmds.parent(loc, grpLoc)
-            jointLoc = cmds.joint(name=f"jnt_skin_{cls.ribbon}_{typeName}_{i:02d}", orientation=cls.orient,
-                                  radius=cls.jntRadius)  # it automatically parents itself to the loc previously created
-            ctrlExtra = cmds.circle(name=f"ctrl_extra_{cls.ribbon}_{typeName}_{i:02d}", center=[0, 0, 0],
-                                    normal=cls.forwardVector, constructionHistory=False)[0]
-            # rotate the ctrl
-            ctrlMatrix = cmds.matrixUtil(r=map(math.radians, cls.orient))
-            cmds.setAttr(f"{ctrlExtra}.offsetParentMatrix", ctrlMatrix, type="matrix")
-
-            cmds.parent(jointLoc, ctrlExtra)
-            cmds.parent(ctrlExtra, locTrs)
-
-            dm = cmds.createNode("decomposeMatrix")
-            cmds.setAttr(f"{dm}.isHistoricallyInteresting", 0)
-            cfsi = cmds.createNode("curveFromSurfaceIso")
-            cmds.setAttr(f"{cfsi}.isHistoricallyInteresting", 0)
-            ci = cmds.createNode("curveInfo")
-            cmds.setAttr(f"{ci}.isHistoricallyInteresting", 0)
-
-            if pMethod == MethodName.uvPin:
-                uvPin = cmds.createNode("uvPin")
-                cmds.setAttr(f"{uvPin}.isHistoricallyInteresting", 0)
-                if 0 < v < 1:
-                    index = i - 1 if pType == KnotType.main else i
-                    cmds.connectAttr(f"{pKnotNode}.parameter[{index}]", f"{uvPin}.coordinate[0].coordinateU")
-                    cmds.connectAttr(f"{pKnotNode}.parameter[{index}]", f"{cfsi}.isoparmValue")
-                else:
-                    cmds.setAttr(f"{uvPin}.coordinate[0].coordinateU", v)
-                    cmds.setAttr(f"{cfsi}.isoparmValue", v)
-
-                cmds.connectAttr(f"{cls.ribbon}.worldSpace[0]", f"{uvPin}.deformedGeometry")
-                cmds.connectAttr(f"{uvPin}.outputMatrix[0]", f"{dm}.inputMatrix")
-                cmds.setAttr(f"{uvPin}.normalAxis", 2)  # Z axis
-                cmds.setAttr(f"{uvPin}.tangentAxis", 0)  # X axis
-                cmds.setAttr(f"{uvPin}.coordinate[0].coordinateV", 0.5)
-
-            elif pMethod == MethodName.posi:
-                posi = cmds.createNode("pointOnSurfaceInfo")
-                cmds.setAttr(f"{posi}.isHistoricallyInteresting", 0)
-                fbfm = cmds.createNode("fourByFourMatrix")
-                cmds.setAttr(f"{fbfm}.isHistoricallyInteresting", 0)
-                if 0 < v < 1:
-                    index = i - 1 if pType == KnotType.main else i
-                    cmds.connectAttr(f"{pKnotNode}.parameter[{index}]", f"{posi}.parameterU")
-                    cmds.connectAttr(f"{pKnotNode}.parameter[{index}]", f"{cfsi}.isoparmValue")
-                else:
-                    cmds.setAttr(f"{posi}.parameterU", v)
-                    cmds.setAttr(f"{cfsi}.isoparmValue", v)
-                cmds.connectAttr(f"{cls.ribbon}.worldSpace[0]", f"{posi}.inputSurface")
-                cmds.connectAttr(f"{posi}.positionX", f"{fbfm}.in30")
-                cmds.connectAttr(f"{posi}.positionY", f"{fbfm}.in31")
-                cmds.connectAttr(f"{posi}.positionZ", f"{fbfm}.in32")
-                cmds.connectAttr(f"{posi}.normalizedNormalX", f"{fbfm}.in20")
-                cmds.connectAttr(f"{posi}.normalizedNormalY", f"{fbfm}.in21")
-                cmds.connectAttr(f"{posi}.normalizedNormalZ", f"{fbfm}.in22")
-                cmds.connectAttr(f"{posi}.normalizedTangentUX", f"{fbfm}.in00")
-                cmds.connectAttr(f"{posi}.normalizedTangentUY", f"{fbfm}.in01")
-                cmds.connectAttr(f"{posi}.normalizedTangentUZ", f"{fbfm}.in02")
-                cmds.connectAttr(f"{posi}.normalizedTangentVX", f"{fbfm}.in10")
-                cmds.connectAttr(f"{posi}.normalizedTangentVY", f"{fbfm}.in11")
-                cmds.connectAttr(f"{posi}.normalizedTangentVZ", f"{fbfm}.in12")
-                cmds.setAttr(f"{posi}.parameterV", 0.5)
-                cmds.connectAttr(f"{fbfm}.output", f"{dm}.inputMatrix")
-
-            cmds.connectAttr(f"{dm}.outputRotate", f"{locTrs}.rotate")
-            cmds.connectAttr(f"{dm}.outputTranslate", f"{locTrs}.translate")
-
-            cmds.connectAttr(f"{cls.ribbon}.worldSpace[0]", f"{cfsi}.inputSurface")
-            cmds.connectAttr(f"{cfsi}.outputCurve", f"{ci}.inputCurve")
-
-            md1 = cmds.createNode("multiplyDivide")
-            cmds.setAttr(f"{md1}.isHistoricallyInteresting", 0)
-            cmds.connectAttr(f"{ci}.arcLength", f"{md1}.input1X")
-            cmds.connectAttr(f"{cls.makeNurbNode}.width", f"{md1}.input2X")
-            cmds.setAttr(f"{md1}.operation", 2)
-            md2 = cmds.createNode("multiplyDivide")
-            cmds.setAttr(f"{md2}.isHistoricallyInteresting", 0)
-            cmds.connectAttr(f"{md1}.outputX", f"{md2}.input1X")
-            cmds.setAttr(f"{md2}.input2X", 10)
-            cmds.connectAttr(f"{md2}.outputX", f"{locTrs}.scaleX")
-            cmds.connectAttr(f"{md2}.outputX", f"{locTrs}.scaleY")
-            cmds.connectAttr(f"{md2}.outputX", f"{locTrs}.scaleZ")
-
-            cmds.setAttr(f"{cfsi}.isoparmDirection", 1)
-            cmds.setAttr(f"{locShape}.visibility", False)
-
-            # setup message connection from knot to locators
-            if pKnotNode:
-                cmds.connectAttr(f"{pKnotNode}.message", f"{locTrs}.creator")
-
-            cmds.setAttr(f"{jointLoc}.overrideEnabled", True)
-            cmds.setAttr(f"{jointLoc}.overrideColor", 18)  # CYAN
+            if i < len(follicles):
+                self.connect_follicle(follicles[i], i, v, pKnotNode, pType)
+            else:
+                self.describe_follicle(graph, grpName, i, v, pKnotNode, pType, pMethod, pin, scalePlug)
+        if pGraph is None:
+            self.commit_graph(graph)
 
-    @classmethod
-    def update_control_joint(cls, pCreateControlJoints: bool, pIsChain: bool, pSkinChain: bool):
-        if not cls.previs_step:
+    def get_shared_pin_name(self, pTypeName: str, pMethod: MethodName = MethodName.sharedUvPin) -> str:
+        return f"{self.ribbon}_{'sampler' if pMethod == MethodName.sampler else 'uvPin'}_{pTypeName}"
+
+    def get_shared_nodes(self, pRibbon: Optional[str] = None) -> List[str]:
+        """
+        :return: the existing nodes shared by the follicles of pRibbon (the current ribbon by default).
+        """
+        ribbon = pRibbon or self.ribbon
+        return cmds.ls(f"{ribbon}_uvPin_*", f"{ribbon}_sampler_*", f"{ribbon}_scale_*")
+
+    def is_shared_node(self, pNode: str) -> bool:
+        """
+        :return: True if pNode is used by several follicles, like a shared uvPin or the scale factor.
+        """
+        return pNode.startswith((f"{self.ribbon}_uvPin_", f"{self.ribbon}_sampler_", f"{self.ribbon}_scale_"))
+
+    def is_sampler(self, pNode: str) -> bool:
+        return pNode.startswith(f"{self.ribbon}_sampler_")
+
+    def describe_scale(self, pGraph: RibbonGraph.NodeGraph) -> str:
+        """
+        Adds to pGraph the nodes computing the scale shared by the follicles, if they don't exist yet.
+        :return: in perIso mode, the plug to multiply the arc length of an isoparm by to get the scale of a follicle.
+        In global mode, the plug of the scale of every follicle.
+        """
+        factor = f"{self.ribbon}_scale_factor"
+        factor = pGraph.find_node(factor) or factor  # main and roll follicles can be described in the same graph
+        if not pGraph.is_key(factor) and not cmds.ls(factor):
+            factor = pGraph.add_node("multiplyDivide", factor)
+            pGraph.set_attr(factor, "operation", 2)
+            pGraph.set_attr(factor, "input1X", 10)  # the ribbon is 10 times longer than wide
+            pGraph.connect(f"{self.makeNurbNode}.width", f"{factor}.input2X")
+            pGraph.set_attr(factor, "isHistoricallyInteresting", 0)
+        if self.scaleMode == ScaleMode.perIso:
+            return f"{factor}.outputX"
+
+        scale = f"{self.ribbon}_scale_global"
+        scale = pGraph.find_node(scale) or scale
+        if not pGraph.is_key(scale) and not cmds.ls(scale):
+            cfsi = pGraph.add_node("curveFromSurfaceIso", f"{self.ribbon}_scale_iso")
+            ci = pGraph.add_node("curveInfo", f"{self.ribbon}_scale_info")
+            scale = pGraph.add_node("multiplyDivide", scale)
+            pGraph.connect(f"{self.ribbon}.worldSpace[0]", f"{cfsi}.inputSurface")
+            pGraph.set_attr(cfsi, "isoparmDirection", 1)
+            pGraph.set_attr(cfsi, "isoparmValue", 0.5)
+            pGraph.connect(f"{cfsi}.outputCurve", f"{ci}.inputCurve")
+            pGraph.connect(f"{ci}.arcLength", f"{scale}.input1X")
+            pGraph.connect(f"{factor}.outputX", f"{scale}.input2X")
+            for node in (cfsi, ci, scale):
+                pGraph.set_attr(node, "isHistoricallyInteresting", 0)
+        return f"{scale}.outputX"
+
+    def describe_shared_pin(self, pGraph: RibbonGraph.NodeGraph, pTypeName: str,
+                            pMethod: MethodName = MethodName.sharedUvPin, pScalePlug: Optional[str] = None) -> str:
+        """
+        Adds to pGraph the uvPin or ribbonSampler shared by the follicles of a group: the surface is read once for
+        all of them.
+        :param pScalePlug: the plug returned by describe_scale, the scale factor of a ribbonSampler in perIso mode.
+        :return: the key of the node
+        """
+        name = self.get_shared_pin_name(pTypeName, pMethod)
+        if pMethod == MethodName.sampler:
+            sampler = pGraph.add_node(RibbonGraph.SAMPLER_TYPE, name)
+            pGraph.connect(f"{self.ribbon}.worldSpace[0]", f"{sampler}.inputSurface")
+            if pScalePlug and self.scaleMode == ScaleMode.perIso:
+                pGraph.connect(pScalePlug, f"{sampler}.scaleFactor")
+            pGraph.set_attr(sampler, "isHistoricallyInteresting", 0)
+            return sampler
+        uvPin = pGraph.add_node("uvPin", name)
+        pGraph.connect(f"{self.ribbon}.worldSpace[0]", f"{uvPin}.deformedGeometry")
+        pGraph.set_attr(uvPin, "normalAxis", 2)  # Z axis
+        pGraph.set_attr(uvPin, "tangentAxis", 0)  # X axis
+        pGraph.set_attr(uvPin, "isHistoricallyInteresting", 0)
+        return uvPin
+
+    def commit_graph(self, pGraph: RibbonGraph.NodeGraph) -> dict:
+        """
+        Creates the nodes described in pGraph, in a single modifier if the plugin is available.
+        :return: the names of the created nodes by key.
+        """
+        return RibbonGraph.commit(pGraph)
+
+    def delete_follicles(self) -> None:
+        """
+        Deletes every follicle of the ribbon with the nodes driving them, so the next update rebuilds them all.
+        """
+        groups = cmds.ls(f"{self.ribbon}_grp_loc_main", f"{self.ribbon}_grp_loc_roll")
+        drivers = []
+        for grpLoc in groups:
+            for loc in self.get_follicles(grpLoc):
+                drivers += [node for key, node in self.get_follicle_drivers(loc).items()
+                            if key != "pinIndex" and not self.is_shared_node(node)]
+        nodes = groups + drivers + self.get_shared_nodes()
+        if nodes:
+            cmds.delete(nodes)
+
+    def get_follicles(self, pGrpLoc: str) -> List[str]:
+        """
+        :return: the locators of the follicle group pGrpLoc, sorted by their index, without relying on their names:
+        the coordinate of the shared pin driving them if any, otherwise the order they were parented to the group in.
+        """
+        locators = cmds.listRelatives(pGrpLoc, children=True, type="transform") or []
+        typeName = pGrpLoc.rsplit("_", 1)[-1]
+        pins = cmds.ls(*(self.get_shared_pin_name(typeName, m) for m in SHARED_PIN_METHODS))
+        if not locators or not pins:
+            return locators
+        outputs = cmds.listConnections(f"{pins[0]}.outputMatrix", source=False, destination=True,
+                                       connections=True) or []
+        indexByDm = {outputs[i + 1]: int(outputs[i].rsplit("[", 1)[-1][:-1]) for i in range(0, len(outputs), 2)}
+        locs = (cmds.listConnections(list(indexByDm), source=False, destination=True, connections=True,
+                                     type="transform") or []) if indexByDm else []
+        indexByLoc = {locs[i + 1]: indexByDm[locs[i].split(".")[0]] for i in range(0, len(locs), 2)}
+        order = {loc: i for i, loc in enumerate(locators)}
+        # locators not on the shared pin, like the bounds of older ribbons, keep their order after the others
+        return sorted(locators, key=lambda loc: (loc not in indexByLoc, indexByLoc.get(loc, order[loc])))
+
+    def get_follicle_drivers(self, pLoc: str) -> dict:
+        """
+        :return: the nodes driving the locator pLoc, like {"pin": uvPin1, "iso": curveFromSurfaceIso1, ...}
+        """
+        drivers = {}
+
+        def source(pPlug: str) -> Optional[str]:
+            connections = cmds.listConnections(pPlug, source=True, destination=False)
+            return connections[0] if connections else None
+
+        drivers["dm"] = source(f"{pLoc}.translate")
+        if drivers["dm"]:
+            pinPlug = cmds.listConnections(f"{drivers['dm']}.inputMatrix", source=True, destination=False, plugs=True)
+            drivers["pin"] = pinPlug[0].split(".")[0] if pinPlug else None
+            if pinPlug and "[" in pinPlug[0]:
+                drivers["pinIndex"] = int(pinPlug[0].rsplit("[", 1)[-1][:-1])  # coordinate of a uvPin
+            if drivers["pin"] and cmds.objectType(drivers["pin"]) == "fourByFourMatrix":
+                drivers["fbfm"] = drivers["pin"]
+                drivers["pin"] = source(f"{drivers['fbfm']}.in30")
+        scale = source(f"{pLoc}.scaleX")
+        if scale and not self.is_shared_node(scale):
+            drivers["md2"] = scale
+            lengthPlug = cmds.listConnections(f"{scale}.input1X", source=True, destination=False, plugs=True)
+            if lengthPlug and lengthPlug[0].endswith(".arcLength"):
+                drivers["ci"] = lengthPlug[0].split(".")[0]
+            elif lengthPlug:  # two multiplyDivide nodes, from older versions
+                drivers["md1"] = lengthPlug[0].split(".")[0]
+                drivers["ci"] = source(f"{drivers['md1']}.input1X")
+        if drivers.get("ci"):
+            drivers["iso"] = source(f"{drivers['ci']}.inputCurve")
+        return {k: v for k, v in drivers.items() if v is not None}
+
+    def delete_follicle(self, pLoc: str) -> None:
+        """
+        Deletes the locator pLoc and every node driving it, except a shared uvPin where only its coordinate is removed.
+        """
+        drivers = self.get_follicle_drivers(pLoc)
+        pinIndex = drivers.pop("pinIndex", 0)
+        if drivers.get("pin") and self.is_shared_node(drivers["pin"]):
+            pin = drivers.pop("pin")
+            element = f"parameterU[{pinIndex}]" if self.is_sampler(pin) else f"coordinate[{pinIndex}]"
+            cmds.removeMultiInstance(f"{pin}.{element}", b=True)
+        cmds.delete(pLoc, *drivers.values())
+
+    def connect_follicle(self, pLoc: str, pIndex: int, pIsoValue: float, pKnotNode: str, pType: KnotType) -> None:
+        """
+        Drives the existing follicle pLoc with the parameter pIndex of pKnotNode, or with pIsoValue if it is a bound.
+        """
+        drivers = self.get_follicle_drivers(pLoc)
+        pinIndex = drivers.get("pinIndex", 0)
+        plugs = []
+        if drivers.get("pin"):
+            if drivers.get("fbfm"):
+                pinAttr = "parameterU"
+            elif self.is_sampler(drivers["pin"]):
+                pinAttr = f"parameterU[{pinIndex}]"
+            else:
+                pinAttr = f"coordinate[{pinIndex}].coordinateU"
+            plugs.append(f"{drivers['pin']}.{pinAttr}")
+        if drivers.get("iso"):
+            plugs.append(f"{drivers['iso']}.isoparmValue")
+        if 0 < pIsoValue < 1:
+            index = pIndex - 1 if pType == KnotType.main else pIndex
+            for plug in plugs:
+                if not cmds.isConnected(f"{pKnotNode}.parameter[{index}]", plug):
+                    cmds.connectAttr(f"{pKnotNode}.parameter[{index}]", plug, force=True)
+        else:
+            for plug in plugs:
+                connections = cmds.listConnections(plug, source=True, destination=False, plugs=True)
+                if connections:
+                    cmds.disconnectAttr(connections[0], plug)
+                cmds.setAttr(plug, pIsoValue)
+
+        # setup message connection from knot to locators
+        if pKnotNode and not cmds.isConnected(f"{pKnotNode}.message", f"{pLoc}.creator"):
+            cmds.connectAttr(f"{pKnotNode}.message", f"{pLoc}.creator", force=True)
+
+    def describe_follicle(self, pGraph: RibbonGraph.NodeGraph, pGrpLoc: str, pIndex: int, pIsoValue: float,
+                          pKnotNode: str, pType: KnotType, pMethod: MethodName = MethodName.uvPin,
+                          pSharedPin: Optional[str] = None, pScalePlug: Optional[str] = None) -> str:
+        """
+        Adds to pGraph a locator pinned to the ribbon at pIsoValue, with its skin joint and extra controller.
+        :param pSharedPin: the uvPin or ribbonSampler (key or name) shared by the follicles of the group,
+        for MethodName.sharedUvPin and MethodName.sampler.
+        :param pScalePlug: the plug returned by describe_scale, None to not scale the locator.
+        :return: the key of the locator in pGraph
+        """
+        i, v = pIndex, pIsoValue
+        typeName = str(pType).lower().split("knot")[0]
+        locTrs, locShape = pGraph.add_locator(f"loc_foll_{self.ribbon}_{typeName}_{i:02d}", pGrpLoc)
+        ctrlExtra = pGraph.add_circle(f"ctrl_extra_{self.ribbon}_{typeName}_{i:02d}", self.forwardVector, locTrs)
+        # rotate the ctrl, the joint below inherits its orientation
+        pGraph.set_attr(ctrlExtra, "offsetParentMatrix", RibbonGraph.euler_to_matrix(self.orient))
+        jointLoc = pGraph.add_node("joint", f"jnt_skin_{self.ribbon}_{typeName}_{i:02d}", ctrlExtra)
+        pGraph.set_attr(jointLoc, "radius", self.jntRadius)
+
+        dm = pGraph.add_node("decomposeMatrix")
+
+        pins = ()
+        if pMethod in (MethodName.uvPin, MethodName.sharedUvPin):
+            if pMethod == MethodName.sharedUvPin:
+                uvPin, coordinate = pSharedPin, i
+            else:
+                uvPin, coordinate = pGraph.add_node("uvPin"), 0
+                pins = (uvPin,)
+                pGraph.connect(f"{self.ribbon}.worldSpace[0]", f"{uvPin}.deformedGeometry")
+                pGraph.set_attr(uvPin, "normalAxis", 2)  # Z axis
+                pGraph.set_attr(uvPin, "tangentAxis", 0)  # X axis
+            isoPlugs = [f"{uvPin}.coordinate[{coordinate}].coordinateU"]
+            pGraph.connect(f"{uvPin}.outputMatrix[{coordinate}]", f"{dm}.inputMatrix")
+            pGraph.set_attr(uvPin, f"coordinate[{coordinate}].coordinateV", 0.5)
+
+        elif pMethod == MethodName.sampler:
+            isoPlugs = [f"{pSharedPin}.parameterU[{i}]"]
+            pGraph.connect(f"{pSharedPin}.outputMatrix[{i}]", f"{dm}.inputMatrix")
+
+        else:
+            posi = pGraph.add_node("pointOnSurfaceInfo")
+            fbfm = pGraph.add_node("fourByFourMatrix")
+            pins = (posi, fbfm)
+            isoPlugs = [f"{posi}.parameterU"]
+            pGraph.connect(f"{self.ribbon}.worldSpace[0]", f"{posi}.inputSurface")
+            for output, row in (("position", 3), ("normalizedNormal", 2), ("normalizedTangentU", 0),
+                                ("normalizedTangentV", 1)):
+                for column, axis in enumerate("XYZ"):
+                    pGraph.connect(f"{posi}.{output}{axis}", f"{fbfm}.in{row}{column}")
+            pGraph.set_attr(posi, "parameterV", 0.5)
+            pGraph.connect(f"{fbfm}.output", f"{dm}.inputMatrix")
+
+        scaleNodes = ()
+        if pScalePlug and self.scaleMode == ScaleMode.perIso and pMethod == MethodName.sampler:
+            pScalePlug = f"{pSharedPin}.outputScale[{i}]"
+        elif pScalePlug and self.scaleMode == ScaleMode.perIso:
+            cfsi = pGraph.add_node("curveFromSurfaceIso")
+            ci = pGraph.add_node("curveInfo")
+            md = pGraph.add_node("multiplyDivide")
+            scaleNodes = (cfsi, ci, md)
+            isoPlugs.append(f"{cfsi}.isoparmValue")
+            pGraph.connect(f"{self.ribbon}.worldSpace[0]", f"{cfsi}.inputSurface")
+            pGraph.set_attr(cfsi, "isoparmDirection", 1)
+            pGraph.connect(f"{cfsi}.outputCurve", f"{ci}.inputCurve")
+            pGraph.connect(f"{ci}.arcLength", f"{md}.input1X")
+            pGraph.connect(pScalePlug, f"{md}.input2X")
+            pScalePlug = f"{md}.outputX"
+        if pScalePlug:
+            for axis in "XYZ":
+                pGraph.connect(pScalePlug, f"{locTrs}.scale{axis}")
+
+        if 0 < v < 1:
+            index = i - 1 if pType == KnotType.main else i
+            for plug in isoPlugs:
+                pGraph.connect(f"{pKnotNode}.parameter[{index}]", plug)
+        else:
+            for plug in isoPlugs:
+                node, attr = plug.split(".", 1)
+                pGraph.set_attr(node, attr, v)
+
+        pGraph.connect(f"{dm}.outputRotate", f"{locTrs}.rotate")
+        pGraph.connect(f"{dm}.outputTranslate", f"{locTrs}.translate")
+
+        pGraph.set_attr(locShape, "visibility", False)
+        for node in (dm,) + scaleNodes + pins:
+            pGraph.set_attr(node, "isHistoricallyInteresting", 0)
+
+        # setup message connection from knot to locators
+        if pKnotNode:
+            pGraph.connect(f"{pKnotNode}.message", f"{locTrs}.creator")
+
+        pGraph.set_attr(jointLoc, "overrideEnabled", True)
+        pGraph.set_attr(jointLoc, "overrideColor", 18)  # CYAN
+        return locTrs
+
+    def update_control_joint(self, pCreateControlJoints: bool, pIsChain: bool, pSkinChain: bool):
+        if not self.previs_step:
             return None
-        grpName = f"{cls.ribbon}_grp_control"
+        self.spec.controlJoints, self.spec.chain, self.spec.skin = pCreateControlJoints, pIsChain, pSkinChain
+        grpName = f"{self.ribbon}_grp_control"
         if cmds.ls(grpName):
             cmds.delete(grpName)
+        self.controlJointsMain = []
+        self.controlJointsAll = []
         if pCreateControlJoints:
             jntGrp = cmds.group(name=grpName, empty=True)
-            cmds.parent(jntGrp, cls.grpJnt)
-
-            cls.controlJointsMain.clear()
-            cls.controlJointsAll.clear()
+            cmds.parent(jntGrp, self.grpJnt)
 
-            locators = cls.get_sorted_loc()
+            locators = self.get_sorted_loc()
             indexMain = 0
             indexRoll = 0
             prevMain = jntGrp
@@ -532,11 +837,11 @@ class RibbonOperations:
                     indexRoll = 0
                 translate = cmds.xform(loc, query=True, translation=True, worldSpace=True)
                 if i == 0:
-                    rotate = cls.orient
+                    rotate = self.orient
                 else:
                     rotate = cmds.xform(loc, query=True, rotation=True, worldSpace=True)
-                jnt = cmds.joint(name=f"jnt_ctrl_{cls.ribbon}_{indexMain:02d}_{indexRoll:02d}", orientation=rotate,
-                                 position=translate, radius=cls.jntRadius + 0.5)
+                jnt = cmds.joint(name=f"jnt_ctrl_{self.ribbon}_{indexMain:02d}_{indexRoll:02d}", orientation=rotate,
+                                 position=translate, radius=self.jntRadius + 0.5)
                 cmds.setAttr(f"{jnt}.overrideEnabled", True)
                 cmds.setAttr(f"{jnt}.overrideColor", 17)  # YELLOW
                 if prevMain not in cmds.listRelatives(jnt, parent=True):
@@ -544,160 +849,292 @@ class RibbonOperations:
                 if "main" in loc:
                     if pIsChain:
                         prevMain = jnt
-                    cls.controlJointsMain.append(jnt)
-                cls.controlJointsAll.append(jnt)
+                    self.controlJointsMain.append(jnt)
+                self.controlJointsAll.append(jnt)
                 indexRoll += 1
                 if not pIsChain:
                     if cmds.listRelatives(jnt, parent=True) != [jntGrp]:
                         cmds.parent(jnt, jntGrp)
             if pSkinChain:
-                cls.update_skin()
+                self.update_skin()
             else:
-                cls.unbind_skin(cls.ribbon)
-            return cls.controlJointsMain
-        return None
+                self.unbind_skin(self.ribbon)
+        self.knotLayout = (self.mainIsoPos, self.rollIsoPos, self.spec.pinch)
+        self.store_metadata()
+        return self.controlJointsMain or None
 
-    @classmethod
-    def update_skin(cls) -> Union[str, None]:
-        if cls.ribbon:
-            if cls.controlJointsMain:
+    def snap_control_joints(self, pSkin: Optional[str]) -> None:
+        """
+        Moves the control joints to their follicles, and binds pSkin again where they are.
+        The envelope of pSkin must be 0, so the follicles are on the undeformed ribbon.
+        """
+        if self.controlJointsAll:
+            locators = self.get_sorted_loc()
+            for i, (loc, jnt) in enumerate(zip(locators, self.controlJointsAll)):
+                matrix = cmds.xform(loc, query=True, translation=True, worldSpace=True)
+                cmds.xform(jnt, translation=matrix, worldSpace=True)
+                if pSkin:
+                    invMatrix = cmds.getAttr(f"{jnt}.worldInverseMatrix")
+                    cmds.setAttr(f"{pSkin}.bindPreMatrix[{i}]", invMatrix, type="matrix")
+
+    def update_topology_consumers(self, pCreateControlJoints: bool, pIsChain: bool, pSkinChain: bool) -> None:
+        """
+        Rebuilds the control joints and the skin only if the number of CVs of the ribbon changed since they were built,
+        otherwise moves the joints to the follicles and weights the CVs again if the isoparms moved.
+        """
+        layout = (self.mainIsoPos, self.rollIsoPos, self.spec.pinch)
+        options = (pCreateControlJoints, pIsChain, pSkinChain)
+        if self.knotLayout is None or options != (self.spec.controlJoints, self.spec.chain, self.spec.skin) or \
+                (len(layout[0]), len(layout[1]), layout[2]) != \
+                (len(self.knotLayout[0]), len(self.knotLayout[1]), self.knotLayout[2]):
+            self.controlJointsMain = self.update_control_joint(*options)
+            return
+        if layout == self.knotLayout:
+            return
+        skin = self.get_skin_node(self.ribbon) if pSkinChain else None
+        if skin:
+            cmds.setAttr(f"{skin}.envelope", 0)
+        self.snap_control_joints(skin)
+        if skin:
+            self.update_skin_weights(skin)
+            cmds.setAttr(f"{skin}.envelope", 1)
+        self.knotLayout = layout
+        self.store_metadata(pJoints=False)
+
+    def update_skin(self) -> Union[str, None]:
+        if self.ribbon:
+            if self.controlJointsMain:
                 # method1 : unbind and re-bind all
-                # cls.unbind_skin(cls.ribbon)
-                # skin = cmds.skinCluster(cls.controlJointsAll, cls.ribbon, maximumInfluences=3)[0]
+                # self.unbind_skin(self.ribbon)
+                # skin = cmds.skinCluster(self.controlJointsAll, self.ribbon, maximumInfluences=3)[0]
 
                 # method2: find skin, add new joints, update dagPose
-                skin = cls.get_skin_node(cls.ribbon)
+                skin = self.get_skin_node(self.ribbon)
                 if not skin:
-                    skin = cmds.skinCluster(cls.controlJointsAll, cls.ribbon, maximumInfluences=3)[0]
+                    skin = cmds.skinCluster(self.controlJointsAll, self.ribbon, maximumInfluences=3)[0]
+                    self.nodeRegistry.register(self.ribbon, "skinCluster", skin)
                 else:
-                    dp = cmds.dagPose(cls.controlJointsAll[0], query=True,
+                    dp = cmds.dagPose(self.controlJointsAll[0], query=True,
                                       bindPose=True)  # maybe there is a better way to get the dagPose
                     # cmds.delete(dp)
-                    # cmds.dagPose(cls.controlJointsAll, save=True, bindPose=True)
-                    # cmds.bindSkin(cls.controlJointsAll, enable=False)  # deactivate skin to allow moving joints
-                    for jnt in cls.controlJointsAll:
+                    # cmds.dagPose(self.controlJointsAll, save=True, bindPose=True)
+                    # cmds.bindSkin(self.controlJointsAll, enable=False)  # deactivate skin to allow moving joints
+                    for jnt in self.controlJointsAll:
                         try:
                             cmds.skinCluster(skin, edit=True, addInfluence=jnt)
                             cmds.dagPose(jnt, name=dp, addToPose=True)
                         except RuntimeError:
                             pass
 
-                jntDataPos = [(jnt, cmds.xform(jnt, query=True, worldSpace=True, translation=True)[0]) for jnt in
-                              cls.controlJointsAll]
-                nurbCVs = cmds.ls(f'{cls.ribbon}.cv[:][:]', flatten=True)  # Get all cvs from curve
-                jointIndex = 0
-                for cv in nurbCVs:
-                    xPosU = cmds.xform(cv, worldSpace=True, query=True, translation=True)[
-                        0]  # We extract tX to determine if control vertex are before or after the position of the joint
-                    jnt, jntPos = jntDataPos[jointIndex]
-                    nextJnt, nextJntPos = jntDataPos[jointIndex + 1]
-                    if xPosU + 0.001 < nextJntPos:
-                        jntToSkin = jnt
-                    else:
-                        jntToSkin = nextJnt
-                        if jointIndex + 1 < len(jntDataPos) - 1:
-                            jointIndex += 1
-                    cmds.skinPercent(skin, cv, transformValue=[(jntToSkin, 1)])
-
-                # uSpans = cmds.getAttr(cls.ribbon + ".spansU")
-                # vSpans = cmds.getAttr(cls.ribbon + ".spansV")
-                # degree = cmds.getAttr(cls.ribbon + ".degreeU")
+                self.update_skin_weights(skin)
+
+                # uSpans = cmds.getAttr(self.ribbon + ".spansU")
+                # vSpans = cmds.getAttr(self.ribbon + ".spansV")
+                # degree = cmds.getAttr(self.ribbon + ".degreeU")
                 # uCount = uSpans + degree
                 # vCount = vSpans + degree
 
                 cmds.setAttr(f"{skin}.skinningMethod", 1)  # set to dual quaternion to reduce stretching
-                # cmds.bindSkin(cls.controlJointsAll, enable=True)
+                # cmds.bindSkin(self.controlJointsAll, enable=True)
 
                 return skin
             return None
         return None
 
-    @classmethod
-    def update_main_iso(cls, pMainJointCount: int, pRollJointCount: int,
-                        pCreateControlJoints: bool, pCreateChain: bool, pSkinChain: bool, pPinch: bool) -> None:
+    def update_skin_weights_per_cv(self, pSkin: str) -> None:
+        """
+        Weights each CV of the ribbon to the control joint placed before it, querying and editing one CV at a time.
+        """
+        jntDataPos = [(jnt, cmds.xform(jnt, query=True, worldSpace=True, translation=True)[0]) for jnt in
+                      self.controlJointsAll]
+        nurbCVs = cmds.ls(f'{self.ribbon}.cv[:][:]', flatten=True)  # Get all cvs from curve
+        jointIndex = 0
+        for cv in nurbCVs:
+            xPosU = cmds.xform(cv, worldSpace=True, query=True, translation=True)[
+                0]  # We extract tX to determine if control vertex are before or after the position of the joint
+            jnt, jntPos = jntDataPos[jointIndex]
+            nextJnt, nextJntPos = jntDataPos[jointIndex + 1]
+            if xPosU + 0.001 < nextJntPos:
+                jntToSkin = jnt
+            else:
+                jntToSkin = nextJnt
+                if jointIndex + 1 < len(jntDataPos) - 1:
+                    jointIndex += 1
+            cmds.skinPercent(pSkin, cv, transformValue=[(jntToSkin, 1)])
 
-        cls.distances = cls.generate_distance_list(cls.selection, cls.length, pMainJointCount)
-        cls.mainIsoPos = cls.generate_iso_pos_main(cls.distances)
-        cls.mainKnotNode = cls.add_knots(cls.ribbon, cls.mainIsoPos, KnotType.main, pPinch)
-        cls.update_follicles(cls.mainIsoPos, cls.mainKnotNode, KnotType.main)
-        cls.update_roll_iso(pRollJointCount, pCreateChain, pCreateControlJoints, pSkinChain)
+    def update_skin_weights(self, pSkin: str) -> None:
+        """
+        Weights each CV of the ribbon to the control joint placed before it.
+        All CV positions are read in one query, and all weights are written at once.
+        """
+        cvsX = cmds.xform(f"{self.ribbon}.cv[*][*]", query=True, worldSpace=True, translation=True)[0::3]
+        jointsX = cmds.xform(self.controlJointsAll, query=True, worldSpace=True, translation=True)[0::3]
+        if RibbonGeo:
+            jointIndices = RibbonGeo.assign_cvs_to_joints(cvsX, jointsX).tolist()
+        else:
+            jointIndices = [min(bisect.bisect_right(jointsX[1:], x + 0.001), len(jointsX) - 1) for x in cvsX]
+        shape = self.get_shape(self.ribbon)
+        vCount = cmds.getAttr(f"{shape}.spansV") + cmds.getAttr(f"{shape}.degreeV")
+        uCount = len(cvsX) // vCount
+        if om is None:  # without the API, weight the CVs of each joint in one command
+            for i, jnt in enumerate(self.controlJointsAll):
+                cvs = [f"{self.ribbon}.cv[{c // vCount}][{c % vCount}]" for c, j in enumerate(jointIndices) if j == i]
+                if cvs:
+                    cmds.skinPercent(pSkin, cvs, transformValue=[(jnt, 1)])
+        else:
+            self.set_skin_weights(pSkin, jointIndices, uCount, vCount)
 
-    @classmethod
-    def update_roll_iso(cls, pRollJointCount: int, pIsChain: bool,
+    def set_skin_weights(self, pSkin: str, pJointIndices: List[int], pUCount: int, pVCount: int) -> None:
+        """
+        Sets the weights of all CVs with a single MFnSkinCluster.setWeights call.
+        :param pJointIndices: for each CV, in U-major order, the index of its joint in controlJointsAll.
+        """
+        selection = om.MSelectionList()
+        selection.add(pSkin)
+        selection.add(self.ribbon)
+        fnSkin = oma.MFnSkinCluster(selection.getDependNode(0))
+        shapePath = selection.getDagPath(1).extendToShape()
+        fnComponent = om.MFnDoubleIndexedComponent()
+        components = fnComponent.create(om.MFn.kSurfaceCVComponent)
+        fnComponent.addElements([[u, v] for u in range(pUCount) for v in range(pVCount)])
+
+        influences = [path.partialPathName() for path in fnSkin.influenceObjects()]
+        columnByJoint = {self.controlJointsAll.index(jnt): i for i, jnt in enumerate(influences)
+                         if jnt in self.controlJointsAll}
+        weights = om.MDoubleArray(len(pJointIndices) * len(influences), 0)
+        for cv, jointIndex in enumerate(pJointIndices):
+            if jointIndex in columnByJoint:
+                weights[cv * len(influences) + columnByJoint[jointIndex]] = 1
+        fnSkin.setWeights(shapePath, components, om.MIntArray(range(len(influences))), weights, False)
+
+    def time_skin_weights(self) -> Dict[str, float]:
+        """
+        Times the per-CV loop against the bulk weighting, on the current ribbon.
+        :return: seconds by method, like {"perCv": 0.8, "bulk": 0.01}
+        """
+        skin = self.get_skin_node(self.ribbon)
+        if not skin or not self.controlJointsAll:
+            return {}
+        timings = {}
+        for method, function in (("perCv", self.update_skin_weights_per_cv), ("bulk", self.update_skin_weights)):
+            start = time.perf_counter()
+            function(skin)
+            timings[method] = time.perf_counter() - start
+        return timings
+
+    @transaction
+    def update_main_iso(self, pMainJointCount: int, pRollJointCount: int,
+                        pCreateControlJoints: bool, pCreateChain: bool, pSkinChain: bool, pPinch: bool) -> None:
+        if self.proxy:
+            self.update_proxy({"mainJointCount": pMainJointCount, "rollJointCount": pRollJointCount,
+                               "controlJoints": pCreateControlJoints, "chain": pCreateChain, "skin": pSkinChain,
+                               "pinch": pPinch})
+            self.end_step(False, True)
+            return
+        self.update_main_knots(pMainJointCount, pPinch)
+        graph = RibbonGraph.NodeGraph()  # main and roll follicles are created together
+        self.update_follicles(self.mainIsoPos, self.mainKnotNode, KnotType.main, pGraph=graph)
+        self.update_roll_iso(pRollJointCount, pCreateChain, pCreateControlJoints, pSkinChain, graph)
+
+    @transaction
+    def update_roll_iso(self, pRollJointCount: int, pIsChain: bool,
                         pCreateControlJoints: bool,
-                        pSkinChain: bool) -> None:
-        cls.rollIsoPos = cls.generate_iso_pos_roll(pRollJointCount, cls.mainIsoPos)
-        cls.rollKnotNode = cls.add_knots(cls.ribbon, cls.rollIsoPos, KnotType.roll)
-        cls.update_follicles(cls.rollIsoPos, cls.rollKnotNode, KnotType.roll)
-        cls.controlJointsMain = cls.update_control_joint(pCreateControlJoints, pIsChain, pSkinChain)
-        cls.end_step(False, True)
-
-    @classmethod
-    def update_length(cls, pLength: float) -> None:
-        skin = cls.get_skin_node(cls.ribbon)
+                        pSkinChain: bool,
+                        pGraph: Optional[RibbonGraph.NodeGraph] = None) -> None:
+        if self.proxy:
+            self.update_proxy({"rollJointCount": pRollJointCount, "chain": pIsChain,
+                               "controlJoints": pCreateControlJoints, "skin": pSkinChain})
+            self.end_step(False, True)
+            return
+        graph = pGraph if pGraph is not None else RibbonGraph.NodeGraph()
+        self.update_roll_knots(pRollJointCount)
+        self.update_follicles(self.rollIsoPos, self.rollKnotNode, KnotType.roll, pGraph=graph)
+        self.commit_graph(graph)
+        self.update_topology_consumers(pCreateControlJoints, pIsChain, pSkinChain)
+        self.end_step(False, True)
+
+    def update_knots(self, pMainJointCount: int, pRollJointCount: int, pPinch: bool) -> None:
+        self.update_main_knots(pMainJointCount, pPinch)
+        self.update_roll_knots(pRollJointCount)
+
+    def update_main_knots(self, pMainJointCount: int, pPinch: bool) -> None:
+        self.spec.mainJointCount, self.spec.pinch = pMainJointCount, pPinch
+        self.distances = self.generate_distance_list(self.selection, self.length, pMainJointCount)
+        self.mainIsoPos = self.generate_iso_pos_main(self.distances)
+        self.mainKnotNode = self.add_knots(self.ribbon, self.mainIsoPos, KnotType.main, pPinch)
+
+    def update_roll_knots(self, pRollJointCount: int) -> None:
+        self.spec.rollJointCount = pRollJointCount
+        self.rollIsoPos = self.generate_iso_pos_roll(pRollJointCount, self.mainIsoPos)
+        self.rollKnotNode = self.add_knots(self.ribbon, self.rollIsoPos, KnotType.roll)
+
+    @transaction
+    def update_length(self, pLength: float) -> None:
+        if self.proxy:
+            self.update_proxy({"length": pLength})
+            self.end_step(False, True)
+            return
+        skin = self.get_skin_node(self.ribbon)
 
         if skin:
             cmds.setAttr(f"{skin}.envelope", 0)
 
-        cls.length = pLength
-        for ribbon in cls.ribbonList:
-            makeNurbNode = cls.get_make_nurb_node(ribbon)
-            cmds.setAttr(f"{makeNurbNode}.width", cls.length)
-            cmds.setAttr(f"{makeNurbNode}.pivot", cls.length / 2, 0, 0)
-        if cls.controlJointsAll:
-            locators = cls.get_sorted_loc()
-            for i, (loc, jnt) in enumerate(zip(locators, cls.controlJointsAll)):
-                matrix = cmds.xform(loc, query=True, translation=True, worldSpace=True)
-                cmds.xform(jnt, translation=matrix, worldSpace=True)
-                invMatrix = cmds.getAttr(f"{jnt}.worldInverseMatrix")
-                cmds.setAttr(f"{skin}.bindPreMatrix[{i}]", invMatrix, type="matrix")
+        self.length = self.spec.length = pLength
+        for ribbon in self.ribbonList:
+            makeNurbNode = self.get_make_nurb_node(ribbon)
+            cmds.setAttr(f"{makeNurbNode}.width", self.length)
+            cmds.setAttr(f"{makeNurbNode}.pivot", self.length / 2, 0, 0)
+        self.snap_control_joints(skin)
 
         if skin:
             cmds.setAttr(f"{skin}.envelope", 1)
 
-        cls.end_step(False, True)
+        self.store_metadata(pJoints=False)
+        self.end_step(False, True)
 
-    @classmethod
-    def unbind_skin(cls, pShape):
-        skin = cls.get_skin_node(pShape)
+    def unbind_skin(self, pShape):
+        skin = self.get_skin_node(pShape)
         if skin:
             cmds.skinCluster(skin, edit=True, unbind=True)
 
-    @classmethod
-    def match_selected(cls, pSelection: list) -> None:
-        for source, target in zip(cls.controlJointsMain, pSelection):
+    def match_selected(self, pSelection: list) -> None:
+        for source, target in zip(self.controlJointsMain, pSelection):
             cmds.matchTransform(source, target)
 
-    @classmethod
-    def reset_control_joints_transform(cls) -> None:
-        if cls.controlJointsMain and cls.distances:
+    def reset_control_joints_transform(self) -> None:
+        if self.controlJointsMain and self.distances:
             distIter = 0
-            for jnt, dist in zip(cls.controlJointsMain, cls.distances):
+            for jnt, dist in zip(self.controlJointsMain, self.distances):
                 cmds.xform(jnt, worldSpace=True, translation=[distIter, 0, 0])
                 cmds.xform(jnt, worldSpace=True, rotation=[0, 0, 0])
                 distIter += dist
 
-    @classmethod
-    def restore_selection(cls):
-        if cls.selection:
-            if cls.align:
-                cls.match_selected(cls.selection)
-            cmds.select(cls.selection)
+    def restore_selection(self):
+        if self.selection:
+            if self.align:
+                self.match_selected(self.selection)
+            cmds.select(self.selection)
         else:
             cmds.select(clear=True)
 
-    @classmethod
-    def delete_history(cls) -> None:
-        cmds.bakePartialHistory(cls.ribbon, prePostDeformers=True)
-
-    @classmethod
-    def delete_ribbon(cls, pRibbonName: str) -> None:
-        cmds.delete(cls.grpRibbon)
-        cmds.delete(f"{pRibbonName}")
-        cls.previs_step = False
-
-    @classmethod
-    def previs_ribbon(cls,
+    def delete_history(self) -> None:
+        cmds.bakePartialHistory(self.ribbon, prePostDeformers=True)
+        if self.spec:
+            self.spec.deleteHistory = True  # the knots are baked, the ribbon can't be reopened
+            self.store_metadata(pJoints=False)
+
+    def delete_ribbon(self, pRibbonName: str) -> None:
+        if self.proxy:
+            RibbonProxy.delete(self.proxy)
+            self.proxy = None
+            self.previs_step = False
+            return
+        self.delete_nodes(pRibbonName)
+        self.liveRibbons.pop(pRibbonName, None)
+        self.previs_step = False
+
+    @transaction
+    def previs_ribbon(self,
                       pName: str,
                       pForwardVector: list,
                       pUpVector: list,
@@ -709,37 +1146,340 @@ class RibbonOperations:
                       pSkinChain: bool,
                       pPinch: bool,
                       pShowPopup: bool = True) -> str:
-        cls.init_params()
-        cls.selection = cls.get_selection("joint", True)
-        cls.previs_step = True
-        cls.store_vectors(pForwardVector, pUpVector)
-        cls.length = pLength
-        cls.ribbon, cls.makeNurbNode = cls.create_nurb(pName, pLength, cls.smooth)
-        cls.ribbonList.append(cls.ribbon)
-        cls.grpRibbon = cmds.group(name=f"{cls.ribbon}_setup", empty=True)
-        cls.grpLoc = cmds.group(name=f"{cls.ribbon}_grp_loc", empty=True, parent=cls.grpRibbon)
-        cls.grpJnt = cmds.group(name=f"{cls.ribbon}_grp_jnt", empty=True, parent=cls.grpRibbon)
-        cls.update_main_iso(pMainJointCount, pRollJointCount, pCreateControlJoints,
-                            pCreateChain, pSkinChain, pPinch)
-        message = cls.end_step(pShowPopup, True)
+        args = (pName, pForwardVector, pUpVector, pLength, pMainJointCount, pRollJointCount, pCreateControlJoints,
+                pCreateChain, pSkinChain, pPinch)
+        if self.proxyPreview:
+            self.preview_proxy(*args)
+        else:
+            self.create_surface(*args)
+            self.update_main_iso(pMainJointCount, pRollJointCount, pCreateControlJoints,
+                                 pCreateChain, pSkinChain, pPinch)
+        message = self.end_step(pShowPopup, True)
         return message
 
-    @classmethod
-    def build_ribbon(cls, *args, **kwargs) -> str:
-        if not cls.previs_step:
-            cls.previs_ribbon(*args, pPinch=kwargs["pPinch"], pShowPopup=False)
+    def create_surface(self, pName: str, pForwardVector: list, pUpVector: list, pLength: float,
+                       pMainJointCount: int, pRollJointCount: int, pCreateControlJoints: bool, pCreateChain: bool,
+                       pSkinChain: bool, pPinch: bool, pPositions: Optional[List[List[float]]] = None,
+                       pSelection: Optional[List[str]] = None) -> None:
+        """
+        Creates the nurb of a new ribbon and its groups, without knots.
+        :param pPositions: see init_spec
+        :param pSelection: see init_spec
+        """
+        self.init_spec(pName, pForwardVector, pUpVector, pLength, pMainJointCount, pRollJointCount,
+                       pCreateControlJoints, pCreateChain, pSkinChain, pPinch, pPositions, pSelection)
+        self.ribbon, self.makeNurbNode = self.create_nurb(pName, pLength, self.smooth)
+        self.ribbonList.append(self.ribbon)
+        self.liveRibbons[self.ribbon] = self
+        self.grpRibbon = cmds.group(name=f"{self.ribbon}_setup", empty=True)
+        self.grpLoc = cmds.group(name=f"{self.ribbon}_grp_loc", empty=True, parent=self.grpRibbon)
+        self.grpJnt = cmds.group(name=f"{self.ribbon}_grp_jnt", empty=True, parent=self.grpRibbon)
+        for role in ("grpRibbon", "grpLoc", "grpJnt"):
+            self.nodeRegistry.register(self.ribbon, role, getattr(self, role))
+
+    def init_spec(self, pName: str, pForwardVector: list, pUpVector: list, pLength: float,
+                  pMainJointCount: int, pRollJointCount: int, pCreateControlJoints: bool, pCreateChain: bool,
+                  pSkinChain: bool, pPinch: bool, pPositions: Optional[List[List[float]]] = None,
+                  pSelection: Optional[List[str]] = None) -> None:
+        """
+        Starts a new ribbon along the selected joints.
+        :param pPositions: the world positions of the selected joints when the caller already knows them, so they are
+        not queried again.
+        :param pSelection: the joints to use instead of the selected ones, like the ones selected when a build started.
+        """
+        self.init_params()
+        self.selection = list(pSelection) if pSelection is not None else self.get_selection("joint", True)
+        self.selectionPositions = pPositions
+        self.previs_step = True
+        self.store_vectors(pForwardVector, pUpVector)
+        self.length = pLength
+        self.spec = RibbonSpec(pName, list(pForwardVector), list(pUpVector), pLength, pMainJointCount, pRollJointCount,
+                               pCreateControlJoints, pCreateChain, pSkinChain, pPinch, scaleMode=str(self.scaleMode),
+                               joints=list(self.selection))
+
+    def preview_proxy(self, *args, pProxy: Optional[RibbonProxy.ProxyCurves] = None,
+                      pSelection: Optional[List[str]] = None) -> None:
+        """
+        Previews a new ribbon with proxy curves only, see RibbonCreatorProxy.
+        :param args: the arguments of create_surface.
+        :param pProxy: the proxy to reuse, like the one of a build that has been cancelled.
+        :param pSelection: see init_spec
+        """
+        self.init_spec(*args, pSelection=pSelection)
+        self.proxy = pProxy or RibbonProxy.create(self.spec.name)
+        self.update_proxy()
+
+    @transaction
+    def update_proxy(self, pChanges: Optional[dict] = None) -> None:
+        """
+        Applies pChanges to the spec of the ribbon, like {"length": 12}, then moves the points of its proxy from the
+        isoparms, computed like update_main_knots and update_roll_knots do.
+        """
+        for name, value in (pChanges or {}).items():
+            setattr(self.spec, name, value)
+        self.length = self.spec.length
+        self.distances = self.generate_distance_list(self.selection, self.length, self.spec.mainJointCount)
+        self.mainIsoPos = self.generate_iso_pos_main(self.distances)
+        self.rollIsoPos = self.generate_iso_pos_roll(self.spec.rollJointCount, self.mainIsoPos)
+        # the main control joints are matched to the selected joints, see restore_selection
+        aligned = self.align and self.selection and self.spec.controlJoints
+        RibbonProxy.update(self.proxy, self.length, self.generate_iso_pos_full(self.mainIsoPos), self.rollIsoPos,
+                           self.get_world_positions(self.selection) if aligned else None)
+
+    @transaction
+    def build_ribbon(self, *args, **kwargs) -> str:
+        steps, rollback = self.build_steps(*args, **kwargs)
+        for name, step in steps:
+            step()
+        message = self.end_step(True, False)
+        return message
 
-        # build deformers
+    def build_steps(self, *args, **kwargs) -> Tuple[List[Tuple[str, Callable[[], None]]], Callable[[], None]]:
+        """
+        Splits build_ribbon into steps run one after the other: surface, knots, follicles, joints and skin if the ribbon
+        is not previewed yet or only previewed by a proxy, one step per deformer to build, the metadata and the deletion
+        of the proxy.
+        :param args: the arguments of build_ribbon.
+        :param kwargs: the keyword arguments of build_ribbon, with pPositions, see init_spec.
+        The joints are the ones selected when the steps are created, even if the selection changes before they run.
+        :return: the steps as (name, function), and a function undoing the steps already run.
+        """
+        pinch = kwargs["pPinch"]
+        shared = kwargs.get("pSharedDeformers", False)
+        positions = kwargs.pop("pPositions", None)
+        proxy = self.proxy
+        previewed = self.previs_step and not proxy
+        selection = None if previewed else self.get_selection("joint", True)
+        steps = []
+        if not previewed:
+            mainCount, rollCount, controlJoints, chain, skin = args[4:9]
+            steps += [("surface", lambda: self.create_surface(*args, pinch, positions, selection)),
+                      ("knots", lambda: self.update_knots(mainCount, rollCount, pinch)),
+                      ("follicles", self.create_follicles),
+                      # the skin is a step of its own, it is the longest one with the deformers
+                      ("joints", lambda: self.update_control_joint(controlJoints, chain, False)),
+                      ("skin", lambda: self.update_control_skin(skin))]
+
+        # build deformers, except the ones of a reopened ribbon that are already built with the same surfaces
+        built = self.spec.deformers if previewed and self.spec.sharedDeformers == shared else []
+        removed = [d for d in self.spec.deformers if d not in built] if previewed else []
+        created = []
+
+        def delete_deformers() -> None:
+            for deformer in removed:
+                self.delete_deformer(deformer)
+
+        def create_deformer(pDeformerType: str) -> None:
+            self.create_deformer(self.mainIsoPos, self.rollIsoPos, pDeformerType, pinch, shared)
+            created.append(pDeformerType)
+
+        def rollback() -> None:
+            if not previewed:
+                self.delete_build()
+                if proxy:
+                    self.preview_proxy(*args, pinch, pProxy=proxy, pSelection=selection)
+                return
+            for deformer in created:
+                self.delete_deformer(deformer)
+            for deformer in removed:
+                if not self.nodeRegistry.get(self.ribbon, f"{deformer}Handle"):
+                    self.create_deformer(self.mainIsoPos, self.rollIsoPos, deformer, self.spec.pinch,
+                                         self.spec.sharedDeformers)
+
+        if removed:
+            steps.append(("deformers", delete_deformers))
         for param, value in kwargs.items():
-            if param.lower() in ["sine", "twist", "flare", "bend"] and value:
-                cls.create_deformer(cls.mainIsoPos, cls.rollIsoPos, param, kwargs["pPinch"])
+            if param.lower() in DEFORMERS and value and param.lower() not in built:
+                steps.append((param.lower(), functools.partial(create_deformer, param)))
+        deformers = [d for d in DEFORMERS if d in built or kwargs.get(d)]
+        steps.append(("metadata", lambda: self.store_build(args, pinch, deformers, shared)))
+        if proxy:
+            steps.append(("proxy", lambda: RibbonProxy.delete(proxy)))
+        return steps, rollback
+
+    def create_follicles(self) -> None:
+        graph = RibbonGraph.NodeGraph()  # main and roll follicles are created together
+        self.update_follicles(self.mainIsoPos, self.mainKnotNode, KnotType.main, pGraph=graph)
+        self.update_follicles(self.rollIsoPos, self.rollKnotNode, KnotType.roll, pGraph=graph)
+        self.commit_graph(graph)
+
+    def update_control_skin(self, pSkinChain: bool) -> None:
+        """
+        Skins the control joints to the ribbon, after update_control_joint built them without skin.
+        """
+        self.spec.skin = pSkinChain
+        if pSkinChain and self.controlJointsMain:
+            self.update_skin()
+            self.store_metadata(pJoints=False)
 
-        message = cls.end_step(True, False)
-        return message
+    def store_build(self, pArgs: tuple, pPinch: bool, pDeformers: List[str], pSharedDeformers: bool) -> None:
+        self.spec = RibbonSpec(*pArgs, pinch=pPinch, deformers=pDeformers, scaleMode=self.spec.scaleMode,
+                               joints=self.spec.joints, sharedDeformers=pSharedDeformers)
+        self.store_metadata()
 
-    @classmethod
-    def end_step(cls, pShowPopup: bool, pPreBuildStep: bool = "") -> Optional[str]:
-        cls.restore_selection()
+    def delete_build(self) -> None:
+        """
+        Deletes whatever exists of the ribbon being built, even if its build stopped half way, then resets the
+        parameters.
+        """
+        if self.ribbon:
+            self.delete_nodes(self.ribbon)
+        self.init_params()
+
+    def delete_nodes(self, pRibbon: str) -> None:
+        """
+        Deletes the nurb pRibbon, its setup group, the nodes shared by its follicles and its metadata node.
+        """
+        metadataNode = self.get_metadata_node(pRibbon)
+        nodes = cmds.ls(pRibbon, f"{pRibbon}_setup") + self.get_shared_nodes(pRibbon)
+        if metadataNode:
+            nodes.append(metadataNode)
+        if nodes:
+            cmds.delete(nodes)
+        self.nodeRegistry.unregister(pRibbon)
+
+    @transaction
+    def build_from_spec(self, pSpec: RibbonSpec, pReplace: bool = False,
+                        pPositions: Optional[List[List[float]]] = None) -> str:
+        """
+        Builds the ribbon described by pSpec without the interface, aligned to pSpec.joints if any.
+        :param pReplace: deletes the ribbon of the same name if it already exists. It is deleted before the build
+        starts, since the new nodes take its names, so it is lost if the build fails.
+        :param pPositions: the world positions of pSpec.joints if they are known, so they are not queried again.
+        :return: the name of the ribbon
+        """
+        if self.check_ribbon(pSpec.name):
+            if not pReplace:
+                raise ValueError(f"Ribbon '{pSpec.name}' already exists.")
+            self.delete_nodes(pSpec.name)
+        self.init_params()
+        self.scaleMode = ScaleMode(pSpec.scaleMode)
+        self.align = bool(pSpec.joints)  # the main control joints are matched to the joints
+        if pSpec.joints:
+            cmds.select(pSpec.joints, replace=True)
+        else:
+            cmds.select(clear=True)
+        self.build_ribbon(*pSpec.previs_args(), pPositions=pPositions, **pSpec.build_kwargs())
+        if pSpec.deleteHistory:
+            self.delete_history()
+        ribbon = self.ribbon
+        self.init_params()
+        return ribbon
+
+    # --------------------------------------------------------
+    # ---------------------- METADATA ------------------------
+    # --------------------------------------------------------
+    def get_metadata_node(self, pRibbon: Optional[str] = None) -> Optional[str]:
+        """
+        :return: the metadata node of pRibbon (the current ribbon by default), or None.
+        """
+        ribbon = pRibbon or self.ribbon
+        return self.nodeRegistry.get(ribbon, "metadata") or RibbonMeta.find(ribbon)
+
+    def store_metadata(self, pJoints: bool = True) -> None:
+        """
+        Writes the spec, the isoparms, the nodes and the control joints of the ribbon on its metadata node,
+        creating it the first time.
+        :param pJoints: also writes the control joints, False if they didn't change.
+        """
+        if not self.spec:
+            return
+        node = self.nodeRegistry.get(self.ribbon, "metadata")
+        if not node:
+            node = RibbonMeta.find(self.ribbon) or RibbonMeta.create(self.ribbon)
+            self.nodeRegistry.register(self.ribbon, "metadata", node)
+            pJoints = True
+        nodes = {role: self.nodeRegistry.get(self.ribbon, role) for role in METADATA_ROLES}
+        mainIndices = [self.controlJointsAll.index(jnt) for jnt in self.controlJointsMain or []]
+        metadata = RibbonMeta.RibbonMetadata(self.ribbon, self.spec, self.mainIsoPos, self.rollIsoPos, nodes,
+                                             self.controlJointsAll, mainIndices)
+        RibbonMeta.write(node, metadata, pJoints)
+
+    def open_ribbon(self, pNode: str) -> RibbonSpec:
+        """
+        Restores the state of a ribbon built by the tool from its metadata node, so it can be edited like a preview.
+        :param pNode: the nurb of the ribbon, or one of its nodes.
+        :return: the spec of the ribbon
+        """
+        metadataNode = RibbonMeta.find(pNode)
+        if not metadataNode:
+            raise ValueError(f"'{pNode}' is not part of a ribbon built by this tool.")
+        metadata = RibbonMeta.read(metadataNode)
+        if metadata.spec.deleteHistory:
+            raise ValueError(f"The history of '{metadata.ribbon}' has been deleted, it can't be edited anymore.")
+        self.init_params()
+        self.spec = metadata.spec
+        self.ribbon = metadata.ribbon
+        self.ribbonList.append(self.ribbon)
+        self.nodeRegistry.unregister(self.ribbon)
+        self.nodeRegistry.track(self.ribbon)
+        self.nodeRegistry.register(self.ribbon, "metadata", metadataNode)
+        for role, node in metadata.nodes.items():
+            self.nodeRegistry.register(self.ribbon, role, node)
+        self.makeNurbNode = metadata.nodes.get("makeNurbPlane", "")
+        self.mainKnotNode = metadata.nodes.get(str(KnotType.main), "")
+        self.rollKnotNode = metadata.nodes.get(str(KnotType.roll), "")
+        self.blendShapeNode = metadata.nodes.get("blendShape", "")
+        for role in ("grpRibbon", "grpLoc", "grpJnt", "grpDeform"):
+            setattr(self, role, metadata.nodes.get(role, ""))
+        self.mainIsoPos = metadata.mainIsoPos
+        self.rollIsoPos = metadata.rollIsoPos
+        self.controlJointsAll = metadata.controlJoints
+        self.controlJointsMain = metadata.controlJointsMain
+        self.knotLayout = (self.mainIsoPos, self.rollIsoPos, self.spec.pinch)
+        self.store_vectors(self.spec.forwardVector, self.spec.upVector)
+        self.length = self.spec.length
+        self.scaleMode = ScaleMode(self.spec.scaleMode)
+        self.selection = cmds.ls(self.spec.joints, type="joint") if self.spec.joints else []
+        self.align = bool(self.selection)
+        self.previs_step = True
+        self.liveRibbons[self.ribbon] = self
+        return self.spec
+
+    @transaction
+    def edit_ribbon(self, pNode: str, pChanges: dict) -> RibbonSpec:
+        """
+        Reopens the ribbon of pNode, applies pChanges and builds it again, in a single transaction.
+        :param pChanges: new values of EDITABLE_FIELDS, like {"length": 12, "rollJointCount": 3},
+        and deformers to add or remove, like {"sine": True, "bend": False}.
+        :return: the new spec of the ribbon
+        """
+        unknown = set(pChanges) - set(EDITABLE_FIELDS) - set(DEFORMERS)
+        if unknown:
+            raise ValueError(f"Unknown changes {sorted(unknown)}, use {EDITABLE_FIELDS} or {DEFORMERS}")
+        old = dataclasses.replace(self.open_ribbon(pNode))  # a copy, as the spec of the ribbon is updated below
+        try:
+            new = RibbonSpec.from_dict({**old.to_dict(), **{k: v for k, v in pChanges.items() if k in EDITABLE_FIELDS},
+                                        "deformers": [d for d in DEFORMERS if pChanges.get(d, d in old.deformers)]})
+            if old.joints and (new.length, new.mainJointCount) != (old.length, old.mainJointCount):
+                raise ValueError(f"'{self.ribbon}' is aligned to joints, its length and main joints can't change.")
+            if new.length != old.length:
+                self.update_length(new.length)
+            if new.scaleMode != old.scaleMode:
+                self.scaleMode = ScaleMode(new.scaleMode)
+                self.spec.scaleMode = new.scaleMode
+                self.delete_follicles()
+            if (new.mainJointCount, new.pinch, new.scaleMode) != (old.mainJointCount, old.pinch, old.scaleMode):
+                self.update_main_iso(new.mainJointCount, new.rollJointCount, new.controlJoints, new.chain, new.skin,
+                                     new.pinch)
+            elif new.rollJointCount != old.rollJointCount:
+                self.update_roll_iso(new.rollJointCount, new.chain, new.controlJoints, new.skin)
+            elif (new.controlJoints, new.chain, new.skin) != (old.controlJoints, old.chain, old.skin):
+                self.update_control_joint(new.controlJoints, new.chain, new.skin)
+            # the nurbs of the deformers must have the knots of the ribbon, they are rebuilt if the layout changed
+            layoutChanged = (new.length, new.mainJointCount, new.rollJointCount, new.pinch) != \
+                            (old.length, old.mainJointCount, old.rollJointCount, old.pinch)
+            for deformer in old.deformers:
+                if layoutChanged or deformer not in new.deformers:
+                    self.delete_deformer(deformer)
+            self.spec.deformers = [d for d in old.deformers if d in new.deformers and not layoutChanged]
+            self.build_ribbon(*new.previs_args(), **new.build_kwargs())
+            return self.spec
+        finally:
+            self.init_params()
+
+    def end_step(self, pShowPopup: bool, pPreBuildStep: bool = "") -> Optional[str]:
+        self.restore_selection()
         if not pShowPopup:
             return None
         if pPreBuildStep:
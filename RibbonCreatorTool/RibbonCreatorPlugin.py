@@ -0,0 +1,180 @@
+"""
+Maya plugin of the Ribbon Creator Tool. It is loaded on demand by RibbonCreatorGraph.load_plugin().
+
+ribbonCreatorCommit: executes the modifier queued by RibbonCreatorGraph.ModifierBuilder under the key given as argument,
+    so a whole network created by a modifier is a single entry in the undo queue.
+ribbonSampler: samples a NURBS surface at an array of U parameters, and outputs a matrix and a scale for each,
+    like one uvPin plus one curveFromSurfaceIso and curveInfo per follicle. The math is done by
+    RibbonCreatorGeometry.sample_surface, in one vectorized call, when NumPy is available.
+"""
+import maya.api.OpenMaya as om
+
+from RibbonCreatorTool import RibbonCreatorGraph
+
+try:
+    import numpy as np
+    from RibbonCreatorTool import RibbonCreatorGeometry as RibbonGeo
+except ImportError:  # NumPy is not shipped with every Maya version
+    RibbonGeo = None
+
+
+def maya_useNewAPI():
+    pass
+
+
+class CommitCommand(om.MPxCommand):
+    kPluginCmdName = RibbonCreatorGraph.COMMIT_COMMAND
+
+    def __init__(self):
+        super().__init__()
+        self.modifier = None
+
+    @staticmethod
+    def creator():
+        return CommitCommand()
+
+    @staticmethod
+    def syntax():
+        syntax = om.MSyntax()
+        syntax.addArg(om.MSyntax.kString)
+        return syntax
+
+    def doIt(self, args):
+        key = om.MArgParser(self.syntax(), args).commandArgumentString(0)
+        self.modifier = RibbonCreatorGraph.pendingTransactions.pop(key, None)
+        if self.modifier is None:
+            raise RuntimeError(f"{self.kPluginCmdName}: no transaction '{key}' to commit.")
+        self.redoIt()
+
+    def redoIt(self):
+        self.modifier.do_it()
+
+    def undoIt(self):
+        self.modifier.undo_it()
+
+    def isUndoable(self):
+        return True
+
+
+class SamplerNode(om.MPxNode):
+    kNodeName = RibbonCreatorGraph.SAMPLER_TYPE
+    kNodeId = om.MTypeId(0x0007F7A1)  # in the range reserved for local plugins
+    kLengthSamples = 16  # points measuring the length of an isoparm, like RibbonCreatorGeometry.iso_length
+
+    inputSurface = None
+    parameterU = None
+    parameterV = None
+    scaleFactor = None
+    outputMatrix = None
+    outputScale = None
+
+    @staticmethod
+    def creator():
+        return SamplerNode()
+
+    @staticmethod
+    def initialize():
+        typed = om.MFnTypedAttribute()
+        numeric = om.MFnNumericAttribute()
+        matrix = om.MFnMatrixAttribute()
+
+        SamplerNode.inputSurface = typed.create("inputSurface", "is", om.MFnData.kNurbsSurface)
+        SamplerNode.parameterU = numeric.create("parameterU", "pu", om.MFnNumericData.kDouble, 0.0)
+        numeric.array = True
+        numeric.usesArrayDataBuilder = True
+        SamplerNode.parameterV = numeric.create("parameterV", "pv", om.MFnNumericData.kDouble, 0.5)
+        SamplerNode.scaleFactor = numeric.create("scaleFactor", "sf", om.MFnNumericData.kDouble, 1.0)
+
+        SamplerNode.outputMatrix = matrix.create("outputMatrix", "om", om.MFnMatrixAttribute.kDouble)
+        matrix.array = True
+        matrix.usesArrayDataBuilder = True
+        matrix.writable = False
+        matrix.storable = False
+        SamplerNode.outputScale = numeric.create("outputScale", "os", om.MFnNumericData.kDouble, 1.0)
+        numeric.array = True
+        numeric.usesArrayDataBuilder = True
+        numeric.writable = False
+        numeric.storable = False
+
+        inputs = (SamplerNode.inputSurface, SamplerNode.parameterU, SamplerNode.parameterV, SamplerNode.scaleFactor)
+        outputs = (SamplerNode.outputMatrix, SamplerNode.outputScale)
+        for attribute in inputs + outputs:
+            om.MPxNode.addAttribute(attribute)
+        for attribute in inputs:
+            for output in outputs:
+                om.MPxNode.attributeAffects(attribute, output)
+
+    def compute(self, pPlug, pData):
+        attribute = pPlug.array().attribute() if pPlug.isElement else pPlug.attribute()
+        if attribute not in (self.outputMatrix, self.outputScale):
+            return None
+
+        indices, parameters = [], []
+        parameterHandle = pData.inputArrayValue(self.parameterU)
+        for i in range(len(parameterHandle)):
+            parameterHandle.jumpToPhysicalElement(i)
+            indices.append(parameterHandle.elementLogicalIndex())
+            parameters.append(parameterHandle.inputValue().asDouble())
+        v = pData.inputValue(self.parameterV).asDouble()
+        factor = pData.inputValue(self.scaleFactor).asDouble()
+        surface = pData.inputValue(self.inputSurface).asNurbsSurfaceTransformed()
+
+        if surface.isNull() or not parameters:
+            matrices, lengths = [om.MMatrix()] * len(parameters), [1.0] * len(parameters)
+        elif RibbonGeo is not None:
+            matrices, lengths = self.sample_vectorized(om.MFnNurbsSurface(surface), parameters, v)
+        else:
+            matrices, lengths = self.sample(om.MFnNurbsSurface(surface), parameters, v)
+
+        matrixBuilder = om.MArrayDataBuilder(pData, self.outputMatrix, len(indices))
+        scaleBuilder = om.MArrayDataBuilder(pData, self.outputScale, len(indices))
+        for index, matrix, length in zip(indices, matrices, lengths):
+            matrixBuilder.addElement(index).setMMatrix(om.MMatrix(matrix))
+            scaleBuilder.addElement(index).setDouble(length * factor)
+        for output, builder in ((self.outputMatrix, matrixBuilder), (self.outputScale, scaleBuilder)):
+            handle = pData.outputArrayValue(output)
+            handle.set(builder)
+            handle.setAllClean()
+        pData.setClean(pPlug)
+
+    @staticmethod
+    def sample_vectorized(pSurface: om.MFnNurbsSurface, pParameters: list, pV: float):
+        cvs = np.array([(p.x, p.y, p.z) for p in pSurface.cvPositions(om.MSpace.kObject)])
+        cvs = cvs.reshape(pSurface.numCVsInU, pSurface.numCVsInV, 3)
+        knotsU = RibbonGeo.full_knots(pSurface.knotsInU(), pSurface.degreeInU)
+        knotsV = RibbonGeo.full_knots(pSurface.knotsInV(), pSurface.degreeInV)
+        result = RibbonGeo.sample_surface(cvs, knotsU, knotsV, pSurface.degreeInU, pSurface.degreeInV, pParameters, pV)
+        return [tuple(m.ravel()) for m in result["matrix"]], result["length"].tolist()
+
+    @classmethod
+    def sample(cls, pSurface: om.MFnNurbsSurface, pParameters: list, pV: float):
+        """
+        Same as sample_vectorized, one parameter at a time with MFnNurbsSurface.
+        """
+        startV, endV = pSurface.knotDomainInV
+        matrices, lengths = [], []
+        for u in pParameters:
+            position, tangentU, _ = pSurface.getDerivativesAtParam(u, pV, om.MSpace.kObject)
+            zAxis = pSurface.normal(u, pV, om.MSpace.kObject).normal()
+            xAxis = tangentU.normal()
+            yAxis = (zAxis ^ xAxis).normal()
+            xAxis = yAxis ^ zAxis
+            matrices.append((xAxis.x, xAxis.y, xAxis.z, 0, yAxis.x, yAxis.y, yAxis.z, 0,
+                             zAxis.x, zAxis.y, zAxis.z, 0, position.x, position.y, position.z, 1))
+            points = [pSurface.getPointAtParam(u, startV + (endV - startV) * i / (cls.kLengthSamples - 1),
+                                               om.MSpace.kObject) for i in range(cls.kLengthSamples)]
+            lengths.append(sum(a.distanceTo(b) for a, b in zip(points, points[1:])))
+        return matrices, lengths
+
+
+def initializePlugin(pPlugin):
+    fnPlugin = om.MFnPlugin(pPlugin, "Remi CUXAC", "1.0", "Any")
+    fnPlugin.registerCommand(CommitCommand.kPluginCmdName, CommitCommand.creator, CommitCommand.syntax)
+    fnPlugin.registerNode(SamplerNode.kNodeName, SamplerNode.kNodeId, SamplerNode.creator, SamplerNode.initialize,
+                          om.MPxNode.kDependNode)
+
+
+def uninitializePlugin(pPlugin):
+    fnPlugin = om.MFnPlugin(pPlugin)
+    fnPlugin.deregisterCommand(CommitCommand.kPluginCmdName)
+    fnPlugin.deregisterNode(SamplerNode.kNodeId)
@@ -0,0 +1,258 @@
+"""
+Opt-in profiling of RibbonOperations: wall time, number of maya.cmds calls, estimated number of undo entries and
+number of DG nodes created, per stage (create_nurb, add_knots, update_follicles...) and per user action
+(previs_ribbon...).
+
+Nothing is patched until enable() is called, and disable() restores the original methods, so profiling costs
+nothing when it is off. Stage values are inclusive: a stage called by another stage is counted in both.
+Nodes built by commit_graph are counted, but not the cmds calls of its fallback builder.
+Undo entries are not read from the undo queue but estimated from the cmds calls: one per editing command, or one per
+undo chunk, so the report labels them as estimated. Each action records whether it ran in a transaction
+(RibbonCreatorTransaction), so the report compares the actions run with and without.
+
+    profiler = RibbonProfiler.profiler
+    profiler.enable()
+    ...  # use the tool
+    profiler.dump("C:/temp/ribbon_profile.json")
+"""
+import functools
+import json
+import time
+from typing import Dict, List, Optional
+
+import maya.cmds as cmds
+
+import RibbonCreatorTool.RibbonCreatorChains as RibbonChains
+import RibbonCreatorTool.RibbonCreatorMetadata as RibbonMeta
+import RibbonCreatorTool.RibbonCreatorOperations as RibbonGenOp
+import RibbonCreatorTool.RibbonCreatorProxy as RibbonProxy
+import RibbonCreatorTool.RibbonCreatorRegistry as RibbonRegistry
+import RibbonCreatorTool.RibbonCreatorTransaction as RibbonTransaction
+
+try:
+    import maya.api.OpenMaya as om
+except ImportError:
+    om = None
+
+# methods of RibbonOperations called by the interface
+ACTIONS = ("previs_ribbon", "build_ribbon", "build_from_spec", "update_main_iso", "update_roll_iso", "update_length",
+           "update_skin", "unbind_skin", "delete_ribbon", "delete_history", "open_ribbon", "edit_ribbon")
+# methods of RibbonOperations doing the work of the actions
+STAGES = ("create_nurb", "add_knots", "update_follicles", "commit_graph", "update_control_joint", "update_skin",
+          "update_skin_weights", "create_deformer", "delete_deformer", "delete_follicles", "restore_selection",
+          "generate_distance_list", "store_metadata", "create_surface", "create_follicles", "update_control_skin",
+          "store_build", "delete_build", "preview_proxy", "update_proxy")
+# modules whose maya.cmds calls are counted
+PROFILED_MODULES = (RibbonGenOp, RibbonChains, RibbonMeta, RibbonProxy, RibbonRegistry, RibbonTransaction)
+# commands not recorded in the undo queue, any command called with query=True being one too
+QUERY_COMMANDS = ("ls", "listRelatives", "listConnections", "listHistory", "objectType", "objExists", "getAttr",
+                  "attributeQuery", "pluginInfo", "about", "internalVar", "refresh", "warning")
+
+
+class CountingCmds:
+    """
+    Stands for maya.cmds in the profiled modules, and counts the calls.
+    """
+
+    def __init__(self, pCmds, pProfiler: "Profiler"):
+        self._cmds = pCmds
+        self._profiler = pProfiler
+
+    def __getattr__(self, pName: str):
+        command = getattr(self._cmds, pName)
+        profiler = self._profiler
+
+        @functools.wraps(command)
+        def counted(*args, **kwargs):
+            profiler.cmdsCalls += 1
+            profiler.count_undo(pName, kwargs)
+            return command(*args, **kwargs)
+
+        return counted
+
+
+class Profiler:
+    def __init__(self, pClass=RibbonGenOp.RibbonOperations):
+        self.profiledClass = pClass
+        self.enabled = False
+        self.cmdsCalls = 0
+        self.estimatedUndoEntries = 0
+        self.nodesCreated = 0
+        self._chunkDepth = 0
+        self.actions: List[dict] = []
+        self.stages: Dict[str, dict] = {}
+        self._stack: List[dict] = []
+        self._originals: Dict[str, object] = {}
+        self._callbackId = None
+
+    # --------------------------------------------------------
+    # ---------------------- SWITCH --------------------------
+    # --------------------------------------------------------
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        for name in dict.fromkeys(ACTIONS + STAGES):
+            original = self.profiledClass.__dict__.get(name)
+            if original is None:
+                continue
+            self._originals[name] = original
+            setattr(self.profiledClass, name, self._wrap(name, original))
+        for module in PROFILED_MODULES:
+            module.cmds = CountingCmds(cmds, self)
+        if om is not None:
+            self._callbackId = om.MDGMessage.addNodeAddedCallback(self._on_node_added, "dependNode")
+        self.enabled = True
+
+    def disable(self) -> None:
+        if not self.enabled:
+            return
+        for name, original in self._originals.items():
+            setattr(self.profiledClass, name, original)
+        self._originals.clear()
+        for module in PROFILED_MODULES:
+            module.cmds = cmds
+        if self._callbackId is not None:
+            om.MMessage.removeCallback(self._callbackId)
+            self._callbackId = None
+        self._stack.clear()
+        self._chunkDepth = 0
+        self.enabled = False
+
+    def reset(self) -> None:
+        self.actions.clear()
+        self.stages.clear()
+
+    def _on_node_added(self, *args) -> None:
+        self.nodesCreated += 1
+
+    def count_undo(self, pCommand: str, pFlags: dict) -> None:
+        if pCommand == "undoInfo":
+            if pFlags.get("openChunk"):
+                self.estimatedUndoEntries += not self._chunkDepth
+                self._chunkDepth += 1
+            elif pFlags.get("closeChunk"):
+                self._chunkDepth = max(0, self._chunkDepth - 1)
+        elif not self._chunkDepth and pCommand not in QUERY_COMMANDS and not (pFlags.get("query") or pFlags.get("q")):
+            self.estimatedUndoEntries += 1
+
+    def _node_count(self) -> int:
+        if self._callbackId is not None:
+            return self.nodesCreated
+        return len(cmds.ls())  # without the API, compares the number of nodes in the scene
+
+    # --------------------------------------------------------
+    # ---------------------- RECORD --------------------------
+    # --------------------------------------------------------
+    def _wrap(self, pName: str, pOriginal):
+        """
+        :param pOriginal: the function, classmethod or staticmethod object stored in the class.
+        """
+        function = getattr(pOriginal, "__func__", pOriginal)
+        profiler = self
+
+        @functools.wraps(function)
+        def profiled(*args, **kwargs):
+            profiler._start(pName)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler._stop()
+
+        if isinstance(pOriginal, (classmethod, staticmethod)):
+            return type(pOriginal)(profiled)
+        return profiled
+
+    def _start(self, pName: str) -> None:
+        isAction = pName in ACTIONS and not any(f["action"] for f in self._stack)
+        self._stack.append({"name": pName, "action": isAction, "time": time.perf_counter(),
+                            "cmdsCalls": self.cmdsCalls, "estimatedUndoEntries": self.estimatedUndoEntries,
+                            "nodes": self._node_count()})
+        if isAction:
+            self.actions.append({"action": pName, "time": 0.0, "cmdsCalls": 0, "estimatedUndoEntries": 0, "nodes": 0,
+                                 "transaction": RibbonTransaction.Transaction.enabled, "stages": {}})
+
+    def _stop(self) -> None:
+        frame = self._stack.pop()
+        values = {"time": time.perf_counter() - frame["time"],
+                  "cmdsCalls": self.cmdsCalls - frame["cmdsCalls"],
+                  "estimatedUndoEntries": self.estimatedUndoEntries - frame["estimatedUndoEntries"],
+                  "nodes": self._node_count() - frame["nodes"]}
+        if frame["action"]:
+            self.actions[-1].update(values)
+            return
+        self._add(self.stages, frame["name"], values)
+        if self.actions and any(f["action"] for f in self._stack):
+            self._add(self.actions[-1]["stages"], frame["name"], values)
+
+    @staticmethod
+    def _add(pStages: dict, pName: str, pValues: dict) -> None:
+        stage = pStages.setdefault(pName, {"count": 0, "time": 0.0, "cmdsCalls": 0, "estimatedUndoEntries": 0,
+                                           "nodes": 0})
+        stage["count"] += 1
+        for key, value in pValues.items():
+            stage[key] += value
+
+    # --------------------------------------------------------
+    # ---------------------- REPORT --------------------------
+    # --------------------------------------------------------
+    def report(self) -> dict:
+        return {"actions": self.actions, "stages": self.stages, "transactions": self.compare_transactions()}
+
+    def compare_transactions(self) -> Dict[str, dict]:
+        """
+        :return: by action, the average time and estimated undo entries with and without transaction, and the time
+        saved, for the actions recorded both ways.
+        """
+        averages = {}
+        for action in self.actions:
+            values = averages.setdefault(action["action"], {}).setdefault(action["transaction"], [0, 0.0, 0])
+            values[0] += 1
+            values[1] += action["time"]
+            values[2] += action["estimatedUndoEntries"]
+        comparison = {}
+        for name, byState in averages.items():
+            if len(byState) < 2:
+                continue
+            (onCount, onTime, onUndo), (offCount, offTime, offUndo) = byState[True], byState[False]
+            comparison[name] = {"time": onTime / onCount, "timeWithout": offTime / offCount,
+                                "timeSaved": offTime / offCount - onTime / onCount,
+                                "estimatedUndoEntries": onUndo / onCount,
+                                "estimatedUndoEntriesWithout": offUndo / offCount}
+        return comparison
+
+    def dump(self, pPath: str) -> None:
+        with open(pPath, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=4)
+
+    def format_report(self, pLastActions: Optional[int] = 10) -> str:
+        """
+        :return: a readable report of the last actions and of the stages since the last reset.
+        """
+        lines = []
+        for action in self.actions[-pLastActions:] if pLastActions else self.actions:
+            transaction = "" if action["transaction"] else ", no transaction"
+            lines.append(f"{action['action']}: {action['time'] * 1000:.1f} ms, {action['cmdsCalls']} cmds calls, "
+                         f"{action['estimatedUndoEntries']} estimated undo entries, "
+                         f"{action['nodes']} nodes{transaction}")
+            for name, stage in action["stages"].items():
+                lines.append(f"    {name} x{stage['count']}: {stage['time'] * 1000:.1f} ms, "
+                             f"{stage['cmdsCalls']} cmds calls, {stage['nodes']} nodes")
+        if self.stages:
+            lines.append("")
+            lines.append("Stages (total):")
+            for name, stage in sorted(self.stages.items(), key=lambda item: -item[1]["time"]):
+                lines.append(f"    {name} x{stage['count']}: {stage['time'] * 1000:.1f} ms, "
+                             f"{stage['cmdsCalls']} cmds calls, {stage['nodes']} nodes")
+        comparison = self.compare_transactions()
+        if comparison:
+            lines.append("")
+            lines.append("Transactions (average with / without):")
+            for name, values in comparison.items():
+                lines.append(f"    {name}: {values['time'] * 1000:.1f} / {values['timeWithout'] * 1000:.1f} ms, "
+                             f"{values['timeSaved'] * 1000:.1f} ms saved, "
+                             f"{values['estimatedUndoEntries']:.0f} / {values['estimatedUndoEntriesWithout']:.0f} "
+                             f"estimated undo entries")
+        return "\n".join(lines)
+
+
+profiler = Profiler()
@@ -0,0 +1,91 @@
+"""
+Lightweight preview of a ribbon: two curves whose CVs are displayed as points, one on each main follicle and one on
+each roll follicle of the ribbon to build. Their positions are computed from the isoparms, along the ribbon or along
+the joints it is aligned to, so moving a slider only rewrites two curves, whatever the number of joints.
+
+    proxy = create("arm")
+    update(proxy, 10, (0, 0.5, 1), (0.25, 0.75))
+    delete(proxy)
+
+The nurb, its follicles, joints and skin are only built by RibbonOperations.build_ribbon, which deletes the proxy.
+"""
+import bisect
+import math
+from dataclasses import dataclass
+from typing import List, Optional
+
+import maya.cmds as cmds
+
+from RibbonCreatorTool.RibbonCreatorLazy import LazyModule
+
+# False without NumPy, iso_points falls back to plain Python
+RibbonGeo = LazyModule("RibbonCreatorTool.RibbonCreatorGeometry", pOptional=True)
+
+COLORS = {"main": 18, "roll": 17}  # CYAN like the main follicles, YELLOW like the control joints
+
+
+@dataclass
+class ProxyCurves:
+    group: str
+    main: str
+    roll: str
+
+
+def iso_points(pPositions: List[List[float]], pIsoPos) -> List[List[float]]:
+    """
+    :param pPositions: points of the polyline the ribbon follows, like [[0, 0, 0], [10, 0, 0]]
+    :param pIsoPos: isoparms between 0 and 1.
+    :return: the position at each isoparm, see RibbonCreatorGeometry.polyline_points
+    """
+    if RibbonGeo:
+        return RibbonGeo.polyline_points(pPositions, pIsoPos).tolist()
+    lengths = [0.0]
+    for start, end in zip(pPositions, pPositions[1:]):
+        lengths.append(lengths[-1] + math.dist(start, end))
+    points = []
+    for iso in pIsoPos:
+        length = iso * lengths[-1]
+        i = min(max(bisect.bisect_left(lengths, length), 1), len(lengths) - 1)
+        span = lengths[i] - lengths[i - 1]
+        ratio = (length - lengths[i - 1]) / span if span else 0
+        points.append([a + (b - a) * ratio for a, b in zip(pPositions[i - 1], pPositions[i])])
+    return points
+
+
+def create(pName: str) -> ProxyCurves:
+    """
+    Creates the group "<pName>_proxy" and its two curves, with placeholder points until update is called.
+    """
+    group = cmds.group(name=f"{pName}_proxy", empty=True)
+    curves = []
+    for kind, color in COLORS.items():
+        curve = cmds.curve(name=f"{pName}_proxy_{kind}", degree=1, point=[(0, 0, 0), (1, 0, 0)])
+        curve = cmds.parent(curve, group)[0]
+        cmds.setAttr(f"{cmds.listRelatives(curve, shapes=True)[0]}.dispCV", True)
+        cmds.setAttr(f"{curve}.overrideEnabled", True)
+        cmds.setAttr(f"{curve}.overrideColor", color)
+        curves.append(curve)
+    return ProxyCurves(group, *curves)
+
+
+def update(pProxy: ProxyCurves, pLength: float, pMainIsoPos, pRollIsoPos,
+           pChain: Optional[List[List[float]]] = None) -> None:
+    """
+    Moves the points of pProxy on the follicles of the ribbon.
+    :param pMainIsoPos: the main isoparms, with the bounds 0 and 1.
+    :param pChain: the positions of the joints the ribbon is aligned to, None for a ribbon along X from 0 to pLength.
+    """
+    polyline = pChain or [[0, 0, 0], [pLength, 0, 0]]
+    for curve, isoPos in ((pProxy.main, pMainIsoPos), (pProxy.roll, pRollIsoPos)):
+        cmds.setAttr(f"{curve}.visibility", bool(isoPos))
+        if isoPos:
+            points = iso_points(polyline, isoPos)
+            cmds.curve(curve, replace=True, degree=1, point=points if len(points) > 1 else points * 2)
+
+
+def delete(pProxy: ProxyCurves) -> None:
+    cmds.delete(cmds.ls(pProxy.group))
+
+
+def exists(pProxy: ProxyCurves) -> bool:
+    return bool(cmds.ls(pProxy.group))
@@ -0,0 +1,125 @@
+"""
+Registry of the nodes created for each ribbon, to find them without walking the history of the ribbon.
+
+Nodes are stored by ribbon and by role (like "makeNurbPlane", "mainKnot", "skinCluster") as MObjectHandles,
+so they are still found after being renamed. A node-removed callback forgets deleted nodes, and the registry is
+emptied on undo and redo, which bring back nodes it doesn't know of: the ribbons are no longer tracked, so their nodes
+are looked for in their history again.
+When the OpenMaya API is not available, names are stored instead and validated with cmds.objExists.
+"""
+from typing import Dict, Optional
+
+import maya.cmds as cmds
+
+try:
+    import maya.api.OpenMaya as om
+except ImportError:
+    om = None
+
+
+class NodeRegistry:
+    def __init__(self):
+        self._nodes: Dict[str, Dict[str, object]] = {}  # ribbon -> role -> handle
+        self._roles: Dict[int, tuple] = {}  # hash code of a handle -> (ribbon, role)
+        self._callbackIds = []
+
+    # --------------------------------------------------------
+    # ---------------------- HANDLES -------------------------
+    # --------------------------------------------------------
+    @staticmethod
+    def _make_handle(pNode: str):
+        if om is None:
+            return pNode
+        selection = om.MSelectionList()
+        selection.add(pNode)
+        return om.MObjectHandle(selection.getDependNode(0))
+
+    @staticmethod
+    def _name(pHandle) -> Optional[str]:
+        """
+        :return: the current name of the node of pHandle, or None if it has been deleted.
+        """
+        if isinstance(pHandle, str):
+            return pHandle if cmds.objExists(pHandle) else None
+        if not pHandle.isValid():
+            return None
+        node = pHandle.object()
+        if node.hasFn(om.MFn.kDagNode):
+            return om.MFnDagNode(node).partialPathName()
+        return om.MFnDependencyNode(node).name()
+
+    def _on_node_removed(self, pNode, *args) -> None:
+        key = self._roles.pop(om.MObjectHandle(pNode).hashCode(), None)
+        if key:
+            ribbon, role = key
+            self._nodes.get(ribbon, {}).pop(role, None)
+
+    def _on_undo_redo(self, *args) -> None:
+        self._nodes.clear()
+        self._roles.clear()
+
+    def _ensure_callbacks(self) -> None:
+        if om is None or self._callbackIds:
+            return
+        self._callbackIds = [
+            om.MDGMessage.addNodeRemovedCallback(self._on_node_removed, "dependNode"),
+            om.MEventMessage.addEventCallback("Undo", self._on_undo_redo),
+            om.MEventMessage.addEventCallback("Redo", self._on_undo_redo),
+        ]
+
+    def remove_callbacks(self) -> None:
+        if self._callbackIds:
+            om.MMessage.removeCallbacks(self._callbackIds)
+        self._callbackIds = []
+
+    # --------------------------------------------------------
+    # ---------------------- REGISTRY ------------------------
+    # --------------------------------------------------------
+    def is_tracked(self, pRibbon: str) -> bool:
+        """
+        :return: True if the nodes of pRibbon are registered, so a role missing from the registry doesn't exist.
+        The registry is emptied on undo and redo.
+        """
+        return pRibbon in self._nodes
+
+    def track(self, pRibbon: str) -> None:
+        self._nodes.setdefault(pRibbon, {})
+
+    def register(self, pRibbon: str, pRole: str, pNode: str) -> None:
+        if not pNode:
+            return
+        self._ensure_callbacks()
+        handle = self._make_handle(pNode)
+        self.track(pRibbon)
+        self._nodes[pRibbon][pRole] = handle
+        if not isinstance(handle, str):
+            self._roles[handle.hashCode()] = (pRibbon, pRole)
+
+    def get(self, pRibbon: str, pRole: str) -> Optional[str]:
+        """
+        :return: the name of the node of pRibbon registered as pRole, or None.
+        """
+        handle = self._nodes.get(pRibbon, {}).get(pRole)
+        if handle is None:
+            return None
+        name = self._name(handle)
+        if name is None:
+            self.unregister(pRibbon, pRole)
+        return name
+
+    def unregister(self, pRibbon: str, pRole: Optional[str] = None) -> None:
+        """
+        Forgets the node registered as pRole for pRibbon, or every node of pRibbon if pRole is None.
+        """
+        roles = self._nodes.get(pRibbon, {})
+        handles = [roles.pop(pRole, None)] if pRole else list(roles.values())
+        for handle in handles:
+            if handle is not None and not isinstance(handle, str):
+                self._roles.pop(handle.hashCode(), None)
+        if pRole is None:
+            self._nodes.pop(pRibbon, None)
+
+    def clear(self) -> None:
+        self._nodes.clear()
+        self._roles.clear()
+        self.remove_callbacks()
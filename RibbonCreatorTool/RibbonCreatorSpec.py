@@ -0,0 +1,80 @@
+"""
+Description of a ribbon as plain data, so it can be built without the interface (batch, farm, scripts).
+
+A spec is stored as JSON with the same keys as the fields of RibbonSpec, every key being optional:
+{"name": "arm_L", "mainJointCount": 4, "rollJointCount": 2, "joints": ["shoulder_L", "elbow_L", "wrist_L"]}
+"""
+import json
+from dataclasses import dataclass, field, fields, asdict
+from typing import List, Tuple
+
+DEFORMERS = ("sine", "twist", "flare", "bend")
+SCALE_MODES = ("perIso", "global", "none")  # values of RibbonCreatorOperations.ScaleMode
+
+
+@dataclass
+class RibbonSpec:
+    name: str = "Ribbon1"
+    forwardVector: List[int] = field(default_factory=lambda: [1, 0, 0])
+    upVector: List[int] = field(default_factory=lambda: [0, 1, 0])
+    length: float = 10
+    mainJointCount: int = 3
+    rollJointCount: int = 2
+    controlJoints: bool = True
+    chain: bool = False
+    skin: bool = True
+    pinch: bool = False
+    deformers: List[str] = field(default_factory=list)  # any of DEFORMERS
+    deleteHistory: bool = False
+    scaleMode: str = "perIso"  # any of SCALE_MODES
+    joints: List[str] = field(default_factory=list)  # joints to align the ribbon to, like a selection in the interface
+    sharedDeformers: bool = False  # stack the deformers on one surface instead of one surface per deformer
+
+    def __post_init__(self):
+        unknown = set(self.deformers) - set(DEFORMERS)
+        if unknown:
+            raise ValueError(f"Unknown deformers {sorted(unknown)} in ribbon '{self.name}', use {DEFORMERS}")
+        if self.scaleMode not in SCALE_MODES:
+            raise ValueError(f"Unknown scale mode '{self.scaleMode}' in ribbon '{self.name}', use {SCALE_MODES}")
+
+    @classmethod
+    def from_dict(cls, pData: dict) -> "RibbonSpec":
+        names = {f.name for f in fields(cls)}
+        unknown = set(pData) - names
+        if unknown:
+            raise ValueError(f"Unknown keys {sorted(unknown)} in ribbon spec, use {sorted(names)}")
+        return cls(**pData)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def previs_args(self) -> Tuple:
+        """
+        :return: the positional arguments of RibbonOperations.previs_ribbon and RibbonOperations.build_ribbon.
+        """
+        return (self.name, list(self.forwardVector), list(self.upVector), self.length, self.mainJointCount,
+                self.rollJointCount, self.controlJoints, self.chain, self.skin)
+
+    def build_kwargs(self) -> dict:
+        """
+        :return: the keyword arguments of RibbonOperations.build_ribbon.
+        """
+        kwargs = {deformer: deformer in self.deformers for deformer in DEFORMERS}
+        kwargs["pPinch"] = self.pinch
+        kwargs["pSharedDeformers"] = self.sharedDeformers
+        return kwargs
+
+
+def load_specs(pPath: str) -> List[RibbonSpec]:
+    """
+    :param pPath: a JSON file containing one spec or a list of specs.
+    """
+    with open(pPath, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return specs_from_data(data)
+
+
+def specs_from_data(pData) -> List[RibbonSpec]:
+    if isinstance(pData, dict):
+        pData = [pData]
+    return [RibbonSpec.from_dict(d) for d in pData]
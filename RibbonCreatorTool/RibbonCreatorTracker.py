@@ -0,0 +1,119 @@
+"""
+Tracks the changes of the selection and of the scene through Maya callbacks, so the interface only queries the
+scene when something changed since its last check, instead of each time the mouse enters the window.
+
+The callbacks only raise flags, the work is done when the interface polls them. Nodes created, deleted or renamed by
+the tool itself, inside a Transaction, don't raise the scene flag: the interface already knows about them.
+When the OpenMaya API is not available, every poll reports a change, like without tracking.
+"""
+from typing import List
+
+from RibbonCreatorTool.RibbonCreatorTransaction import Transaction
+
+try:
+    import maya.api.OpenMaya as om
+except ImportError:
+    om = None
+
+
+class SceneTracker:
+    def __init__(self):
+        self.selectionChanged = True
+        self.sceneChanged = True
+        self.watchedChanged = True
+        self.selection: List[str] = []  # last selection read by the interface
+        self._callbackIds = []
+        self._watchedIds = []
+
+    # --------------------------------------------------------
+    # ---------------------- CALLBACKS -----------------------
+    # --------------------------------------------------------
+    def start(self) -> None:
+        self.stop()
+        self.selectionChanged = self.sceneChanged = self.watchedChanged = True
+        if om is None:
+            return
+        self._callbackIds = [
+            om.MEventMessage.addEventCallback("SelectionChanged", self._on_selection_changed),
+            om.MEventMessage.addEventCallback("NameChanged", self._on_scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, self._on_scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, self._on_scene_changed),
+            om.MDGMessage.addNodeAddedCallback(self._on_scene_changed, "dagNode"),
+            om.MDGMessage.addNodeRemovedCallback(self._on_scene_changed, "dagNode"),
+        ]
+
+    def stop(self) -> None:
+        self.unwatch()
+        if self._callbackIds:
+            om.MMessage.removeCallbacks(self._callbackIds)
+        self._callbackIds = []
+
+    def watch(self, pNodes: List[str]) -> None:
+        """
+        Flags the changes of the attributes of pNodes, like the selected joints being moved.
+        """
+        self.unwatch()
+        if om is None:
+            return
+        selection = om.MSelectionList()
+        for node in pNodes:
+            try:
+                selection.add(node)
+            except RuntimeError:  # deleted or ambiguous name, its change is flagged by the scene callbacks
+                continue
+        for i in range(selection.length()):
+            self._watchedIds.append(om.MNodeMessage.addAttributeChangedCallback(selection.getDependNode(i),
+                                                                                self._on_watched_changed))
+
+    def unwatch(self) -> None:
+        if self._watchedIds:
+            om.MMessage.removeCallbacks(self._watchedIds)
+        self._watchedIds = []
+
+    def _on_selection_changed(self, *args) -> None:
+        self.selectionChanged = True
+
+    def _on_scene_changed(self, *args) -> None:
+        if not Transaction.depth:
+            self.sceneChanged = True
+
+    def _on_watched_changed(self, *args) -> None:
+        self.watchedChanged = True
+
+    # --------------------------------------------------------
+    # ---------------------- POLL ----------------------------
+    # --------------------------------------------------------
+    def poll_selection(self) -> bool:
+        """
+        :return: True if the selection changed since the last poll.
+        """
+        changed = self.selectionChanged or om is None
+        self.selectionChanged = False
+        return changed
+
+    def poll_scene(self) -> bool:
+        """
+        :return: True if nodes were created, deleted or renamed, or a scene was opened, since the last poll.
+        """
+        changed = self.sceneChanged or om is None
+        self.sceneChanged = False
+        return changed
+
+    def poll_watched(self) -> bool:
+        """
+        :return: True if an attribute of the watched nodes changed since the last poll.
+        """
+        changed = self.watchedChanged or om is None
+        self.watchedChanged = False
+        return changed
+
+    def update_selection(self, pSelection: List[str]) -> bool:
+        """
+        Stores pSelection and watches its nodes.
+        :return: True if pSelection is different from the last selection stored.
+        """
+        if pSelection == self.selection:
+            return False
+        self.selection = list(pSelection)
+        self.watch(self.selection)
+        return True
@@ -0,0 +1,78 @@
+"""
+Groups the maya.cmds calls of a user action: they are recorded as a single undo chunk, and the viewport is not
+refreshed until the action is done. The previous undo and refresh states are restored even if the action raises.
+
+Transactions can be nested, only the outermost one opens the chunk and suspends the refresh:
+
+    with Transaction("Ribbon preview"):
+        ...
+
+    @transaction
+    def update_length(self, pLength):
+        ...
+"""
+import functools
+
+import maya.cmds as cmds
+
+
+class Transaction:
+    enabled = True  # switched off to compare with the behavior of one undo entry and one refresh per command
+    depth = 0  # number of transactions currently open, the SceneTracker ignores the nodes changed while it isn't 0
+
+    def __init__(self, pName: str = "Ribbon Creator"):
+        self.name = pName
+        self.active = False
+        self.undoChunk = False
+        self.refreshSuspended = False
+
+    def __enter__(self) -> "Transaction":
+        if not self.enabled:
+            return self
+        self.active = True
+        Transaction.depth += 1
+        if Transaction.depth > 1:
+            return self
+        try:
+            if cmds.undoInfo(query=True, state=True):
+                cmds.undoInfo(openChunk=True, chunkName=self.name)
+                self.undoChunk = True
+            if not cmds.refresh(query=True, suspend=True):
+                cmds.refresh(suspend=True)
+                self.refreshSuspended = True
+        except Exception:
+            self._restore()
+            raise
+        return self
+
+    def __exit__(self, pType, pValue, pTraceback) -> bool:
+        if self.active:
+            self._restore()
+        return False  # exceptions are propagated
+
+    def _restore(self) -> None:
+        self.active = False
+        Transaction.depth -= 1
+        if Transaction.depth > 0:
+            return
+        try:
+            if self.refreshSuspended:
+                cmds.refresh(suspend=False)
+        finally:
+            if self.undoChunk:
+                cmds.undoInfo(closeChunk=True)
+            self.refreshSuspended = self.undoChunk = False
+
+
+def transaction(pFunction):
+    """
+    Decorator running pFunction in a Transaction named after it.
+    """
+    name = f"Ribbon Creator: {pFunction.__name__}"
+
+    @functools.wraps(pFunction)
+    def wrapper(*args, **kwargs):
+        with Transaction(name):
+            return pFunction(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,103 @@
+"""
+Compares the playback time of ribbons pinned with one uvPin per follicle against one shared uvPin per follicle group,
+or with --deformers, of ribbons with one nurb per deformer against every deformer stacked on one shared nurb.
+It needs Maya, run it with mayapy:
+
+    mayapy benchmarks/bench_playback.py --main 10 --roll 10 --frames 200
+    mayapy benchmarks/bench_playback.py --deformers
+
+For each setup, a ribbon is built in a new scene, its control joints (and deformers) are animated, and the frames are
+evaluated one by one. The DG node count, the heap memory and the evaluated frames per second are reported.
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+
+# attribute of each nonLinear deformer animated by --deformers
+DEFORMER_ATTRS = {"sine": "amplitude", "twist": "endAngle", "flare": "curve", "bend": "curvature"}
+
+
+def build_animated_ribbon(pMethod, pMain: int, pRoll: int, pFrames: int, pSharedDeformers: bool = None):
+    """
+    :param pSharedDeformers: None builds no deformer, else every deformer, on one shared nurb if True.
+    """
+    import maya.cmds as cmds
+    import RibbonCreatorTool.RibbonCreatorOperations as RibbonGenOp
+
+    cmds.file(new=True, force=True)
+    RibbonGenOp.RibbonOperations.pinMethod = pMethod
+    rop = RibbonGenOp.RibbonOperations()
+    args = ("Ribbon1", [1, 0, 0], [0, 1, 0], 10, pMain, pRoll, True, False, True)
+    rop.previs_ribbon(*args, False, False)
+    for i, joint in enumerate(rop.controlJointsMain):
+        for frame, value in ((1, 0), (pFrames // 2, 2 if i % 2 else -2), (pFrames, 0)):
+            cmds.setKeyframe(joint, attribute="translateY", time=frame, value=value)
+            cmds.setKeyframe(joint, attribute="rotateX", time=frame, value=value * 20)
+    if pSharedDeformers is not None:
+        rop.build_ribbon(*args, pPinch=False, pSharedDeformers=pSharedDeformers,
+                         **{deformer: True for deformer in DEFORMER_ATTRS})
+        for deformer, attr in DEFORMER_ATTRS.items():
+            handle = rop.nodeRegistry.get("Ribbon1", f"{deformer}Handle")
+            node = cmds.listConnections(f"{handle}.specifiedManipLocation", destination=False, source=True)[0]
+            for frame, value in ((1, 0), (pFrames // 2, 0.5), (pFrames, 0)):
+                cmds.setKeyframe(node, attribute=attr, time=frame, value=value)
+    cmds.playbackOptions(minTime=1, maxTime=pFrames)
+    return rop
+
+
+def time_playback(pFrames: int) -> float:
+    """
+    Pulls the world matrix of every skin joint at each frame, like a deformer reading them would.
+    :return: the evaluated frames per second.
+    """
+    import maya.cmds as cmds
+    plugs = [f"{joint}.worldMatrix[0]" for joint in cmds.ls("jnt_skin_Ribbon1_*", type="joint")]
+    cmds.currentTime(1)
+    start = time.perf_counter()
+    for frame in range(1, pFrames + 1):
+        cmds.currentTime(frame, update=True)
+        for plug in plugs:
+            cmds.getAttr(plug)
+    return pFrames / (time.perf_counter() - start)
+
+
+def main(pArgs=None) -> int:
+    parser = argparse.ArgumentParser(description="Playback time of per-follicle against shared uvPin, "
+                                                 "or of per-deformer against shared deformer nurbs.")
+    parser.add_argument("--main", type=int, default=10, help="Number of main joints.")
+    parser.add_argument("--roll", type=int, default=10, help="Number of roll joints per segment.")
+    parser.add_argument("--frames", type=int, default=200, help="Number of frames evaluated.")
+    parser.add_argument("--evaluation", default="parallel", choices=("off", "serial", "parallel"),
+                        help="Evaluation manager mode.")
+    parser.add_argument("--deformers", action="store_true",
+                        help="Compares one nurb per deformer against one shared nurb, instead of the pin methods.")
+    args = parser.parse_args(pArgs)
+
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    import maya.cmds as cmds
+    import RibbonCreatorTool.RibbonCreatorOperations as RibbonGenOp
+
+    if args.deformers:
+        setups = [("deformers", RibbonGenOp.MethodName.sharedUvPin, False),
+                  ("sharedDeformers", RibbonGenOp.MethodName.sharedUvPin, True)]
+    else:
+        setups = [(method.value, method, None)
+                  for method in (RibbonGenOp.MethodName.uvPin, RibbonGenOp.MethodName.sharedUvPin)]
+    print(f"{'setup':<18}{'nodes':>8}{'uvPins':>8}{'nurbs':>8}{'heap (MB)':>12}{'fps':>10}")
+    for name, method, shared in setups:
+        build_animated_ribbon(method, args.main, args.roll, args.frames, shared)
+        cmds.evaluationManager(mode=args.evaluation)
+        fps = time_playback(args.frames)
+        print(f"{name:<18}{len(cmds.ls()):>8}{len(cmds.ls(type='uvPin')):>8}{len(cmds.ls(type='nurbsSurface')):>8}"
+              f"{cmds.memory(heapMemory=True, megaByte=True):>12.1f}{fps:>10.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Benchmarks RibbonOperations against the in-memory maya.cmds stand-in (fake_maya), so it runs with plain Python.
+
+Each scenario builds a preview, changes the main joints, the roll joints and the length, then builds the ribbon and
+edits its roll joints again, like the bulk editor does. Previews are proxies (RibbonCreatorProxy), except in the
+"_fullPreview" scenarios which build the whole rig from the preview on. The chains scenarios build one ribbon per joint chain with
+RibbonCreatorChains, their cmds calls per ribbon must stay the same whatever the number of chains.
+The number of maya.cmds calls of each step is compared to thresholds.json: the script exits with 1 if a step makes
+more calls than its threshold. Python time is reported but not checked, as it depends on the machine.
+
+    python benchmarks/bench_ribbon.py                 # run and check
+    python benchmarks/bench_ribbon.py --update        # write the current counts as thresholds
+    python benchmarks/bench_ribbon.py --json out.json
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import fake_maya  # noqa: E402
+
+cmds = fake_maya.install()
+
+import RibbonCreatorTool.RibbonCreatorChains as RibbonChains  # noqa: E402
+import RibbonCreatorTool.RibbonCreatorOperations as RibbonGenOp  # noqa: E402
+from RibbonCreatorTool.RibbonCreatorSpec import RibbonSpec  # noqa: E402
+
+THRESHOLDS_PATH = os.path.join(BENCH_DIR, "thresholds.json")
+TOLERANCE = 1.05  # thresholds written by --update leave 5% of margin
+
+MAIN_JOINTS = (2, 4, 8)
+ROLL_JOINTS = (0, 2, 4)
+PINCH = (False, True)
+DEFORMERS = ((), ("sine", "twist", "flare", "bend"))
+SHARED_DEFORMERS = (False, True)  # one nurb per deformer, or every deformer stacked on one nurb
+FULL_PREVIEW = (False, True)  # preview with a proxy, or with the whole rig
+CHAINS = (1, 10, 40)  # number of joint chains built at once
+CHAIN_JOINTS = 5
+
+
+def scenario_name(pMain: int, pRoll: int, pPinch: bool, pDeformers: tuple, pShared: bool = False,
+                  pFullPreview: bool = False) -> str:
+    deformers = ("_sharedDeformers" if pShared else "_deformers") if pDeformers else ""
+    return f"main{pMain}_roll{pRoll}{'_pinch' if pPinch else ''}{deformers}{'_fullPreview' if pFullPreview else ''}"
+
+
+def measure(pResults: Dict[str, dict], pStep: str, pFunction, *args, **kwargs) -> None:
+    calls, undoEntries = cmds.call_count, cmds.undoEntries
+    start = time.perf_counter()
+    pFunction(*args, **kwargs)
+    pResults[pStep] = {"cmdsCalls": cmds.call_count - calls, "undoEntries": cmds.undoEntries - undoEntries,
+                       "time": time.perf_counter() - start}
+
+
+def run_scenario(pMain: int, pRoll: int, pPinch: bool, pDeformers: tuple, pShared: bool = False,
+                 pFullPreview: bool = False) -> Dict[str, dict]:
+    cmds.reset()
+    RibbonGenOp.RibbonOperations.nodeRegistry.clear()
+    RibbonGenOp.RibbonOperations.proxyPreview = not pFullPreview
+    rop = RibbonGenOp.RibbonOperations()
+    args = ("Ribbon1", [1, 0, 0], [0, 1, 0])
+    results = {}
+    measure(results, "previs", rop.previs_ribbon, *args, 10, pMain, pRoll, True, False, True, pPinch, False)
+    measure(results, "updateMain", rop.update_main_iso, pMain + 1, pRoll, True, False, True, pPinch)
+    measure(results, "updateRoll", rop.update_roll_iso, pRoll + 1, False, True, True)
+    measure(results, "updateLength", rop.update_length, 12)
+    deformers = {d: d in pDeformers for d in ("sine", "twist", "flare", "bend")}
+    measure(results, "build", rop.build_ribbon, *args, 12, pMain + 1, pRoll + 1, True, False, True, pPinch=pPinch,
+            pSharedDeformers=pShared, **deformers)
+    measure(results, "edit", rop.edit_ribbon, "Ribbon1", {"rollJointCount": pRoll + 2})
+    results["total"] = {"cmdsCalls": sum(r["cmdsCalls"] for r in results.values()),
+                        "undoEntries": sum(r["undoEntries"] for r in results.values()),
+                        "time": sum(r["time"] for r in results.values()),
+                        "nodes": len(cmds.nodes)}
+    RibbonGenOp.RibbonOperations.proxyPreview = True
+    return results
+
+
+def run_chains(pCount: int) -> Dict[str, dict]:
+    cmds.reset()
+    RibbonGenOp.RibbonOperations.nodeRegistry.clear()
+    roots = []
+    for i in range(pCount):
+        cmds.select(clear=True)
+        roots.append([cmds.joint(name=f"strand{i}_{j}", position=(j * 2, 0, i)) for j in range(CHAIN_JOINTS)][0])
+    cmds.select(roots)
+    results = {}
+    chains = []
+    measure(results, "findChains", lambda: chains.extend(RibbonChains.find_chains(cmds.ls(selection=True))))
+    measure(results, "buildChains", RibbonChains.build_chains, chains, RibbonSpec(name="strand1"))
+    results["total"] = {"cmdsCalls": sum(r["cmdsCalls"] for r in results.values()),
+                        "undoEntries": sum(r["undoEntries"] for r in results.values()),
+                        "time": sum(r["time"] for r in results.values()),
+                        "nodes": len(cmds.nodes), "perRibbon": results["buildChains"]["cmdsCalls"] / pCount}
+    return results
+
+
+def run_all() -> Dict[str, Dict[str, dict]]:
+    results = {}
+    for main, roll, pinch, deformers, shared, full in itertools.product(MAIN_JOINTS, ROLL_JOINTS, PINCH, DEFORMERS,
+                                                                        SHARED_DEFORMERS, FULL_PREVIEW):
+        if (shared and not deformers) or (full and (pinch or deformers)):
+            continue
+        results[scenario_name(main, roll, pinch, deformers, shared, full)] = run_scenario(main, roll, pinch,
+                                                                                          deformers, shared, full)
+    for count in CHAINS:
+        results[f"chains{count}"] = run_chains(count)
+    return results
+
+
+def check(pResults: Dict[str, Dict[str, dict]], pThresholds: Dict[str, Dict[str, int]]) -> List[str]:
+    """
+    :return: a message for each step making more cmds calls than its threshold.
+    """
+    regressions = []
+    for scenario, steps in pResults.items():
+        for step, result in steps.items():
+            threshold = pThresholds.get(scenario, {}).get(step)
+            if threshold is not None and result["cmdsCalls"] > threshold:
+                regressions.append(f"{scenario}.{step}: {result['cmdsCalls']} cmds calls > {threshold}")
+    return regressions
+
+
+def print_results(pResults: Dict[str, Dict[str, dict]]) -> None:
+    steps = []
+    for scenario, results in pResults.items():
+        if list(results) != steps:  # a table per set of steps
+            steps = list(results)
+            print(f"{'scenario':<32}" + "".join(f"{step:>14}" for step in steps) + f"{'time (ms)':>12}")
+        print(f"{scenario:<32}" + "".join(f"{results[step]['cmdsCalls']:>14}" for step in steps)
+              + f"{results['total']['time'] * 1000:>12.1f}")
+
+
+def main(pArgs=None) -> int:
+    parser = argparse.ArgumentParser(description="Counts maya.cmds calls of RibbonOperations per scenario.")
+    parser.add_argument("--update", action="store_true", help="Writes the current counts to thresholds.json.")
+    parser.add_argument("--json", help="Writes the results to this file.")
+    args = parser.parse_args(pArgs)
+
+    results = run_all()
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    if args.update:
+        thresholds = {scenario: {step: int(r["cmdsCalls"] * TOLERANCE) for step, r in steps.items()}
+                      for scenario, steps in results.items()}
+        with open(THRESHOLDS_PATH, "w", encoding="utf-8") as f:
+            json.dump(thresholds, f, indent=4)
+        print(f"Thresholds written to {THRESHOLDS_PATH}")
+        return 0
+    if not os.path.exists(THRESHOLDS_PATH):
+        print("No thresholds.json, run with --update to create it.")
+        return 0
+    with open(THRESHOLDS_PATH, "r", encoding="utf-8") as f:
+        regressions = check(results, json.load(f))
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Measures how long the window of the tool takes to open. It needs Maya and Qt, run it with mayapy:
+
+    mayapy benchmarks/bench_startup.py
+    mayapy benchmarks/bench_startup.py --runs 5
+
+Each run reports the import of RibbonCreator, a show_ui building the window with QUiLoader, a show_ui building it
+from the precompiled form, and a show_ui showing the window hidden by the previous close, like a second click on the
+shelf button. The cached form of RibbonCreator.ui is removed first, then compiled again by the run.
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+
+def open_window(pRibbonUI, pApp) -> dict:
+    """
+    :return: the startupTimes of a show_ui, in milliseconds.
+    """
+    pRibbonUI.show_ui()
+    pApp.processEvents()
+    return {key: value * 1000 if isinstance(value, float) else value
+            for key, value in pRibbonUI.startupTimes.items()}
+
+
+def destroy_window(pRibbonUI, pApp) -> None:
+    ui = pRibbonUI.RibbonInterface.instance()
+    ui.close()
+    pRibbonUI.RibbonInterface.delete_instance()
+    ui.deleteLater()
+    pApp.processEvents()
+
+
+def main(pArgs=None) -> int:
+    parser = argparse.ArgumentParser(description="Time to open the window of the tool, cold and reused.")
+    parser.add_argument("--runs", type=int, default=3, help="Number of runs.")
+    args = parser.parse_args(pArgs)
+
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    try:
+        from PySide2 import QtWidgets
+    except ModuleNotFoundError:
+        from PySide6 import QtWidgets
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    start = time.perf_counter()
+    import RibbonCreatorTool.RibbonCreator as RibbonUI
+    importTime = (time.perf_counter() - start) * 1000
+    import RibbonCreatorTool.RibbonCreatorForm as RibbonForm
+
+    print(f"import RibbonCreator: {importTime:.1f} ms")
+    print(f"{'run':<6}{'path':<18}{'total (ms)':>12}{'form (ms)':>12}{'window (ms)':>12}")
+    for run in range(args.runs):
+        formPath = RibbonForm.find_form(RibbonUI.uiPath)
+        if formPath:
+            os.remove(formPath)
+        rows = [("QUiLoader", open_window(RibbonUI, app))]
+        destroy_window(RibbonUI, app)
+        if not RibbonForm.compile_ui(RibbonUI.uiPath):
+            print("uic not found, the precompiled form can't be measured.")
+            return 1
+        rows.append(("precompiled form", open_window(RibbonUI, app)))
+        RibbonUI.RibbonInterface.instance().close()
+        rows.append(("reused", open_window(RibbonUI, app)))
+        destroy_window(RibbonUI, app)
+        for name, times in rows:
+            print(f"{run:<6}{name:<18}{times['total']:>12.1f}{times.get('form', 0):>12.1f}"
+                  f"{times.get('window', 0):>12.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,775 @@
+"""
+In-memory stand-in for ``maya.cmds``.
+
+It records every command issued and simulates enough of Maya's dependency graph (node creation, DAG parenting,
+connections, construction history, NURBS CV counts) for RibbonCreatorOperations to run outside of Maya.
+It does not evaluate geometry except for the few plugs the tool queries (locator translation, CV positions).
+
+Usage:
+    import fake_maya
+    cmds = fake_maya.install()
+    import RibbonCreatorTool.RibbonCreatorOperations
+"""
+import fnmatch
+import re
+import sys
+import types
+from collections import Counter
+from typing import Dict, List, Optional
+
+SHAPE_TYPES = {"nurbsSurface", "nurbsCurve", "locator", "mesh"}
+DAG_TYPES = SHAPE_TYPES | {"transform", "joint"}
+# nodes that are not returned by "cmds.ls(selection=True, type=...)" filtering on their parent type
+INHERITED_TYPES = {"joint": {"transform"}, "nurbsSurface": {"shape"}, "nurbsCurve": {"shape"}, "locator": {"shape"},
+                   "mesh": {"shape"}}
+# commands not recorded in the undo queue
+QUERY_COMMANDS = {"ls", "listRelatives", "listConnections", "listHistory", "objectType", "getAttr", "xform",
+                  "objExists", "attributeQuery", "internalVar", "about", "undoInfo", "refresh", "pluginInfo", "warning"}
+_elementRe = re.compile(r"^(.*)\[(\d+)\]$")
+
+
+class Node:
+    __slots__ = ("name", "type", "attrs", "parent")
+
+    def __init__(self, pName: str, pType: str):
+        self.name = pName
+        self.type = pType
+        self.attrs: Dict[str, object] = {}
+        self.parent: Optional[str] = None
+
+
+class Connections(dict):
+    """
+    Destination plug -> source plug, with the nodes upstream of each node indexed as the connections change,
+    so the history of a node is walked without scanning every connection.
+    """
+
+    def __init__(self, pItems=()):
+        super().__init__()
+        self.upstream: Dict[str, Counter] = {}  # node -> source node -> number of connections
+        for dst, src in dict(pItems).items():
+            self[dst] = src
+
+    def __setitem__(self, pDst: str, pSrc: str) -> None:
+        if pDst in self:
+            self._unindex(pDst, self[pDst])
+        super().__setitem__(pDst, pSrc)
+        self.upstream.setdefault(pDst.partition(".")[0], Counter())[pSrc.partition(".")[0]] += 1
+
+    def __delitem__(self, pDst: str) -> None:
+        self._unindex(pDst, self[pDst])
+        super().__delitem__(pDst)
+
+    def pop(self, pDst: str, *default):
+        if pDst in self:
+            self._unindex(pDst, self[pDst])
+        return super().pop(pDst, *default)
+
+    def _unindex(self, pDst: str, pSrc: str) -> None:
+        node, source = pDst.partition(".")[0], pSrc.partition(".")[0]
+        sources = self.upstream[node]
+        sources[source] -= 1
+        if not sources[source]:
+            del sources[source]
+        if not sources:
+            del self.upstream[node]
+
+
+class FakeCmds(types.ModuleType):
+    """
+    Module-like object exposing a subset of the maya.cmds API.
+    """
+
+    def __init__(self):
+        super().__init__("maya.cmds")
+        self.reset()
+
+    # --------------------------------------------------------
+    # ---------------------- BOOKKEEPING ---------------------
+    # --------------------------------------------------------
+    def reset(self) -> None:
+        self.nodes: Dict[str, Node] = {}
+        self.connections: Connections = Connections()
+        self.selection: List[str] = []
+        self.calls: Counter = Counter()
+        self.nodesCreated: int = 0
+        self.undoChunks: int = 0
+        self.undoEntries: int = 0
+        self._typeCounters: Counter = Counter()
+
+    def __getattribute__(self, item):
+        value = super().__getattribute__(item)
+        if item in FakeCmds._commands and sys._getframe(1).f_code.co_filename != __file__:
+            super().__getattribute__("calls")[item] += 1
+            if item not in QUERY_COMMANDS and not super().__getattribute__("_chunkDepth"):
+                self.undoEntries += 1
+        return value
+
+    _chunkDepth = 0
+
+    @property
+    def call_count(self) -> int:
+        return sum(self.calls.values())
+
+    def _unique(self, pName: str) -> str:
+        pName = str(pName).split("|")[-1]
+        if pName not in self.nodes:
+            return pName
+        match = re.match(r"^(.*?)(\d*)$", pName)
+        base = match.group(1)
+        number = int(match.group(2)) if match.group(2) else 0
+        while True:
+            number += 1
+            candidate = f"{base}{number}"
+            if candidate not in self.nodes:
+                return candidate
+
+    def _new(self, pType: str, pName: Optional[str] = None, pParent: Optional[str] = None) -> str:
+        if not pName:
+            self._typeCounters[pType] += 1
+            pName = f"{pType}{self._typeCounters[pType]}"
+        name = self._unique(pName)
+        node = Node(name, pType)
+        node.parent = pParent
+        self.nodes[name] = node
+        self.nodesCreated += 1
+        return name
+
+    @staticmethod
+    def _split(pPlug: str):
+        node, _, attr = pPlug.partition(".")
+        return node, attr
+
+    def _node(self, pName: str) -> Node:
+        name = pName.split("|")[-1].split(".")[0]
+        if name not in self.nodes:
+            raise ValueError(f"No object matches name: {pName}")
+        return self.nodes[name]
+
+    def _children(self, pName: str) -> List[str]:
+        return [n.name for n in self.nodes.values() if n.parent == pName]
+
+    def _descendants(self, pName: str) -> List[str]:
+        result = []
+        for child in self._children(pName):
+            result.append(child)
+            result.extend(self._descendants(child))
+        return result
+
+    def _shape_of(self, pName: str) -> str:
+        node = self._node(pName)
+        if node.type in SHAPE_TYPES:
+            return node.name
+        for child in self._children(node.name):
+            if self.nodes[child].type in SHAPE_TYPES:
+                return child
+        return node.name
+
+    def _source(self, pPlug: str) -> Optional[str]:
+        return self.connections.get(pPlug)
+
+    def _is_type(self, pNode: Node, pType) -> bool:
+        types_ = pType if isinstance(pType, (list, tuple)) else [pType]
+        for t in types_:
+            if pNode.type == t or t in INHERITED_TYPES.get(pNode.type, ()):
+                return True
+            if t == "dagNode" and pNode.type in DAG_TYPES:
+                return True
+        return False
+
+    # --------------------------------------------------------
+    # ---------------------- EVALUATION ----------------------
+    # --------------------------------------------------------
+    def _value(self, pPlug: str):
+        src = self._source(pPlug)
+        if src:
+            return self._evaluate(src)
+        node, attr = self._split(pPlug)
+        return self._node(node).attrs.get(attr, 0)
+
+    def _width(self, pSurface: str) -> float:
+        for n in self.listHistory(pSurface) or []:
+            if self.nodes[n].type == "makeNurbPlane":
+                return float(self._value(f"{n}.width") or 1)
+        return 1.0
+
+    def _evaluate(self, pPlug: str):
+        node, attr = self._split(pPlug)
+        nodeType = self._node(node).type
+        if nodeType == "decomposeMatrix" and attr.startswith("outputTranslate"):
+            matrix = self._value(f"{node}.inputMatrix")
+            return matrix if isinstance(matrix, list) else [0, 0, 0]
+        if nodeType == "uvPin" and attr.startswith("outputMatrix"):
+            index = int(_elementRe.match(attr).group(2))
+            u = float(self._value(f"{node}.coordinate[{index}].coordinateU") or 0)
+            surface = self._source(f"{node}.deformedGeometry")
+            width = self._width(self._split(surface)[0]) if surface else 1
+            return [u * width, 0, 0]
+        if nodeType == "ribbonSampler" and attr.startswith("outputMatrix"):
+            index = int(_elementRe.match(attr).group(2))
+            u = float(self._value(f"{node}.parameterU[{index}]") or 0)
+            surface = self._source(f"{node}.inputSurface")
+            width = self._width(self._split(surface)[0]) if surface else 1
+            return [u * width, 0, 0]
+        if nodeType == "fourByFourMatrix":
+            return [self._value(f"{node}.in30"), 0, 0]
+        if nodeType == "pointOnSurfaceInfo" and attr == "positionX":
+            surface = self._source(f"{node}.inputSurface")
+            width = self._width(self._split(surface)[0]) if surface else 1
+            return float(self._value(f"{node}.parameterU") or 0) * width
+        return self._node(node).attrs.get(attr, 0)
+
+    def _surface_cv_counts(self, pSurface: str):
+        shape = self._shape_of(pSurface)
+        degree = 3
+        extra = 0
+        for n in self.listHistory(shape) or []:
+            node = self.nodes[n]
+            if node.type == "makeNurbPlane":
+                degree = int(node.attrs.get("degree", 3))
+            elif node.type == "insertKnotSurface":
+                nbKnots = int(node.attrs.get("numberOfKnots[0]", 1))
+                extra += len(self._multi(node, "parameter")) * min(nbKnots, degree)
+        return degree + 1 + extra, degree + 1
+
+    @staticmethod
+    def _multi(pNode: Node, pAttr: str) -> Dict[int, object]:
+        result = {}
+        prefix = f"{pAttr}["
+        for key, value in pNode.attrs.items():
+            if key.startswith(prefix) and key.endswith("]") and key.count("[") == 1:
+                result[int(key[len(prefix):-1])] = value
+        return dict(sorted(result.items()))
+
+    # --------------------------------------------------------
+    # ---------------------- COMMANDS ------------------------
+    # --------------------------------------------------------
+    def ls(self, *args, selection=False, type=None, flatten=False, long=False, **kwargs):
+        if selection:
+            result = list(self.selection)
+        else:
+            patterns = []
+            for a in args:
+                patterns.extend(a if isinstance(a, (list, tuple)) else [a])
+            if not args:
+                result = list(self.nodes)
+            else:
+                result = []
+                for pattern in patterns:
+                    if pattern is None:
+                        continue
+                    if ".cv[" in pattern:
+                        surface = pattern.split(".")[0]
+                        uCount, vCount = self._surface_cv_counts(surface)
+                        if flatten:
+                            result.extend(f"{surface}.cv[{u}][{v}]" for u in range(uCount) for v in range(vCount))
+                        else:
+                            result.append(f"{surface}.cv[0:{uCount - 1}][0:{vCount - 1}]")
+                        continue
+                    pattern = pattern.split("|")[-1]
+                    if "." in pattern:  # nodes having an attribute, like "*.ribbonSpec"
+                        nodePattern, attr = self._split(pattern)
+                        result.extend(n for n, node in self.nodes.items() if fnmatch.fnmatchcase(n, nodePattern)
+                                      and self.attributeQuery(attr, node=n, exists=True))
+                        continue
+                    if any(c in pattern for c in "*?["):
+                        result.extend(n for n in self.nodes if fnmatch.fnmatchcase(n, pattern))
+                    elif pattern in self.nodes:
+                        result.append(pattern)
+        if type:
+            result = [r for r in result if r in self.nodes and self._is_type(self.nodes[r], type)]
+        return result
+
+    def objExists(self, pName):
+        return pName.split(".")[0] in self.nodes
+
+    def objectType(self, pName, isType=None):
+        node = self._node(pName)
+        if isType is not None:
+            if isType == "shape":
+                return node.type in SHAPE_TYPES
+            return node.type == isType or isType in INHERITED_TYPES.get(node.type, ())
+        return node.type
+
+    def select(self, *args, clear=False, add=False, **kwargs):
+        if clear:
+            self.selection = []
+            return
+        items = []
+        for a in args:
+            items.extend(a if isinstance(a, (list, tuple)) else [a])
+        self.selection = (self.selection if add else []) + [i for i in items]
+
+    def createNode(self, pType, name=None, parent=None, skipSelect=False, **kwargs):
+        node = self._new(pType, name, parent)
+        if pType == "insertKnotSurface":
+            self.nodes[node].attrs["numberOfKnots[0]"] = 1
+        if not skipSelect:
+            self.selection = [node]
+        return node
+
+    def group(self, *args, name="group", empty=False, parent=None, **kwargs):
+        grp = self._new("transform", name, parent)
+        self.selection = [grp]
+        return grp
+
+    def spaceLocator(self, name="locator", absolute=False, **kwargs):
+        trs = self._new("transform", name)
+        self._new("locator", f"{trs}Shape", trs)
+        self.selection = [trs]
+        return [trs]
+
+    def nurbsPlane(self, name="nurbsPlane", pivot=(0, 0, 0), axis=(0, 1, 0), width=1, lengthRatio=1, degree=3, u=1,
+                   v=1, constructionHistory=True, **kwargs):
+        trs = self._new("transform", name)
+        shape = self._new("nurbsSurface", f"{trs}Shape", trs)
+        make = self._new("makeNurbPlane")
+        self.nodes[make].attrs.update({"width": width, "degree": degree, "pivot": list(pivot)})
+        self.connections[f"{shape}.create"] = f"{make}.outputSurface"
+        self.selection = [trs]
+        return [trs, make]
+
+    def circle(self, name="nurbsCircle", center=(0, 0, 0), normal=(0, 0, 1), constructionHistory=True, **kwargs):
+        trs = self._new("transform", name)
+        self._new("nurbsCurve", f"{trs}Shape", trs)
+        self.selection = [trs]
+        if constructionHistory:
+            make = self._new("makeNurbCircle")
+            return [trs, make]
+        return [trs]
+
+    def curve(self, *args, name="curve", degree=3, point=(), replace=False, **kwargs):
+        if replace:  # curve(existingCurve, replace=True, point=...) keeps the node
+            trs = args[0]
+            self.nodes[self._children(trs)[0]].attrs["cv"] = [list(p) for p in point]
+            return trs
+        trs = self._new("transform", name)
+        shape = self._new("nurbsCurve", f"{trs}Shape", trs)
+        self.nodes[shape].attrs["cv"] = [list(p) for p in point]
+        self.selection = [trs]
+        return trs
+
+    def joint(self, *args, name="joint", orientation=(0, 0, 0), position=(0, 0, 0), radius=1, **kwargs):
+        parent = None
+        if self.selection and self.selection[-1] in self.nodes:
+            if self.nodes[self.selection[-1]].type in ("transform", "joint"):
+                parent = self.selection[-1]
+        jnt = self._new("joint", name, parent)
+        self.nodes[jnt].attrs.update({"translate": list(position), "jointOrient": list(orientation),
+                                      "radius": radius})
+        self.selection = [jnt]
+        return jnt
+
+    def matrixUtil(self, *args, **kwargs):
+        return [1.0, 0, 0, 0, 0, 1.0, 0, 0, 0, 0, 1.0, 0, 0, 0, 0, 1.0]
+
+    def parent(self, *args, world=False, **kwargs):
+        items = []
+        for a in args:
+            items.extend(a if isinstance(a, (list, tuple)) else [a])
+        if world:
+            children, newParent = items, None
+        else:
+            children, newParent = items[:-1], items[-1].split("|")[-1]
+        for child in children:
+            self._node(child).parent = newParent
+        self.selection = [c.split("|")[-1] for c in children]
+        return self.selection
+
+    def listRelatives(self, pName, shapes=False, children=False, parent=False, allDescendents=False, type=None,
+                      fullPath=False, **kwargs):
+        names = pName if isinstance(pName, (list, tuple)) else [pName]
+        result = []
+        for name in names:
+            node = self._node(name)
+            if parent:
+                if node.parent:
+                    result.append(node.parent)
+                continue
+            candidates = self._descendants(node.name) if allDescendents else self._children(node.name)
+            if shapes:
+                candidates = [c for c in candidates if self.nodes[c].type in SHAPE_TYPES]
+            if type:
+                candidates = [c for c in candidates if self._is_type(self.nodes[c], type)]
+            if allDescendents:
+                candidates.reverse()
+            result.extend(candidates)
+        return result or None
+
+    def rename(self, pOld, pNew, **kwargs):
+        old = pOld.split("|")[-1]
+        node = self._node(old)
+        new = self._unique(pNew)
+        del self.nodes[old]
+        node.name = new
+        self.nodes[new] = node
+        for n in self.nodes.values():
+            if n.parent == old:
+                n.parent = new
+        renamed = {}
+        for dst, src in self.connections.items():
+            dNode, dAttr = self._split(dst)
+            sNode, sAttr = self._split(src)
+            dst = f"{new}.{dAttr}" if dNode == old else dst
+            src = f"{new}.{sAttr}" if sNode == old else src
+            renamed[dst] = src
+        self.connections = Connections(renamed)
+        self.selection = [new if s == old else s for s in self.selection]
+        return new
+
+    def delete(self, *args, **kwargs):
+        items = []
+        for a in args:
+            items.extend(a if isinstance(a, (list, tuple)) else [a])
+        for item in items:
+            name = item.split("|")[-1]
+            if name not in self.nodes:
+                continue
+            node = self.nodes[name]
+            if node.type == "insertKnotSurface":
+                upstream = self._source(f"{name}.inputSurface")
+                downstream = [d for d, s in self.connections.items() if s == f"{name}.outputSurface"]
+                for d in downstream:
+                    if upstream:
+                        self.connections[d] = upstream
+            for victim in [name] + self._descendants(name):
+                self.nodes.pop(victim, None)
+                for d in [d for d, s in self.connections.items()
+                          if self._split(d)[0] == victim or self._split(s)[0] == victim]:
+                    del self.connections[d]
+        self.selection = [s for s in self.selection if s.split(".")[0] in self.nodes]
+
+    def setAttr(self, pPlug, *values, type=None, **kwargs):
+        node, attr = self._split(pPlug)
+        target = self._node(node)
+        if type == "doubleArray" or type == "Int32Array":
+            target.attrs[attr] = list(values[0])
+        elif type == "stringArray":  # setAttr(plug, count, *strings, type="stringArray")
+            target.attrs[attr] = list(values[1:])
+        elif type in ("string", "matrix", "nurbsCurve"):
+            target.attrs[attr] = values[0] if len(values) == 1 else list(values)
+        else:
+            target.attrs[attr] = values[0] if len(values) == 1 else list(values)
+        if attr.endswith("]") and ":" in attr:  # multi slice like weights[0:3]
+            base, _, rng = attr[:-1].rpartition("[")
+            start, end = (int(x) for x in rng.split(":"))
+            del target.attrs[attr]
+            for i, v in zip(range(start, end + 1), values):
+                target.attrs[f"{base}[{i}]"] = v
+
+    def getAttr(self, pPlug, multiIndices=False, **kwargs):
+        node, attr = self._split(pPlug)
+        target = self._node(node)
+        if multiIndices:
+            return list(self._multi(target, attr)) or None
+        if attr in ("parameter", "numberOfKnots"):
+            return [tuple(self._multi(target, attr).values())]
+        if attr in ("spansU", "spansV"):
+            counts = self._surface_cv_counts(node)
+            return (counts[0] if attr == "spansU" else counts[1]) - self.getAttr(f"{node}.degreeU")
+        if attr in ("degreeU", "degreeV"):
+            for n in self.listHistory(node) or []:
+                if self.nodes[n].type == "makeNurbPlane":
+                    return int(self.nodes[n].attrs.get("degree", 3))
+            return 3
+        if attr in ("worldInverseMatrix", "worldMatrix", "worldMatrix[0]", "worldInverseMatrix[0]"):
+            return [1.0, 0, 0, 0, 0, 1.0, 0, 0, 0, 0, 1.0, 0, 0, 0, 0, 1.0]
+        if attr.endswith("]") and attr not in target.attrs and self._source(pPlug) is None:
+            if "[" in attr and ":" not in attr:
+                return target.attrs.get(attr, 0)
+        if attr == "distance":
+            return 1.0
+        if attr not in target.attrs and self._source(pPlug) is None:
+            multi = self._multi(target, attr)
+            if multi:
+                return list(multi.values())
+        return self._value(pPlug)
+
+    def addAttr(self, pNode, longName=None, attributeType=None, dataType=None, multi=False, **kwargs):
+        self._node(pNode).attrs.setdefault(longName, [] if multi or dataType else 0)
+
+    def attributeQuery(self, pAttr, node=None, exists=False, **kwargs):
+        return pAttr in self._node(node).attrs or any(k.startswith(f"{pAttr}[") for k in self._node(node).attrs)
+
+    def removeMultiInstance(self, pPlug, b=False, **kwargs):
+        node, attr = self._split(pPlug)
+        target = self._node(node)
+        for key in [k for k in target.attrs if k == attr or k.startswith(f"{attr}.")]:
+            del target.attrs[key]
+        for d in [d for d, s in self.connections.items()
+                  if d == pPlug or d.startswith(f"{pPlug}.") or s == pPlug or s.startswith(f"{pPlug}.")]:
+            del self.connections[d]
+
+    def connectAttr(self, pSrc, pDst, force=False, **kwargs):
+        self._node(pSrc)
+        self._node(pDst)
+        if pDst in self.connections and not force:
+            raise RuntimeError(f"{pDst} already has an incoming connection from {self.connections[pDst]}")
+        self.connections[pDst] = pSrc
+
+    def disconnectAttr(self, pSrc, pDst, **kwargs):
+        if self.connections.get(pDst) == pSrc:
+            del self.connections[pDst]
+
+    def isConnected(self, pSrc, pDst, **kwargs):
+        return self.connections.get(pDst) == pSrc
+
+    def listConnections(self, pItem, destination=True, source=True, plugs=False, type=None, connections=False,
+                        skipConversionNodes=False, **kwargs):
+        items = pItem if isinstance(pItem, (list, tuple)) else [pItem]
+        result = []
+        for item in items:
+            isPlug = "." in item
+
+            def match(pPlug):
+                if isPlug:
+                    return pPlug == item or pPlug.startswith(f"{item}.") or pPlug.startswith(f"{item}[")
+                return self._split(pPlug)[0] == item
+
+            pairs = []
+            if source:
+                pairs.extend((d, s) for d, s in self.connections.items() if match(d))
+            if destination:
+                pairs.extend((s, d) for d, s in self.connections.items() if match(s))
+            pairs.sort(key=lambda p: _plug_sort_key(p[0]))
+            for mine, other in pairs:
+                otherNode = self._split(other)[0]
+                if type and not self._is_type(self.nodes[otherNode], type):
+                    continue
+                if connections:
+                    result.append(mine)
+                result.append(other if plugs else otherNode)
+        return result or None
+
+    def listHistory(self, pName, allConnections=False, **kwargs):
+        start = self._shape_of(pName)
+        sources = self.connections.upstream
+        seen = [start]
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            for upstream in sources.get(current, ()):
+                if upstream not in seen:
+                    seen.append(upstream)
+                    stack.append(upstream)
+        return seen
+
+    def insertKnotSurface(self, pShape, constructionHistory=True, parameter=(), numberOfKnots=1, direction=1,
+                          replaceOriginal=True, **kwargs):
+        shape = self._shape_of(pShape)
+        knot = self._new("insertKnotSurface")
+        parameter = parameter if isinstance(parameter, (list, tuple)) else [parameter]
+        for i, p in enumerate(parameter):
+            self.nodes[knot].attrs[f"parameter[{i}]"] = p
+            self.nodes[knot].attrs[f"numberOfKnots[{i}]"] = numberOfKnots
+        self.nodes[knot].attrs["direction"] = direction
+        upstream = self._source(f"{shape}.create")
+        if upstream:
+            self.connections[f"{knot}.inputSurface"] = upstream
+        self.connections[f"{shape}.create"] = f"{knot}.outputSurface"
+        return [pShape, knot]
+
+    def xform(self, pItem, query=False, translation=None, rotation=None, worldSpace=False, matrix=None, **kwargs):
+        items = pItem if isinstance(pItem, (list, tuple)) else [pItem]
+        if query:
+            result = []
+            for item in items:
+                if ".cv[" in item:
+                    surface = item.split(".")[0]
+                    if item.endswith("[*][*]") or ":" in item or "*" in item:
+                        uCount, vCount = self._surface_cv_counts(surface)
+                        width = self._width(surface)
+                        for u in range(uCount):
+                            for v in range(vCount):
+                                result.extend([width * u / (uCount - 1), v * 0.1, 0])
+                        continue
+                    u = int(item.split("[")[1].rstrip("]"))
+                    uCount, _ = self._surface_cv_counts(surface)
+                    result.extend([self._width(surface) * u / (uCount - 1), 0, 0])
+                    continue
+                if rotation:
+                    result.extend(self._node(item).attrs.get("rotate", [0, 0, 0]))
+                    continue
+                translate = self._value(f"{item}.translate")
+                result.extend(translate if isinstance(translate, list) else [0, 0, 0])
+            return result
+        for item in items:
+            if translation is not None:
+                self._node(item).attrs["translate"] = list(translation)
+            if rotation is not None:
+                self._node(item).attrs["rotate"] = list(rotation)
+
+    def skinCluster(self, *args, edit=False, query=False, addInfluence=None, unbind=False, influence=False,
+                    maximumInfluences=None, toSelectedBones=False, name=None, **kwargs):
+        if edit:
+            skin = args[0]
+            if unbind:
+                shape = [d for d, s in self.connections.items() if s == f"{skin}.outputGeometry[0]"]
+                self.delete(skin)
+                return
+            if addInfluence:
+                influences = self.nodes[skin].attrs.setdefault("influences", [])
+                if addInfluence in influences:
+                    raise RuntimeError(f"{addInfluence} is already an influence")
+                influences.append(addInfluence)
+            return
+        if query:
+            return list(self.nodes[args[0]].attrs.get("influences", []))
+        items = []
+        for a in args:
+            items.extend(a if isinstance(a, (list, tuple)) else [a])
+        joints, geometry = items[:-1], items[-1]
+        shape = self._shape_of(geometry)
+        skin = self._new("skinCluster", name)
+        self.nodes[skin].attrs["influences"] = list(joints)
+        upstream = self._source(f"{shape}.create")
+        if upstream:
+            self.connections[f"{skin}.input[0].inputGeometry"] = upstream
+        self.connections[f"{shape}.create"] = f"{skin}.outputGeometry[0]"
+        dagPose = self._new("dagPose", "bindPose")
+        self.nodes[skin].attrs["bindPose"] = dagPose
+        return [skin]
+
+    def dagPose(self, *args, query=False, bindPose=False, name=None, addToPose=False, save=False, **kwargs):
+        if query:
+            return [n for n in self.nodes if self.nodes[n].type == "dagPose"][:1]
+        return name
+
+    def skinPercent(self, pSkin, pComponent, transformValue=None, **kwargs):
+        for component in pComponent if isinstance(pComponent, (list, tuple)) else [pComponent]:
+            self._node(pSkin).attrs[f"weights:{component}"] = transformValue
+
+    def blendShape(self, *args, name="blendShape", frontOfChain=False, edit=False, query=False, target=None,
+                   weight=None, remove=False, **kwargs):
+        if query:
+            node = args[0][0] if isinstance(args[0], list) else args[0]
+            return list(self._multi(self.nodes[node], "weight").values()) or None
+        if edit:
+            node = args[0][0] if isinstance(args[0], list) else args[0]
+            group = f"{node}.inputTarget[0].inputTargetGroup[{target[1]}]"
+            if remove:
+                self.nodes[node].attrs.pop(f"weight[{target[1]}]", None)
+                self.connections.pop(group, None)
+                return
+            self.nodes[node].attrs[f"weight[{target[1]}]"] = 1
+            self.connections[group] = f"{self._shape_of(target[2])}.worldSpace[0]"
+            return
+        shape = self._shape_of(args[0])
+        node = self._new("blendShape", name)
+        upstream = self._source(f"{shape}.create")
+        if upstream:
+            self.connections[f"{node}.input[0].inputGeometry"] = upstream
+        self.connections[f"{shape}.create"] = f"{node}.outputGeometry[0]"
+        return [node]
+
+    def nonLinear(self, *args, type="bend", **kwargs):
+        items = []
+        for a in args:
+            items.extend(a if isinstance(a, (list, tuple)) else [a])
+        deform = self._new(f"nonLinear", f"{type}1")
+        self.nodes[deform].type = "nonLinear"
+        handle = self._new("transform", f"{type}1Handle")
+        self._new(f"deform{type.capitalize()}", f"{handle}Shape", handle)
+        self.connections[f"{handle}.specifiedManipLocation"] = f"{deform}.deformerData"
+        for item in items:
+            shape = self._shape_of(item)
+            upstream = self._source(f"{shape}.create")
+            index = len([d for d in self.connections if d.startswith(f"{deform}.input[")])
+            if upstream:
+                self.connections[f"{deform}.input[{index}].inputGeometry"] = upstream
+            self.connections[f"{shape}.create"] = f"{deform}.outputGeometry[{index}]"
+        return [deform, handle]
+
+    def nurbsToSubdiv(self, *args, **kwargs):
+        return []
+
+    def rotate(self, *args, **kwargs):
+        self._node(args[-1]).attrs["rotate"] = list(args[:3])
+
+    def hide(self, *args, **kwargs):
+        pass
+
+    def showHidden(self, *args, **kwargs):
+        pass
+
+    def matchTransform(self, pSource, pTarget, **kwargs):
+        self._node(pSource).attrs["translate"] = list(self._node(pTarget).attrs.get("translate", [0, 0, 0]))
+
+    def bakePartialHistory(self, *args, **kwargs):
+        pass
+
+    def undoInfo(self, *args, openChunk=False, closeChunk=False, query=False, state=None, chunkName=None, **kwargs):
+        if openChunk:
+            if not self._chunkDepth:  # a nested chunk is part of the open one, like in Maya
+                self.undoChunks += 1
+                self.undoEntries += 1
+            self._chunkDepth += 1
+        elif closeChunk:
+            self._chunkDepth = max(0, self._chunkDepth - 1)
+        if query:
+            return True
+
+    def refresh(self, *args, suspend=None, **kwargs):
+        pass
+
+    def evalDeferred(self, pCommand, lowestPriority=False, **kwargs):
+        if callable(pCommand):
+            pCommand()
+
+    def warning(self, *args, **kwargs):
+        pass
+
+    def progressWindow(self, *args, query=False, isCancelled=False, **kwargs):
+        if query:
+            return False
+
+    def internalVar(self, userScriptDir=False, **kwargs):
+        return "/tmp/"
+
+    def file(self, *args, **kwargs):
+        return None
+
+    def pluginInfo(self, *args, query=False, loaded=False, **kwargs):
+        return False
+
+    def loadPlugin(self, *args, **kwargs):
+        raise RuntimeError("plugins are not available in the stand-in")
+
+    def about(self, *args, **kwargs):
+        return "stand-in"
+
+    def currentTime(self, *args, **kwargs):
+        return 1
+
+    def dgeval(self, *args, **kwargs):
+        pass
+
+
+def _plug_sort_key(pPlug: str):
+    return [int(t) if t.isdigit() else t for t in re.split(r"(\d+)", pPlug)]
+
+
+FakeCmds._commands = {name for name, value in vars(FakeCmds).items()
+                      if callable(value) and not name.startswith("_") and name != "reset"}
+
+
+def install() -> FakeCmds:
+    """
+    Registers the stand-in as ``maya`` / ``maya.cmds`` in sys.modules and returns the cmds object.
+    If a stand-in is already installed, it is reset and returned.
+    """
+    existing = sys.modules.get("maya.cmds")
+    if isinstance(existing, FakeCmds):
+        existing.reset()
+        return existing
+    cmds = FakeCmds()
+    maya = types.ModuleType("maya")
+    maya.cmds = cmds
+    maya.__path__ = []
+    mel = types.ModuleType("maya.mel")
+    mel.eval = lambda *args, **kwargs: None
+    maya.mel = mel
+    sys.modules["maya"] = maya
+    sys.modules["maya.cmds"] = cmds
+    sys.modules["maya.mel"] = mel
+    return cmds
@@ -0,0 +1,28 @@
+"""
+The tests run with plain Python: maya.cmds is replaced by the in-memory stand-in of the benchmarks (fake_maya),
+and the modules that need NumPy are skipped when it is not installed.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "benchmarks"))
+sys.path.insert(0, ROOT_DIR)
+
+import fake_maya  # noqa: E402
+
+fake_maya.install()
+
+
+@pytest.fixture
+def cmds():
+    """
+    :return: the stand-in of maya.cmds, emptied for the test.
+    """
+    from RibbonCreatorTool.RibbonCreatorOperations import RibbonOperations
+
+    RibbonOperations.nodeRegistry.clear()
+    RibbonOperations.nameAllocator.invalidate()
+    return fake_maya.install()
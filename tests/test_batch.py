@@ -0,0 +1,42 @@
+from RibbonCreatorTool import RibbonCreatorBatch as RibbonBatch
+from RibbonCreatorTool.RibbonCreatorOperations import RibbonOperations
+from RibbonCreatorTool.RibbonCreatorSpec import RibbonSpec
+
+
+def test_build_specs_failure(cmds, monkeypatch):
+    """
+    A spec failing half way leaves nothing in the scene, the other specs are built.
+    """
+    updateControlSkin = RibbonOperations.update_control_skin
+
+    def update_control_skin(pRop, pSkinChain):
+        if pRop.ribbon == "leg_L":
+            raise RuntimeError("no skin")
+        updateControlSkin(pRop, pSkinChain)
+
+    monkeypatch.setattr(RibbonOperations, "update_control_skin", update_control_skin)
+    specs = [RibbonSpec(name=name) for name in ("arm_L", "leg_L", "arm_R")]
+    results = RibbonBatch.build_specs(specs)
+    assert [r["ribbon"] for r in results] == ["arm_L", None, "arm_R"]
+    assert results[1]["error"] == "RuntimeError: no skin"
+    assert not cmds.ls("leg_L", "leg_L_setup", "leg_L_*")
+    assert cmds.ls("arm_L", "arm_R") == ["arm_L", "arm_R"]
+
+
+def test_build_specs_existing(cmds):
+    """
+    A spec whose ribbon already exists fails without deleting it.
+    """
+    RibbonBatch.build_specs([RibbonSpec(name="arm_L")])
+    results = RibbonBatch.build_specs([RibbonSpec(name="arm_L")])
+    assert results[0]["error"] == "ValueError: Ribbon 'arm_L' already exists."
+    assert cmds.ls("arm_L", "arm_L_setup") == ["arm_L", "arm_L_setup"]
+
+
+def test_build_specs_replace(cmds):
+    RibbonBatch.build_specs([RibbonSpec(name="arm_L", mainJointCount=4)])
+    nodes = cmds.ls("arm_L*")
+    results = RibbonBatch.build_specs([RibbonSpec(name="arm_L", mainJointCount=4)], pReplace=True)
+    assert results[0]["ribbon"] == "arm_L"
+    # the old ribbon, its shared nodes and its metadata node are replaced, not kept next to the new ones
+    assert cmds.ls("arm_L*") == nodes
@@ -0,0 +1,39 @@
+from RibbonCreatorTool.RibbonCreatorOperations import RibbonOperations
+
+ARGS = ("Ribbon1", [1, 0, 0], [0, 1, 0], 10, 2, 1, True, False, True)
+
+
+def make_joints(pCmds, pPrefix: str, pCount: int = 3) -> list:
+    pCmds.select(clear=True)
+    return [pCmds.joint(name=f"{pPrefix}{i}", position=(i * 5, 0, 0)) for i in range(pCount)]
+
+
+def test_selection_captured(cmds):
+    """
+    The ribbon is built along the joints selected when the build starts, not when its steps run.
+    """
+    joints = make_joints(cmds, "arm")
+    others = make_joints(cmds, "leg")
+    cmds.select(joints)
+    rop = RibbonOperations()
+    rop.align = True
+    steps, rollback = rop.build_steps(*ARGS, pPinch=False)
+    cmds.select(others)
+    for name, step in steps:
+        step()
+    assert rop.selection == joints
+    assert rop.spec.joints == joints
+
+
+def test_rollback_restores_proxy_selection(cmds):
+    joints = make_joints(cmds, "arm")
+    cmds.select(joints)
+    rop = RibbonOperations()
+    rop.previs_ribbon(*ARGS, False)
+    steps, rollback = rop.build_steps(*ARGS, pPinch=False)
+    cmds.select(clear=True)
+    for name, step in steps[:2]:
+        step()
+    rollback()
+    assert rop.proxy and rop.selection == joints
+    assert not cmds.ls("Ribbon1")
@@ -0,0 +1,57 @@
+import pytest
+
+from RibbonCreatorTool import RibbonCreatorChains as RibbonChains
+from RibbonCreatorTool.RibbonCreatorOperations import RibbonOperations
+from RibbonCreatorTool.RibbonCreatorSpec import RibbonSpec
+
+
+def make_chains(pCmds, pCount: int, pJoints: int = 4) -> list:
+    roots = []
+    for i in range(pCount):
+        pCmds.select(clear=True)
+        roots.append([pCmds.joint(name=f"chain{i}_jnt{j}", position=(j * 2, 0, i)) for j in range(pJoints)][0])
+    return RibbonChains.find_chains(roots)
+
+
+def test_chain_layouts(cmds):
+    chains = make_chains(cmds, 2)
+    layouts = RibbonChains.chain_layouts(chains, RibbonSpec(name="strand1"))
+    assert [spec.name for spec, positions in layouts] == ["strand1", "strand2"]
+    for (spec, positions), chain in zip(layouts, chains):
+        assert spec.joints == chain and spec.mainJointCount == 3 and spec.length == pytest.approx(6)
+        assert positions == [cmds.xform(joint, query=True, translation=True, worldSpace=True) for joint in chain]
+
+
+def test_build_chains_positions(cmds, monkeypatch):
+    """
+    The positions of the joints are queried once for every chain, not again by each build.
+    """
+    chains = make_chains(cmds, 3)
+    queries = []
+    getWorldPositions = RibbonOperations.get_world_positions
+    monkeypatch.setattr(RibbonOperations, "get_world_positions",
+                        staticmethod(lambda pNodes: queries.append(pNodes) or getWorldPositions(pNodes)))
+    results = RibbonChains.build_chains(chains, RibbonSpec(name="strand1"))
+    assert [r["error"] for r in results] == [None] * 3
+    assert len(queries) == 1
+
+
+def test_build_chains_failure(cmds, monkeypatch):
+    """
+    A ribbon failing half way is deleted, the others are built.
+    """
+    chains = make_chains(cmds, 3)
+    createFollicles = RibbonOperations.create_follicles
+
+    def create_follicles(pRop):
+        if pRop.ribbon == "strand2":
+            raise RuntimeError("no follicles")
+        createFollicles(pRop)
+
+    monkeypatch.setattr(RibbonOperations, "create_follicles", create_follicles)
+    results = RibbonChains.build_chains(chains, RibbonSpec(name="strand1"))
+    assert [r["ribbon"] for r in results] == ["strand1", None, "strand3"]
+    assert results[1]["error"] == "RuntimeError: no follicles"
+    assert cmds.ls("strand1", "strand1_setup", "strand3", "strand3_setup") == \
+        ["strand1", "strand1_setup", "strand3", "strand3_setup"]
+    assert not cmds.ls("strand2", "strand2_setup", "strand2_*")
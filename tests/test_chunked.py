@@ -0,0 +1,31 @@
+from RibbonCreatorTool.RibbonCreatorChunked import ChunkedBuild
+from RibbonCreatorTool.RibbonCreatorOperations import RibbonOperations
+
+ARGS = ("Ribbon1", [1, 0, 0], [0, 1, 0], 10, 2, 1, True, False, True)
+
+
+def test_build_is_one_undo_entry(cmds):
+    rop = RibbonOperations()
+    undoEntries = cmds.undoEntries
+    build = ChunkedBuild(rop, *ARGS, pPinch=False, sine=True)
+    build.start()  # the stand-in runs deferred commands at once
+    assert build.succeeded
+    assert cmds.undoEntries - undoEntries == 1
+    assert cmds.ls("Ribbon1")
+
+
+def test_cancelled_build_is_one_undo_entry(cmds):
+    rop = RibbonOperations()
+    rop.previs_ribbon(*ARGS, False)
+    undoEntries = cmds.undoEntries
+
+    def on_progress(pDone, pCount, pStep):
+        if pDone == 3:
+            build.cancel()
+
+    build = ChunkedBuild(rop, *ARGS, pPinch=False, pOnProgress=on_progress)
+    build.start()
+    assert build.cancelled and not build.succeeded
+    assert cmds.undoEntries - undoEntries == 1
+    # the ribbon is previewed again, as before the build
+    assert rop.proxy and not cmds.ls("Ribbon1")
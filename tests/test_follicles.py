@@ -0,0 +1,43 @@
+import pytest
+
+from RibbonCreatorTool.RibbonCreatorOperations import KnotType, MethodName, RibbonOperations
+
+ARGS = ("Ribbon1", [1, 0, 0], [0, 1, 0], 10, 4, 2, False, False, False)
+
+
+@pytest.fixture(params=[MethodName.uvPin, MethodName.sharedUvPin])
+def rop(cmds, monkeypatch, request):
+    monkeypatch.setattr(RibbonOperations, "pinMethod", request.param)
+    rop = RibbonOperations()
+    rop.build_ribbon(*ARGS, pPinch=False)
+    return rop
+
+
+def test_renamed_follicles(cmds, rop):
+    """
+    Renamed locators keep their index, and are updated like the others.
+    """
+    grpName = "Ribbon1_grp_loc_main"
+    locators = rop.get_follicles(grpName)
+    renamed = [cmds.rename(loc, f"elbow_{chr(ord('z') - i)}") for i, loc in enumerate(locators)]
+    assert rop.get_follicles(grpName) == renamed
+    rop.update_main_iso(3, 2, False, False, False, False)
+    follicles = rop.get_follicles(grpName)
+    assert follicles == renamed[:len(follicles)]
+    assert len(follicles) == len(rop.mainIsoPos) + 2
+    for loc in follicles[1:-1]:
+        assert cmds.isConnected(f"{rop.mainKnotNode}.message", f"{loc}.creator")
+
+
+def test_connect_follicle_without_pin(cmds, rop):
+    """
+    A follicle whose pin was deleted is still driven through its isoparm.
+    """
+    loc = rop.get_follicles("Ribbon1_grp_loc_roll")[0]
+    drivers = rop.get_follicle_drivers(loc)
+    if rop.is_shared_node(drivers["pin"]):
+        cmds.disconnectAttr(f"{drivers['pin']}.outputMatrix[{drivers['pinIndex']}]", f"{drivers['dm']}.inputMatrix")
+    else:
+        cmds.delete(drivers["pin"])
+    rop.connect_follicle(loc, 0, rop.rollIsoPos[0], rop.rollKnotNode, KnotType.roll)
+    assert cmds.isConnected(f"{rop.rollKnotNode}.parameter[0]", f"{drivers['iso']}.isoparmValue")
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from RibbonCreatorTool import RibbonCreatorGeometry as RibbonGeo  # noqa: E402
+from RibbonCreatorTool.RibbonCreatorOperations import RibbonOperations  # noqa: E402
+
+LAYOUTS = [[4, 4], [4, 3], [1, 2, 3, 4], [2.5] * 8, [random.Random(i).uniform(0.1, 10) for i in range(12)]]
+
+
+# --------------------------------------------------------
+# ---------------------- ISOPARMS ------------------------
+# --------------------------------------------------------
+@pytest.mark.parametrize("pDistances", LAYOUTS)
+def test_iso_pos_main(pDistances):
+    expected = RibbonOperations.generate_iso_pos_main(pDistances)
+    np.testing.assert_allclose(RibbonGeo.iso_pos_main(pDistances), expected)
+
+
+@pytest.mark.parametrize("pDistances", LAYOUTS)
+def test_iso_pos_full(pDistances):
+    isoPos = RibbonOperations.generate_iso_pos_main(pDistances)
+    np.testing.assert_allclose(RibbonGeo.iso_pos_full(isoPos), RibbonOperations.generate_iso_pos_full(isoPos))
+
+
+@pytest.mark.parametrize("pDistances", LAYOUTS)
+@pytest.mark.parametrize("pRollCount", [0, 1, 3])
+def test_iso_pos_roll(cmds, pDistances, pRollCount):
+    isoPos = RibbonOperations.generate_iso_pos_main(pDistances)
+    expected = RibbonOperations().generate_iso_pos_roll(pRollCount, isoPos)
+    np.testing.assert_allclose(RibbonGeo.iso_pos_roll(pRollCount, isoPos), expected)
+
+
+def test_iso_pos_stacked_layouts():
+    layouts = [[4, 3, 2], [1, 1, 1]]
+    stacked = RibbonGeo.iso_pos_all(layouts, 2)
+    for i, distances in enumerate(layouts):
+        single = RibbonGeo.iso_pos_all(distances, 2)
+        for key in ("main", "roll", "all"):
+            np.testing.assert_allclose(stacked[key][i], single[key])
+
+
+# -----------------------------------------------------------
+# ---------------------- NURBS SURFACE ----------------------
+# -----------------------------------------------------------
+@pytest.mark.parametrize("pDegree", [1, 2, 3])
+@pytest.mark.parametrize("pKnots", [[0, 0, 0, 0, 1, 1, 1, 1], [0, 0, 0, 0, 0.2, 0.5, 0.5, 1, 1, 1, 1]])
+def test_partition_of_unity(pDegree, pKnots):
+    knots = np.concatenate([[0] * (pDegree + 1), np.unique(pKnots)[1:-1], [1] * (pDegree + 1)])
+    params = np.linspace(0, 1, 101)
+    basis, derivative = RibbonGeo.basis_functions(knots, pDegree, params)
+    assert basis.shape == (len(params), len(knots) - pDegree - 1)
+    assert (basis >= 0).all()
+    np.testing.assert_allclose(basis.sum(axis=1), 1)
+    np.testing.assert_allclose(derivative.sum(axis=1), 0, atol=1e-9)
+
+
+def test_full_knots():
+    # knots of a degree 3 plane with one span, as MFnNurbsSurface returns them
+    np.testing.assert_array_equal(RibbonGeo.full_knots([0, 0, 0, 1, 1, 1], 3), [0, 0, 0, 0, 1, 1, 1, 1])
+
+
+@pytest.mark.parametrize("pLength", [1, 10, 37.5])
+@pytest.mark.parametrize("pDegree", [1, 3])
+def test_sample_plane(pLength, pDegree):
+    isoPos = np.array([0, 0.1, 0.25, 0.5, 0.9, 1])
+    cvs, knotsU, knotsV = RibbonGeo.plane_surface(pLength, pDegree)
+    result = RibbonGeo.sample_surface(cvs, knotsU, knotsV, pDegree, pDegree, isoPos)
+    positions = np.zeros((len(isoPos), 3))
+    positions[:, 0] = isoPos * pLength
+    np.testing.assert_allclose(result["position"], positions, atol=1e-9)
+    np.testing.assert_allclose(result["normal"], [[0, 0, 1]] * len(isoPos), atol=1e-9)
+    # the width of the plane, see plane_surface
+    np.testing.assert_allclose(result["length"], pLength * 0.1)
+    expected = np.tile(np.eye(4), (len(isoPos), 1, 1))
+    expected[:, 3, :3] = positions
+    np.testing.assert_allclose(result["matrix"], expected, atol=1e-9)
+
+
+def test_sampler_knots():
+    """
+    The ribbonSampler node reads the knots of the surface from Maya, without their first and last ones.
+    """
+    cvs, knotsU, knotsV = RibbonGeo.plane_surface(10)
+    mayaKnots = knotsU[1:-1]
+    result = RibbonGeo.sample_surface(cvs, RibbonGeo.full_knots(mayaKnots, 3), RibbonGeo.full_knots(mayaKnots, 3),
+                                      3, 3, [0.3, 0.6])
+    expected = RibbonGeo.sample_plane(10, [0.3, 0.6])
+    for key in ("position", "matrix", "length"):
+        np.testing.assert_allclose(result[key], expected[key])
+
+
+def test_frames_orthogonal():
+    """
+    frames builds the matrices of a uvPin with normalAxis Z and tangentAxis X, also when the tangent isn't
+    orthogonal to the normal.
+    """
+    matrices = RibbonGeo.frames(np.array([[1.0, 2, 3]]), np.array([[2.0, 0, 1]]), np.array([[0, 0, 3.0]]))
+    np.testing.assert_allclose(matrices[0], [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [1, 2, 3, 1]], atol=1e-9)
+
+
+# -------------------------------------------------------
+# ---------------------- POLYLINE -----------------------
+# -------------------------------------------------------
+def test_polyline_points_on_joints():
+    chain = [[0, 0, 0], [4, 0, 0], [4, 3, 0]]
+    isoPos = RibbonGeo.iso_pos_full(RibbonGeo.iso_pos_main(RibbonGeo.segment_lengths(chain)))
+    np.testing.assert_allclose(RibbonGeo.polyline_points(chain, isoPos), chain)
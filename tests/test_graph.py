@@ -0,0 +1,221 @@
+from collections import Counter
+
+import pytest
+
+from RibbonCreatorTool import RibbonCreatorGraph as RibbonGraph
+from RibbonCreatorTool.RibbonCreatorOperations import KnotType, MethodName, RibbonOperations, ScaleMode
+
+
+def describe_follicles(pMain: int, pRoll: int, pPinch: bool, pMethod: MethodName = MethodName.uvPin,
+                       pScaleMode: ScaleMode = ScaleMode.perIso):
+    """
+    Creates a ribbon and its knots in the stand-in, then records the graph of its main and roll follicles.
+    :return: the operations, the recording modifier and the names of the created nodes by key.
+    """
+    rop = RibbonOperations()
+    rop.scaleMode = pScaleMode
+    rop.create_surface("Ribbon1", [1, 0, 0], [0, 1, 0], 10, pMain, pRoll, False, False, False, pPinch)
+    rop.update_knots(pMain, pRoll, pPinch)
+    graph = RibbonGraph.NodeGraph()
+    rop.update_follicles(rop.mainIsoPos, rop.mainKnotNode, KnotType.main, pMethod, graph)
+    rop.update_follicles(rop.rollIsoPos, rop.rollKnotNode, KnotType.roll, pMethod, graph)
+    modifier = RibbonGraph.RecordingModifier()
+    names = RibbonGraph.ModifierBuilder(modifier).commit(graph)
+    return rop, modifier, names
+
+
+def operations(pModifier: RibbonGraph.RecordingModifier, pKind: str) -> list:
+    return [operation[1:] for operation in pModifier.operations if operation[0] == pKind]
+
+
+def named(pModifier: RibbonGraph.RecordingModifier, pPrefix: str, pShapes: bool = False) -> dict:
+    """
+    :return: the handles of the nodes renamed with pPrefix, by name, the transforms or the shapes.
+    """
+    return {name: handle for handle, name in operations(pModifier, "renameNode")
+            if name.startswith(pPrefix) and name.endswith("Shape") == pShapes}
+
+
+def source_of(pModifier: RibbonGraph.RecordingModifier, pDestination: str) -> str:
+    sources = [source for source, destination in operations(pModifier, "connect") if destination == pDestination]
+    assert len(sources) == 1, pDestination
+    return sources[0]
+
+
+def iso_plug(pModifier: RibbonGraph.RecordingModifier, pLocator: str) -> str:
+    """
+    :return: the coordinateU plug of the uvPin driving pLocator, found through its decomposeMatrix.
+    """
+    dm = source_of(pModifier, f"{pLocator}.translate").split(".")[0]
+    uvPin = source_of(pModifier, f"{dm}.inputMatrix").split(".")[0]
+    return f"{uvPin}.coordinate[0].coordinateU"
+
+
+@pytest.mark.parametrize("pMain, pRoll", [(2, 0), (4, 2), (8, 4)])
+def test_main_follicles(cmds, pMain, pRoll):
+    rop, modifier, names = describe_follicles(pMain, pRoll, False)
+    locators = named(modifier, "loc_foll_Ribbon1_main_")
+    assert len(locators) == len(rop.mainIsoPos) + 2  # with the follicles on the bounds
+    values = dict(operations(modifier, "setPlug"))
+    for i, v in enumerate(RibbonOperations.generate_iso_pos_full(rop.mainIsoPos)):
+        plug = iso_plug(modifier, locators[f"loc_foll_Ribbon1_main_{i:02d}"])
+        if 0 < v < 1:
+            assert source_of(modifier, plug) == f"{rop.mainKnotNode}.parameter[{i - 1}]"
+        else:
+            assert values[plug] == v
+    assert modifier.doItCount == 1
+
+
+@pytest.mark.parametrize("pMain, pRoll", [(2, 1), (4, 2), (8, 4)])
+def test_roll_follicles(cmds, pMain, pRoll):
+    rop, modifier, names = describe_follicles(pMain, pRoll, False)
+    locators = named(modifier, "loc_foll_Ribbon1_roll_")
+    assert len(locators) == len(rop.rollIsoPos)
+    for i in range(len(rop.rollIsoPos)):
+        locator = locators[f"loc_foll_Ribbon1_roll_{i:02d}"]
+        assert source_of(modifier, iso_plug(modifier, locator)) == f"{rop.rollKnotNode}.parameter[{i}]"
+        assert source_of(modifier, f"{locator}.creator") == f"{rop.rollKnotNode}.message"
+
+
+def test_no_roll_follicles(cmds):
+    rop, modifier, names = describe_follicles(4, 0, False)
+    assert not named(modifier, "loc_foll_Ribbon1_roll_")
+    assert rop.rollKnotNode is None
+
+
+def test_pinch(cmds):
+    rop, modifier, names = describe_follicles(4, 2, True)
+    for i in range(len(rop.mainIsoPos)):
+        assert cmds.getAttr(f"{rop.mainKnotNode}.numberOfKnots[{i}]") == 3
+    # the pinch adds knots to the nurb, not follicles
+    cmds.reset()
+    RibbonOperations.nodeRegistry.clear()
+    _, unpinched, _ = describe_follicles(4, 2, False)
+    assert modifier.operations == unpinched.operations
+
+
+def test_follicle_nodes(cmds):
+    rop, modifier, names = describe_follicles(4, 2, False)
+    count = len(rop.mainIsoPos) + 2 + len(rop.rollIsoPos)
+    created = Counter(nodeType for nodeType, parent in operations(modifier, "createNode"))
+    for nodeType in ("locator", "joint", "decomposeMatrix", "uvPin", "nurbsCurve"):
+        assert created[nodeType] == count, nodeType
+    # each follicle has a transform for its locator and one for its circle
+    assert created["transform"] == count * 2
+    circles = named(modifier, "ctrl_extra_Ribbon1_")
+    shapes = named(modifier, "ctrl_extra_Ribbon1_", True)
+    assert len(circles) == len(shapes) == count
+    assert all(("createNode", "nurbsCurve", circles[name[:-len("Shape")]]) in modifier.operations for name in shapes)
+    curves = [value for plug, value in operations(modifier, "setPlug") if plug.endswith(".cached")]
+    assert len(curves) == count and all(isinstance(value, RibbonGraph.CurveData) for value in curves)
+    # the names of the graph are the names given to the modifier
+    assert set(names.values()) >= set(named(modifier, "loc_foll_Ribbon1_"))
+
+
+def scale_sources(pModifier: RibbonGraph.RecordingModifier) -> dict:
+    """
+    :return: the plug driving the scaleX of each locator, by locator name.
+    """
+    return {name: source_of(pModifier, f"{handle}.scaleX")
+            for name, handle in named(pModifier, "loc_foll_Ribbon1_").items()}
+
+
+def test_scale_none(cmds):
+    rop, modifier, names = describe_follicles(4, 2, False, pScaleMode=ScaleMode.none)
+    assert not named(modifier, "Ribbon1_scale_")
+    assert not [destination for source, destination in operations(modifier, "connect")
+                if destination.endswith(".scaleX")]
+    assert not [nodeType for nodeType, parent in operations(modifier, "createNode") if nodeType == "curveInfo"]
+
+
+def test_scale_global(cmds):
+    rop, modifier, names = describe_follicles(4, 2, False, pScaleMode=ScaleMode.globalScale)
+    shared = named(modifier, "Ribbon1_scale_")
+    assert set(shared) == {"Ribbon1_scale_factor", "Ribbon1_scale_iso", "Ribbon1_scale_info", "Ribbon1_scale_global"}
+    # the width is measured once, at the middle of the ribbon, for every follicle
+    assert set(scale_sources(modifier).values()) == {f"{shared['Ribbon1_scale_global']}.outputX"}
+    assert source_of(modifier, f"{shared['Ribbon1_scale_global']}.input2X") == \
+        f"{shared['Ribbon1_scale_factor']}.outputX"
+    assert source_of(modifier, f"{shared['Ribbon1_scale_factor']}.input2X") == f"{rop.makeNurbNode}.width"
+    created = Counter(nodeType for nodeType, parent in operations(modifier, "createNode"))
+    assert created["curveInfo"] == created["curveFromSurfaceIso"] == 1
+
+
+def test_scale_per_iso(cmds):
+    rop, modifier, names = describe_follicles(4, 2, False, pScaleMode=ScaleMode.perIso)
+    factor = named(modifier, "Ribbon1_scale_")
+    assert list(factor) == ["Ribbon1_scale_factor"]
+    sources = scale_sources(modifier)
+    assert len(set(sources.values())) == len(sources)  # one measure per follicle
+    for name, plug in sources.items():
+        md = plug.split(".")[0]
+        assert source_of(modifier, f"{md}.input2X") == f"{factor['Ribbon1_scale_factor']}.outputX"
+        ci = source_of(modifier, f"{md}.input1X")
+        assert ci.endswith(".arcLength")
+        cfsi = source_of(modifier, f"{ci.split('.')[0]}.inputCurve").split(".")[0]
+        if name.startswith("loc_foll_Ribbon1_roll_"):  # the width is measured at the isoparm of the follicle
+            locator = named(modifier, name)[name]
+            assert source_of(modifier, f"{cfsi}.isoparmValue") == source_of(modifier, iso_plug(modifier, locator))
+
+
+def test_legacy_scale_drivers(cmds):
+    """
+    Follicles of older versions scale through two multiplyDivide nodes, which are found and deleted with them.
+    """
+    rop = RibbonOperations()
+    rop.ribbon = "Ribbon1"
+    loc = cmds.createNode("transform", name="loc_foll_Ribbon1_main_00")
+    nodes = {nodeType: cmds.createNode(nodeType) for nodeType in
+             ("uvPin", "decomposeMatrix", "curveFromSurfaceIso", "curveInfo")}
+    md1, md2 = cmds.createNode("multiplyDivide"), cmds.createNode("multiplyDivide")
+    cmds.connectAttr(f"{nodes['uvPin']}.outputMatrix[0]", f"{nodes['decomposeMatrix']}.inputMatrix")
+    cmds.connectAttr(f"{nodes['decomposeMatrix']}.outputTranslate", f"{loc}.translate")
+    cmds.connectAttr(f"{nodes['curveFromSurfaceIso']}.outputCurve", f"{nodes['curveInfo']}.inputCurve")
+    cmds.connectAttr(f"{nodes['curveInfo']}.arcLength", f"{md1}.input1X")
+    cmds.connectAttr(f"{md1}.outputX", f"{md2}.input1X")
+    cmds.connectAttr(f"{md2}.outputX", f"{loc}.scaleX")
+    drivers = rop.get_follicle_drivers(loc)
+    assert drivers == {"dm": nodes["decomposeMatrix"], "pin": nodes["uvPin"], "pinIndex": 0, "md2": md2, "md1": md1,
+                       "ci": nodes["curveInfo"], "iso": nodes["curveFromSurfaceIso"]}
+    rop.delete_follicle(loc)
+    assert not cmds.ls(loc, md1, md2, *nodes.values())
+
+
+@pytest.mark.parametrize("pScaleMode", [ScaleMode.perIso, ScaleMode.globalScale])
+def test_sampler(cmds, monkeypatch, pScaleMode):
+    """
+    One ribbonSampler per follicle group drives every follicle of the group, and computes their scale in perIso mode.
+    """
+    monkeypatch.setattr(RibbonGraph, "load_plugin", lambda: True)  # not loaded in the stand-in
+    rop, modifier, names = describe_follicles(4, 2, False, MethodName.sampler, pScaleMode)
+    samplers = named(modifier, "Ribbon1_sampler_")
+    assert set(samplers) == {"Ribbon1_sampler_main", "Ribbon1_sampler_roll"}
+    created = Counter(nodeType for nodeType, parent in operations(modifier, "createNode"))
+    assert created[RibbonGraph.SAMPLER_TYPE] == 2
+    assert not created["uvPin"]
+    # the sampler measures the width at each follicle, only the global scale measures it with a curve
+    assert created["curveFromSurfaceIso"] == (1 if pScaleMode == ScaleMode.globalScale else 0)
+    factor = named(modifier, "Ribbon1_scale_factor")["Ribbon1_scale_factor"]
+    for typeName, isoPos in (("main", RibbonOperations.generate_iso_pos_full(rop.mainIsoPos)),
+                             ("roll", rop.rollIsoPos)):
+        sampler = samplers[f"Ribbon1_sampler_{typeName}"]
+        assert source_of(modifier, f"{sampler}.inputSurface") == "Ribbon1.worldSpace[0]"
+        for i in range(len(isoPos)):
+            locator = named(modifier, f"loc_foll_Ribbon1_{typeName}_{i:02d}")[f"loc_foll_Ribbon1_{typeName}_{i:02d}"]
+            dm = source_of(modifier, f"{locator}.translate").split(".")[0]
+            assert source_of(modifier, f"{dm}.inputMatrix") == f"{sampler}.outputMatrix[{i}]"
+            if pScaleMode == ScaleMode.perIso:
+                assert source_of(modifier, f"{locator}.scaleX") == f"{sampler}.outputScale[{i}]"
+        if pScaleMode == ScaleMode.perIso:
+            assert source_of(modifier, f"{sampler}.scaleFactor") == f"{factor}.outputX"
+        else:
+            assert not [d for s, d in operations(modifier, "connect") if d == f"{sampler}.scaleFactor"]
+
+
+def test_sampler_without_plugin(cmds):
+    """
+    Without the plugin, the sampler method falls back to a uvPin shared by the follicles of each group.
+    """
+    rop, modifier, names = describe_follicles(4, 2, False, MethodName.sampler)
+    assert not named(modifier, "Ribbon1_sampler_")
+    assert set(named(modifier, "Ribbon1_uvPin_")) == {"Ribbon1_uvPin_main", "Ribbon1_uvPin_roll"}
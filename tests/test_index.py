@@ -0,0 +1,57 @@
+from RibbonCreatorTool import RibbonCreatorBatch as RibbonBatch
+from RibbonCreatorTool import RibbonCreatorIndex as RibbonIndex
+from RibbonCreatorTool import RibbonCreatorMetadata as RibbonMeta
+from RibbonCreatorTool.RibbonCreatorSpec import RibbonSpec
+
+
+def build(*pNames: str, **pFields) -> None:
+    results = RibbonBatch.build_specs([RibbonSpec(name=name, **pFields) for name in pNames])
+    assert not [r for r in results if r["error"]]
+
+
+def test_scan_ribbons(cmds):
+    build("leg_L", "arm_L", rollJointCount=1)
+    cmds.delete("leg_L")  # its metadata node is left, without a ribbon
+    assert [metadata.ribbon for metadata in RibbonIndex.scan_ribbons()] == ["arm_L"]
+    assert RibbonIndex.ribbon_names() == {"arm_L": "arm_L_meta"}
+
+
+def test_edit_ribbons(cmds):
+    build("arm_L", "arm_R", mainJointCount=3, rollJointCount=1)
+    results = RibbonIndex.edit_ribbons(["arm_L", "arm_R"], {"rollJointCount": 2, "sine": True})
+    assert [r["error"] for r in results] == [None, None]
+    for metadata in RibbonIndex.scan_ribbons():
+        assert metadata.spec.rollJointCount == 2
+        assert metadata.spec.deformers == ["sine"]
+        assert len(metadata.rollIsoPos) == 2 * 3
+        assert cmds.ls(metadata.nodes["sineSurface"])
+    results = RibbonIndex.edit_ribbons(["arm_L"], {"sine": False})
+    assert results[0]["spec"]["deformers"] == []
+    assert "sineSurface" not in RibbonMeta.read("arm_L_meta").nodes
+
+
+def test_edit_ribbons_errors(cmds):
+    """
+    A ribbon that can't be edited doesn't stop the others, and refused changes leave the ribbon as it was.
+    """
+    build("arm_L", "arm_R", rollJointCount=1)
+    results = RibbonIndex.edit_ribbons(["missing", "arm_L", "arm_R"], {"rollJointCount": 2})
+    assert results[0]["error"] == "ValueError: 'missing' is not part of a ribbon built by this tool."
+    assert [r["error"] for r in results[1:]] == [None, None]
+    results = RibbonIndex.edit_ribbons(["arm_L"], {"name": "other"})
+    assert results[0]["error"].startswith("ValueError: Unknown changes ['name']")
+    assert RibbonMeta.read("arm_L_meta").spec.rollJointCount == 2
+
+
+def test_edit_ribbons_progress(cmds):
+    build("arm_L", "arm_R", "leg_L", rollJointCount=1)
+    calls = []
+
+    def on_progress(pIndex, pCount, pRibbon):
+        calls.append((pIndex, pCount, pRibbon))
+        return pIndex < 1
+
+    results = RibbonIndex.edit_ribbons(["arm_L", "arm_R", "leg_L"], {"rollJointCount": 2}, on_progress)
+    assert calls == [(0, 3, "arm_L"), (1, 3, "arm_R")]
+    assert [r["ribbon"] for r in results] == ["arm_L"]
+    assert RibbonMeta.read("arm_R_meta").spec.rollJointCount == 1
@@ -0,0 +1,53 @@
+from RibbonCreatorTool.RibbonCreatorOperations import KnotType, RibbonOperations
+
+ARGS = ("Ribbon1", [1, 0, 0], [0, 1, 0], 10, 4, 2, False, False, False)
+
+
+def knot_values(pCmds, pKnot: str) -> tuple:
+    return pCmds.getAttr(f"{pKnot}.parameter")[0], pCmds.getAttr(f"{pKnot}.numberOfKnots")[0]
+
+
+def test_set_knots(cmds):
+    knot = cmds.createNode("insertKnotSurface")
+    RibbonOperations.set_knots(knot, (0.2, 0.4, 0.6, 0.8), 1)
+    assert knot_values(cmds, knot) == ((0.2, 0.4, 0.6, 0.8), (1, 1, 1, 1))
+    # fewer isoparms: the parameters after them are removed
+    RibbonOperations.set_knots(knot, (0.25, 0.5), 3)
+    assert knot_values(cmds, knot) == ((0.25, 0.5), (3, 3))
+    # the same isoparms: nothing is written
+    calls = cmds.calls["setAttr"]
+    RibbonOperations.set_knots(knot, (0.25, 0.5), 3)
+    assert cmds.calls["setAttr"] == calls
+
+
+def test_knots_rewritten_in_place(cmds):
+    """
+    Updating the isoparms rewrites the existing modifiers, so the follicles stay connected to them.
+    """
+    rop = RibbonOperations()
+    rop.build_ribbon(*ARGS, pPinch=False)
+    mainKnot, rollKnot = rop.mainKnotNode, rop.rollKnotNode
+    nodes = set(cmds.ls(type="insertKnotSurface"))
+    rop.update_main_iso(3, 2, False, False, False, True)
+    rop.update_roll_iso(1, False, False, False)
+    assert (rop.mainKnotNode, rop.rollKnotNode) == (mainKnot, rollKnot)
+    assert set(cmds.ls(type="insertKnotSurface")) == nodes
+    assert knot_values(cmds, mainKnot) == (rop.mainIsoPos, (3,) * len(rop.mainIsoPos))
+    assert knot_values(cmds, rollKnot)[0] == rop.rollIsoPos
+    loc = rop.get_follicles("Ribbon1_grp_loc_roll")[-1]
+    assert cmds.isConnected(f"{rollKnot}.message", f"{loc}.creator")
+
+
+def test_knots_removed(cmds):
+    """
+    Without roll joints, the roll modifier is deleted, and created again when they come back.
+    """
+    rop = RibbonOperations()
+    rop.build_ribbon(*ARGS, pPinch=False)
+    rollKnot = rop.rollKnotNode
+    rop.update_roll_iso(0, False, False, False)
+    assert rop.rollKnotNode is None and not cmds.ls(rollKnot)
+    assert not rop.get_knot("Ribbon1", KnotType.roll)
+    rop.update_roll_iso(2, False, False, False)
+    assert rop.get_knot("Ribbon1", KnotType.roll) == rop.rollKnotNode
+    assert knot_values(cmds, rop.rollKnotNode)[0] == rop.rollIsoPos
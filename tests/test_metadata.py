@@ -0,0 +1,55 @@
+import RibbonCreatorTool.RibbonCreatorMetadata as RibbonMeta
+from RibbonCreatorTool.RibbonCreatorOperations import RibbonOperations, KnotType
+from RibbonCreatorTool.RibbonCreatorSpec import RibbonSpec
+
+
+def build(pSpec: RibbonSpec) -> RibbonOperations:
+    RibbonOperations().build_from_spec(pSpec)
+    RibbonOperations.nodeRegistry.clear()  # as in a new session, the ribbon is only found from its metadata node
+    return RibbonOperations()
+
+
+def test_store_open_round_trip(cmds):
+    spec = RibbonSpec(name="arm_L", mainJointCount=3, rollJointCount=2, deformers=["sine"])
+    RibbonOperations().build_from_spec(spec)
+    node = RibbonMeta.find("arm_L")
+    assert node == "arm_L_meta"
+    written = RibbonMeta.read(node)
+    RibbonOperations.nodeRegistry.clear()
+
+    rop = RibbonOperations()
+    opened = rop.open_ribbon("arm_L_setup")
+    assert opened == spec
+    assert rop.ribbon == "arm_L"
+    assert rop.mainIsoPos == written.mainIsoPos and len(rop.mainIsoPos) == 2
+    assert rop.rollIsoPos == written.rollIsoPos
+    assert rop.mainKnotNode == written.nodes[str(KnotType.main)]
+    assert rop.controlJointsAll == written.controlJoints and rop.controlJointsAll
+    assert rop.controlJointsMain == written.controlJointsMain
+    assert rop.get_metadata_node() == node
+
+
+def test_read_renamed_nodes(cmds):
+    rop = build(RibbonSpec(name="arm_L", mainJointCount=3))
+    metadata = RibbonMeta.read(RibbonMeta.find("arm_L"))
+    knot = metadata.nodes[str(KnotType.main)]
+    joint = metadata.controlJoints[0]
+    cmds.rename(knot, "renamedKnot")
+    cmds.rename(joint, "renamedJoint")
+    rop.open_ribbon("arm_L")
+    assert rop.mainKnotNode == "renamedKnot"
+    assert rop.controlJointsAll[0] == "renamedJoint"
+    assert rop.controlJointsAll[1:] == metadata.controlJoints[1:]
+
+
+def test_store_metadata_disconnects_removed_joints(cmds):
+    rop = build(RibbonSpec(name="arm_L", mainJointCount=4))
+    rop.open_ribbon("arm_L")
+    count = len(rop.controlJointsAll)
+    rop.controlJointsAll = rop.controlJointsAll[:2]
+    rop.controlJointsMain = rop.controlJointsAll[:1]
+    rop.store_metadata()
+    metadata = RibbonMeta.read("arm_L_meta")
+    assert count > 2
+    assert metadata.controlJoints == rop.controlJointsAll
+    assert metadata.mainJointIndices == [0]
@@ -0,0 +1,60 @@
+from RibbonCreatorTool.RibbonCreatorNames import NameAllocator
+
+
+def make_nodes(pCmds, *pNames) -> None:
+    for name in pNames:
+        pCmds.createNode("transform", name=name)
+
+
+def test_split_name():
+    assert NameAllocator.split_name("arm_L12") == ("arm_L", 12)
+    assert NameAllocator.split_name("Ribbon") == ("Ribbon", None)
+    assert NameAllocator.split_name("Ribbon007") == ("Ribbon", 7)
+
+
+def test_multi_digit_numbers(cmds):
+    make_nodes(cmds, "Ribbon1", "Ribbon2_setup", "Ribbon12")
+    allocator = NameAllocator()
+    assert allocator.next_name("Ribbon") == "Ribbon3"
+    assert allocator.next_name("Ribbon12") == "Ribbon13"
+    assert allocator.next_names("Ribbon10", 3) == ["Ribbon10", "Ribbon11", "Ribbon13"]
+
+
+def test_leading_zeros(cmds):
+    """
+    "Ribbon01" can't be an allocated name, so it doesn't use the number 1.
+    """
+    make_nodes(cmds, "Ribbon01", "Ribbon0", "Ribbon1_002")
+    allocator = NameAllocator()
+    assert allocator.next_name("Ribbon") == "Ribbon2"
+    assert allocator.next_name("Ribbon0") == "Ribbon2"
+    assert allocator.next_name("Ribbon1_") == "Ribbon1_1"
+
+
+def test_remove_and_rename(cmds):
+    make_nodes(cmds, "Ribbon1", "Ribbon1_setup", "Ribbon2")
+    allocator = NameAllocator()
+    allocator.scan()
+    allocator._remove("Ribbon1")
+    assert allocator._used["Ribbon"][1] == 1  # still used by Ribbon1_setup
+    allocator._remove("Ribbon1_setup")
+    assert 1 not in allocator._used["Ribbon"]
+    allocator._remove("Ribbon1")  # a node that wasn't indexed doesn't make the count negative
+    assert 1 not in allocator._used["Ribbon"]
+    allocator._remove("Ribbon2")  # renamed, like _on_name_changed does
+    allocator._add("Ribbon5")
+    assert sorted(allocator._used["Ribbon"]) == [5]
+
+
+def test_index_kept_without_api(cmds):
+    """
+    Without callbacks, the prefix asked for is indexed again, and the index of the other prefixes is kept.
+    """
+    make_nodes(cmds, "Ribbon1", "arm_L1")
+    allocator = NameAllocator()
+    assert allocator.next_name("Ribbon") == "Ribbon2"
+    make_nodes(cmds, "Ribbon2_setup", "arm_L2")
+    cmds.rename("Ribbon1", "Ribbon3")
+    assert allocator.next_name("Ribbon") == "Ribbon1"
+    assert allocator.next_names("Ribbon", 2) == ["Ribbon1", "Ribbon4"]
+    assert sorted(allocator._used["arm_L"]) == [1]
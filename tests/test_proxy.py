@@ -0,0 +1,68 @@
+import pytest
+
+from RibbonCreatorTool import RibbonCreatorProxy as RibbonProxy
+from RibbonCreatorTool.RibbonCreatorOperations import RibbonOperations
+
+ARGS = ("Ribbon1", [1, 0, 0], [0, 1, 0], 10, 4, 2, True, False, True)
+POLYLINE = [[0, 0, 0], [10, 0, 0], [10, 0, 0], [10, 10, 0]]  # with a span of length 0
+
+
+def flat(pPoints: list) -> list:
+    return [coordinate for point in pPoints for coordinate in point]
+
+
+def points(pCmds, pCurve: str) -> list:
+    return pCmds.nodes[pCmds.listRelatives(pCurve, shapes=True)[0]].attrs["cv"]
+
+
+@pytest.mark.parametrize("pNumPy", [False, True])
+def test_iso_points(monkeypatch, pNumPy):
+    if pNumPy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(RibbonProxy, "RibbonGeo", None)
+    result = RibbonProxy.iso_points(POLYLINE, (0, 0.25, 0.5, 0.75, 1))
+    assert flat(result) == pytest.approx(flat([[0, 0, 0], [5, 0, 0], [10, 0, 0], [10, 5, 0], [10, 10, 0]]))
+
+
+def test_update(cmds):
+    proxy = RibbonProxy.create("arm")
+    assert RibbonProxy.exists(proxy)
+    RibbonProxy.update(proxy, 10, (0, 0.5, 1), (0.25,))
+    assert points(cmds, proxy.main) == [[0, 0, 0], [5, 0, 0], [10, 0, 0]]
+    assert points(cmds, proxy.roll) == [[2.5, 0, 0], [2.5, 0, 0]]  # a curve needs two points
+    RibbonProxy.update(proxy, 20, (0, 1), ())
+    assert points(cmds, proxy.main) == [[0, 0, 0], [20, 0, 0]]
+    assert not cmds.getAttr(f"{proxy.roll}.visibility")
+    RibbonProxy.delete(proxy)
+    assert not RibbonProxy.exists(proxy)
+    RibbonProxy.delete(proxy)  # already deleted
+
+
+def test_update_proxy(cmds):
+    """
+    The proxy of a preview follows the changes of its spec, without building the ribbon.
+    """
+    rop = RibbonOperations()
+    rop.preview_proxy(*ARGS, False)
+    main = points(cmds, rop.proxy.main)
+    assert len(main) == len(rop.mainIsoPos) + 2
+    assert len(points(cmds, rop.proxy.roll)) == len(rop.rollIsoPos)
+    rop.update_proxy({"mainJointCount": 2, "rollJointCount": 1, "length": 20})
+    assert points(cmds, rop.proxy.main) == [[0, 0, 0], [10, 0, 0], [20, 0, 0]]
+    assert len(points(cmds, rop.proxy.roll)) == 2
+    assert not cmds.ls("Ribbon1", "Ribbon1_setup")
+
+
+def test_update_proxy_aligned(cmds):
+    cmds.select(clear=True)
+    positions = ([0, 0, 0], [0, 4, 0], [0, 4, 6])
+    joints = [cmds.joint(name=f"arm{i}", position=position) for i, position in enumerate(positions)]
+    cmds.select(joints)
+    rop = RibbonOperations()
+    rop.align = True
+    rop.preview_proxy(*ARGS[:4], 2, *ARGS[5:], False)
+    # the main points are on the joints, the roll points between them
+    assert flat(points(cmds, rop.proxy.main)) == pytest.approx(flat([[0, 0, 0], [0, 4, 0], [0, 4, 6]]))
+    for point in points(cmds, rop.proxy.roll):
+        assert point[0] == 0 and (point[2] == 0 or point[1] == 4)
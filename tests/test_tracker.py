@@ -0,0 +1,20 @@
+from RibbonCreatorTool.RibbonCreatorTracker import SceneTracker
+from RibbonCreatorTool.RibbonCreatorTransaction import Transaction
+
+
+def test_scene_changes_of_the_tool_are_ignored(cmds):
+    tracker = SceneTracker()
+    tracker.sceneChanged = False
+    with Transaction("build"):
+        tracker._on_scene_changed()  # like a node added by the build
+    assert not tracker.sceneChanged
+    tracker._on_scene_changed()  # like a node added by the user, or the undo of the build
+    assert tracker.sceneChanged
+
+
+def test_selection_changes_of_the_tool_are_tracked(cmds):
+    tracker = SceneTracker()
+    tracker.selectionChanged = False
+    with Transaction("build"):
+        tracker._on_selection_changed()
+    assert tracker.selectionChanged